@@ -4,6 +4,8 @@ Main Application Controller - DENSO888 Professional
 """
 
 import logging
+import time
+from contextlib import nullcontext
 from typing import Dict, Any, List, Tuple
 from pathlib import Path
 from datetime import datetime
@@ -177,37 +179,91 @@ class AppController:
                 logger.error("No Excel file selected")
                 return False
 
-            # Read Excel data
-            data = self.excel_service.read_file(
-                self.current_excel_file["file_path"], options
+            # Fixed batch size, or "auto" to tune it from batch timings
+            batch_sizer = self.connection_service.batch_size_controller(
+                table_name, options.get("batch_size", "auto")
             )
+            validate = self.validation_service and options.get("validate_data", True)
+            validation_rules = None
+            imported_rows = 0
+
+            # Parse text dates bound for the table's date columns, one
+            # format per column inferred from the first chunk
+            read_options = {"chunk_size": batch_sizer.size, **options}
+            date_columns = {
+                col["name"]: None
+                for col in self.connection_service.get_table_schema(table_name)
+                if "DATE" in str(col["type"]).upper()
+            }
+            if date_columns:
+                read_options.setdefault("parse_dates", date_columns)
 
-            if not data:
-                logger.error("No data found in Excel file")
-                return False
-
-            # Validate data if validation service available
-            if self.validation_service and options.get("validate_data", True):
-                validation_rules = self._generate_validation_rules(data[0])
-                validation_result = self.validation_service.validate_dataframe(
-                    self._convert_to_dataframe(data), validation_rules
+            # Stream Excel data in chunks
+            chunks = batch_sizer.rebatch(
+                self.excel_service.read_file_chunks(
+                    self.current_excel_file["file_path"], read_options
                 )
-
-                if not validation_result["valid"]:
-                    logger.warning(
-                        f"Validation warnings: {validation_result['warnings']}"
-                    )
-
-            # Import data using connection service
-            success = self.connection_service.bulk_insert(
-                table_name, data, options.get("batch_size", 1000)
             )
 
-            if success:
-                self.stats["total_imports"] += 1
-                logger.info(f"Successfully imported {len(data)} rows to {table_name}")
+            # Optionally suspend secondary indexes for the load and rebuild
+            # them once at the end
+            timings: Dict[str, float] = {}
+            deferral = (
+                self.connection_service.deferred_indexes(table_name, timings)
+                if options.get("rebuild_indexes", False)
+                else nullcontext()
+            )
+            with deferral:
+                # One load for the whole import, each chunk timed with its
+                # commit to tune the batch size
+                load_start = time.perf_counter()
+                load_options = {**options, "on_chunk": batch_sizer.record}
+                with self.connection_service.bulk_load(
+                    table_name, load_options
+                ) as load:
+                    for chunk in chunks:
+                        # Validate data if validation service available
+                        if validate:
+                            if validation_rules is None:
+                                validation_rules = self._generate_validation_rules(
+                                    chunk[0]
+                                )
+                            validation_result = (
+                                self.validation_service.validate_dataframe(
+                                    self._convert_to_dataframe(chunk), validation_rules
+                                )
+                            )
+
+                            if not validation_result["valid"]:
+                                logger.warning(
+                                    f"Validation warnings: {validation_result['warnings']}"
+                                )
+
+                        # Import chunk using connection service
+                        try:
+                            load.insert(chunk)
+                        except Exception:
+                            logger.error(f"Import failed after {imported_rows} rows")
+                            raise
+
+                        imported_rows += len(chunk)
+
+                timings["load"] = time.perf_counter() - load_start
+                batch_sizer.save()
+
+            if not imported_rows:
+                logger.error("No data found in Excel file")
+                return False
 
-            return success
+            self.stats["total_imports"] += 1
+            logger.info(f"Successfully imported {imported_rows} rows to {table_name}")
+            if "rebuild_indexes" in timings:
+                logger.info(
+                    f"Index phases: drop {timings['drop_indexes']:.2f}s, "
+                    f"load {timings['load']:.2f}s, "
+                    f"rebuild {timings['rebuild_indexes']:.2f}s"
+                )
+            return True
 
         except Exception as e:
             self.stats["errors_count"] += 1
@@ -243,6 +299,48 @@ class AppController:
             logger.error(f"Export failed: {e}")
             return False
 
+    # Index Advisor Operations
+    def get_index_recommendations(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Index recommendations from the logged query workload
+
+        Starts query logging if it is off, so recommendations appear once
+        enough queries have run.
+        """
+        try:
+            if not self.connection_service or not self.is_connected:
+                return []
+
+            from services.index_advisor import IndexAdvisor
+
+            self.connection_service.enable_query_log()
+            return IndexAdvisor(self.connection_service).recommend(limit)
+
+        except Exception as e:
+            logger.error(f"Index recommendation failed: {e}")
+            return []
+
+    def apply_index_recommendations(
+        self, limit: int = 3, min_speedup: float = 1.1
+    ) -> List[Dict[str, Any]]:
+        """Create the top recommended indexes that measurably speed up
+        their logged queries"""
+        try:
+            if not self.connection_service or not self.is_connected:
+                return []
+
+            from services.index_advisor import IndexAdvisor
+
+            self.connection_service.enable_query_log()
+            results = IndexAdvisor(self.connection_service).apply(limit, min_speedup)
+            created = [result["name"] for result in results if result["created"]]
+            if created:
+                logger.info(f"Created indexes: {', '.join(created)}")
+            return results
+
+        except Exception as e:
+            logger.error(f"Applying index recommendations failed: {e}")
+            return []
+
     # Mock Data Operations
     def get_mock_templates(self) -> List[Dict[str, Any]]:
         """Get available mock data templates"""
@@ -440,6 +538,9 @@ class AppController:
             if self.backup_service:
                 self.backup_service.stop()
 
+            if self.excel_service:
+                self.excel_service.close_session()
+
             logger.info("Application cleanup completed")
 
         except Exception as e:
@@ -5,6 +5,8 @@ Created by: Thammaphon Chittasuwanna (SDM) | Innovation Department
 """
 
 import threading
+import time
+from contextlib import nullcontext
 from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime
 import logging
@@ -27,6 +29,7 @@ class PoolController:
         self._processing_thread = None
         self._shutdown = False
         self._should_stop = False
+        self._excel_service = None
 
         # Status tracking
         self.last_operation = {
@@ -199,6 +202,11 @@ class PoolController:
             if not self._validate_database_config(config):
                 return False, "Invalid database configuration"
 
+            # SQLite imports write through one writer so table browsing
+            # keeps reading from WAL snapshots while an import runs
+            if config.get("type", "sqlite") == "sqlite":
+                config = {"single_writer": True, **config}
+
             # Connect using pool service
             success = self.pool_service.connect_database(config)
 
@@ -342,6 +350,14 @@ class PoolController:
             return []
 
     # ================ EXCEL OPERATIONS ================
+    def _get_excel_service(self):
+        """Shared Excel service so workbook sessions are reused"""
+        if self._excel_service is None:
+            from services.excel_service import ExcelService
+
+            self._excel_service = ExcelService()
+        return self._excel_service
+
     def load_excel_file(self, file_path: str) -> Tuple[bool, Dict[str, Any]]:
         """Load and analyze Excel file"""
         try:
@@ -356,9 +372,7 @@ class PoolController:
                 return False, {"error": "File not found"}
 
             # Use Excel service to analyze file
-            from services.excel_service import ExcelService
-
-            excel_service = ExcelService()
+            excel_service = self._get_excel_service()
 
             self._update_operation_status(
                 "excel_load", "analyzing", 50, "Analyzing file structure..."
@@ -479,110 +493,181 @@ class PoolController:
             def import_job():
                 try:
                     self._update_operation_status(
-                        "data_import", "starting", 5, "Starting data import..."
+                        "data_import", "starting", 0, "Starting data import..."
                     )
                     self.emit_event(
                         "import_progress",
-                        {"progress": 5, "status": "Starting import..."},
+                        {"progress": 0, "status": "Starting import..."},
                     )
 
-                    # Read Excel file completely
-                    from services.excel_service import ExcelService
+                    from services.import_pipeline import ImportCancelled, ImportPipeline
 
-                    excel_service = ExcelService()
+                    excel_service = self._get_excel_service()
+                    total_rows = self.current_excel_file.get("total_rows", 0)
 
-                    self._update_operation_status(
-                        "data_import", "reading", 20, "Reading Excel file..."
-                    )
-                    self.emit_event(
-                        "import_progress",
-                        {"progress": 20, "status": "Reading Excel file..."},
+                    # Fixed batch size, or "auto" to tune it from batch timings
+                    batch_sizer = self.pool_service.batch_size_controller(
+                        table_name, options.get("batch_size", "auto")
                     )
 
-                    data = excel_service.read_file(
-                        self.current_excel_file["file_path"], options
-                    )
+                    # One reader chunk per committed batch, reading only
+                    # mapped columns and renaming them at the source
+                    read_options = {"chunk_size": batch_sizer.size, **options}
+                    if self.field_mappings:
+                        read_options.setdefault(
+                            "column_mappings", dict(self.field_mappings)
+                        )
 
-                    if not data:
-                        raise Exception("No data found in Excel file")
+                    # Parse text dates bound for the table's date columns,
+                    # one format per column inferred from the first chunk
+                    date_columns = {
+                        col["name"]: None
+                        for col in self.get_table_schema(table_name)
+                        if "DATE" in str(col["type"]).upper()
+                    }
+                    if date_columns:
+                        read_options.setdefault("parse_dates", date_columns)
+
+                    def write_batch(chunk: List[Dict]) -> bool:
+                        load.insert(chunk)
+                        return True
 
-                    self._update_operation_status(
-                        "data_import", "processing", 40, "Processing data..."
-                    )
-                    self.emit_event(
-                        "import_progress",
-                        {"progress": 40, "status": "Processing data..."},
-                    )
+                    started = time.perf_counter()
+                    committed = {"rows": 0}
 
-                    # Apply field mappings
-                    if self.field_mappings:
-                        mapped_data = []
-                        for row in data:
-                            mapped_row = {}
-                            for excel_col, value in row.items():
-                                db_col = self.field_mappings.get(excel_col, excel_col)
-                                mapped_row[db_col] = value
-                            mapped_data.append(mapped_row)
-                        data = mapped_data
+                    def report_commit(rows: int):
+                        # Called once rows are durable, which in grouped or
+                        # parallel loads lags behind the chunks written
+                        committed["rows"] += rows
+                        rows_written = committed["rows"]
+                        self.stats["records_imported"] += rows
 
-                    self._update_operation_status(
-                        "data_import",
-                        "creating_table",
-                        60,
-                        "Creating/updating table...",
-                    )
-                    self.emit_event(
-                        "import_progress",
-                        {"progress": 60, "status": "Creating table..."},
-                    )
+                        elapsed = time.perf_counter() - started
+                        rows_per_second = rows_written / elapsed if elapsed > 0 else 0.0
 
-                    # Create table if needed
-                    if options.get("mode") == "replace":
-                        # For replace mode, we'll let bulk_insert handle table creation
-                        pass
+                        progress = 0
+                        if total_rows:
+                            progress = min(99, int(100 * rows_written / total_rows))
 
-                    self._update_operation_status(
-                        "data_import", "inserting", 80, "Inserting data..."
-                    )
-                    self.emit_event(
-                        "import_progress",
-                        {"progress": 80, "status": "Inserting data..."},
+                        status = (
+                            f"Inserted {rows_written:,} rows "
+                            f"({rows_per_second:,.0f} rows/sec)"
+                        )
+                        self._update_operation_status(
+                            "data_import", "inserting", progress, status
+                        )
+                        self.emit_event(
+                            "import_progress",
+                            {
+                                "progress": progress,
+                                "status": status,
+                                "rows_written": rows_written,
+                                "rows_per_second": rows_per_second,
+                            },
+                        )
+
+                    pipeline = ImportPipeline(
+                        reader=batch_sizer.rebatch(
+                            excel_service.read_file_chunks(
+                                self.current_excel_file["file_path"], read_options
+                            )
+                        ),
+                        writer=write_batch,
+                        queue_size=options.get("pipeline_queue_size", 4),
+                        should_stop=lambda: self._should_stop,
                     )
 
-                    # Bulk insert data
-                    batch_size = options.get("batch_size", 1000)
-                    success = self.pool_service.bulk_insert(
-                        table_name, data, batch_size
+                    # Optionally suspend secondary indexes for the load and
+                    # rebuild them once at the end
+                    timings: Dict[str, float] = {}
+                    deferral = (
+                        self.pool_service.deferred_indexes(table_name, timings)
+                        if options.get("rebuild_indexes", False)
+                        else nullcontext()
                     )
 
-                    if success:
-                        self.stats["records_imported"] += len(data)
+                    # One load for the whole import, each chunk timed with
+                    # its commit to tune the batch size
+                    load_options = {
+                        **options,
+                        "on_chunk": batch_sizer.record,
+                        "on_commit": report_commit,
+                    }
+                    try:
+                        with deferral, self.pool_service.bulk_load(
+                            table_name, load_options
+                        ) as load:
+                            result = pipeline.run()
+                            if result["cancelled"]:
+                                # Leave the load as failed: the open batch
+                                # group is rolled back, queued batches dropped
+                                raise ImportCancelled()
+                    except ImportCancelled:
+                        batch_sizer.save()
+                        kept_rows = load.rows_committed
+                        message = (
+                            f"Import cancelled, {kept_rows:,} committed rows kept"
+                            if kept_rows
+                            else "Import cancelled, no rows committed"
+                        )
                         self._update_operation_status(
-                            "data_import",
-                            "completed",
-                            100,
-                            "Import completed successfully",
+                            "data_import", "cancelled", 0, message
                         )
-
                         self.emit_event(
-                            "import_progress",
-                            {"progress": 100, "status": "Import completed!"},
+                            "import_progress", {"progress": 0, "status": message}
                         )
                         self.emit_event(
-                            "import_completed",
+                            "import_cancelled",
                             {
                                 "table": table_name,
-                                "rows": len(data),
+                                "rows": kept_rows,
+                                "partial": kept_rows > 0,
                                 "timestamp": datetime.now().isoformat(),
                             },
                         )
+                        logger.info(f"{message} in {table_name}")
+                        return False
+
+                    timings["load"] = result["elapsed_seconds"]
+                    batch_sizer.save()
+                    imported_rows = load.rows_committed
 
+                    if not imported_rows:
+                        raise Exception("No data found in Excel file")
+
+                    self._update_operation_status(
+                        "data_import",
+                        "completed",
+                        100,
+                        "Import completed successfully",
+                    )
+
+                    self.emit_event(
+                        "import_progress",
+                        {"progress": 100, "status": "Import completed!"},
+                    )
+                    self.emit_event(
+                        "import_completed",
+                        {
+                            "table": table_name,
+                            "rows": imported_rows,
+                            "elapsed_seconds": result["elapsed_seconds"],
+                            "phase_timings": timings,
+                            "timestamp": datetime.now().isoformat(),
+                        },
+                    )
+
+                    logger.info(
+                        f"Successfully imported {imported_rows} rows to {table_name} "
+                        f"in {result['elapsed_seconds']:.1f}s"
+                    )
+                    if "rebuild_indexes" in timings:
                         logger.info(
-                            f"Successfully imported {len(data)} rows to {table_name}"
+                            f"Index phases: drop {timings['drop_indexes']:.2f}s, "
+                            f"load {timings['load']:.2f}s, "
+                            f"rebuild {timings['rebuild_indexes']:.2f}s"
                         )
-                        return True
-                    else:
-                        raise Exception("Bulk insert operation failed")
+                    return True
 
                 except Exception as e:
                     self.stats["errors_encountered"] += 1
@@ -661,6 +746,8 @@ class PoolController:
                 self.disconnect()
 
             # Clear data
+            if self._excel_service:
+                self._excel_service.close_session()
             self.current_excel_file = None
             self.field_mappings.clear()
             self.event_callbacks.clear()
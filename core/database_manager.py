@@ -6,9 +6,18 @@ Working Database Manager with Real Implementation - Fixed Version
 import sqlite3
 import logging
 import os
-from typing import Optional, Dict, Any, List, Tuple
+import time
+from typing import Optional, Dict, Any, List, Tuple, Union
 from datetime import datetime
 
+from utils.batch_size_controller import BatchSizeController, profile_key
+from utils.type_inference import (
+    TypeInferenceEngine,
+    narrow_sql_type,
+    padded_string_length,
+    sql_type_for,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -176,7 +185,7 @@ class DatabaseManager:
                 )
             else:
                 create_sql = self._create_sqlserver_table(
-                    table_name, sample_row, mapped_columns
+                    table_name, data, mapped_columns
                 )
 
             cursor = self.connection.cursor()
@@ -270,30 +279,18 @@ class DatabaseManager:
         return f"CREATE TABLE [{table_name}] ({', '.join(column_defs)})"
 
     def _create_sqlserver_table(
-        self, table_name: str, sample_row: Dict, columns: List[str]
+        self, table_name: str, data: List[Dict], columns: List[str]
     ) -> str:
-        """Create SQL Server table SQL"""
+        """Create SQL Server table SQL with the smallest type fitting each column"""
         column_defs = ["id INT IDENTITY(1,1) PRIMARY KEY"]
-
-        for i, (orig_col, new_col) in enumerate(zip(sample_row.keys(), columns)):
-            value = sample_row[orig_col]
-
-            if value is None:
-                col_type = "NVARCHAR(255)"
-            elif isinstance(value, bool):
-                col_type = "BIT"
-            elif isinstance(value, int):
-                col_type = "INT"
-            elif isinstance(value, float):
-                col_type = "FLOAT"
-            elif isinstance(value, str):
-                if self._looks_like_date(value):
-                    col_type = "DATETIME2"
-                else:
-                    col_type = "NVARCHAR(255)"
-            else:
-                col_type = "NVARCHAR(255)"
-
+        engine = TypeInferenceEngine().update(data)
+
+        for orig_col, new_col in zip(data[0].keys(), columns):
+            stats = engine.columns[orig_col]
+            # Strings keep the same headroom as AutoTableGenerator's DDL
+            col_type = narrow_sql_type(
+                stats, min_length=padded_string_length(stats.max_length)
+            ) or sql_type_for(stats.infer_type(), "sqlserver")
             column_defs.append(f"[{new_col}] {col_type}")
 
         return f"CREATE TABLE [{table_name}] ({', '.join(column_defs)})"
@@ -317,9 +314,19 @@ class DatabaseManager:
         return False
 
     def insert_data(
-        self, table_name: str, data: List[Dict], column_mappings: Optional[Dict] = None
+        self,
+        table_name: str,
+        data: List[Dict],
+        column_mappings: Optional[Dict] = None,
+        batch_size: Union[int, str] = "auto",
     ) -> Tuple[bool, str]:
-        """Insert data into table with progress tracking"""
+        """Insert data into table with progress tracking
+
+        ``batch_size`` is a fixed row count or "auto" to adapt it to the
+        measured insert rate, starting from the size remembered for this
+        database and table. All batches commit together; on failure none
+        of them are kept.
+        """
         try:
             if not data:
                 return False, "No data to insert"
@@ -346,12 +353,25 @@ class DatabaseManager:
 
             cursor = self.connection.cursor()
 
-            # Insert data in batches
-            batch_size = 1000
+            # Insert data in batches within one transaction, so a failure
+            # leaves nothing behind; only batch execution is timed
+            batch_sizer = BatchSizeController(
+                profile_key(
+                    self.db_type,
+                    self.db_file_path,
+                    self.config.get("server", ""),
+                    self.config.get("database", ""),
+                ),
+                table_name,
+                batch_size,
+            )
             total_inserted = 0
+            i = 0
 
-            for i in range(0, len(data), batch_size):
-                batch = data[i : i + batch_size]
+            while i < len(data):
+                batch = data[i : i + batch_sizer.size]
+                i += len(batch)
+                batch_start = time.perf_counter()
                 batch_values = []
 
                 for row in batch:
@@ -367,9 +387,11 @@ class DatabaseManager:
 
                 cursor.executemany(insert_sql, batch_values)
                 total_inserted += len(batch)
+                batch_sizer.record(batch, time.perf_counter() - batch_start)
 
             self.connection.commit()
             cursor.close()
+            batch_sizer.save()
 
             # Log operation in metadata
             self._log_operation("data_insert", table_name, total_inserted)
@@ -378,6 +400,12 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"Failed to insert data: {e}")
+            # Nothing was committed, so a retry does not duplicate rows
+            if self.connection:
+                try:
+                    self.connection.rollback()
+                except Exception:
+                    pass
             return False, str(e)
 
     def _log_operation(
@@ -11,6 +11,8 @@ import logging
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill
 
+from utils.data_profiler import DataProfiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -271,99 +273,12 @@ class ExcelService:
     def _analyze_data_quality(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze data quality metrics"""
         try:
-            total_cells = len(df) * len(df.columns)
-            null_cells = df.isnull().sum().sum()
-
-            return {
-                "total_rows": len(df),
-                "total_columns": len(df.columns),
-                "null_percentage": (
-                    round((null_cells / total_cells) * 100, 2) if total_cells > 0 else 0
-                ),
-                "duplicate_rows": df.duplicated().sum(),
-                "empty_columns": df.isnull().all().sum(),
-                "mixed_type_columns": self._detect_mixed_types(df),
-                "potential_issues": self._detect_potential_issues(df),
-            }
+            return DataProfiler.analyze_data_quality(df)
 
         except Exception as e:
             logger.error(f"Failed to analyze data quality: {e}")
             return {"error": str(e)}
 
-    def _detect_mixed_types(self, df: pd.DataFrame) -> List[str]:
-        """Detect columns with mixed data types"""
-        mixed_columns = []
-
-        for col in df.columns:
-            if df[col].dtype == "object":
-                # Check for mixed numeric/text data
-                non_null_data = df[col].dropna()
-                if len(non_null_data) > 0:
-                    numeric_count = 0
-                    for value in non_null_data:
-                        try:
-                            float(str(value))
-                            numeric_count += 1
-                        except (ValueError, TypeError):
-                            pass
-
-                    # If partially numeric, it might be mixed type
-                    if 0 < numeric_count < len(non_null_data):
-                        mixed_columns.append(col)
-
-        return mixed_columns
-
-    def _detect_potential_issues(self, df: pd.DataFrame) -> List[str]:
-        """Detect potential data issues"""
-        issues = []
-
-        # Check for very long strings that might cause database issues
-        for col in df.select_dtypes(include=["object"]).columns:
-            max_length = df[col].astype(str).str.len().max()
-            if max_length > 1000:
-                issues.append(
-                    f"Column '{col}' has very long text (max: {max_length} chars)"
-                )
-
-        # Check for columns with mostly null values
-        for col in df.columns:
-            null_percentage = (df[col].isnull().sum() / len(df)) * 100
-            if null_percentage > 90:
-                issues.append(
-                    f"Column '{col}' is mostly empty ({null_percentage:.1f}% null)"
-                )
-
-        # Check for potential date columns that aren't recognized
-        for col in df.select_dtypes(include=["object"]).columns:
-            sample_values = df[col].dropna().head(10)
-            date_like_count = 0
-            for value in sample_values:
-                if self._looks_like_date(str(value)):
-                    date_like_count += 1
-
-            if date_like_count > len(sample_values) * 0.7:
-                issues.append(
-                    f"Column '{col}' might contain dates but wasn't recognized"
-                )
-
-        return issues
-
-    def _looks_like_date(self, value: str) -> bool:
-        """Check if string looks like a date"""
-        import re
-
-        date_patterns = [
-            r"\d{4}-\d{2}-\d{2}",  # YYYY-MM-DD
-            r"\d{2}/\d{2}/\d{4}",  # MM/DD/YYYY or DD/MM/YYYY
-            r"\d{2}-\d{2}-\d{4}",  # MM-DD-YYYY or DD-MM-YYYY
-            r"\d{1,2}/\d{1,2}/\d{4}",  # M/D/YYYY
-        ]
-
-        for pattern in date_patterns:
-            if re.match(pattern, value.strip()):
-                return True
-        return False
-
     def create_template(
         self,
         template_type: str,
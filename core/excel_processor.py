@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import logging
 
+from utils.data_profiler import DataProfiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,17 +77,7 @@ class ExcelProcessor:
 
     def _analyze_data_quality(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze data quality"""
-        total_cells = len(df) * len(df.columns)
-        null_cells = df.isnull().sum().sum()
-
-        return {
-            "null_percentage": (
-                round((null_cells / total_cells) * 100, 2) if total_cells > 0 else 0
-            ),
-            "duplicate_rows": df.duplicated().sum(),
-            "empty_columns": df.isnull().all().sum(),
-            "columns_with_nulls": df.isnull().any().sum(),
-        }
+        return DataProfiler.analyze_data_quality(df)
 
     def process_file(
         self,
@@ -249,7 +249,7 @@ class MainWindow:
         ttk.Label(options_grid, text="Batch Size:").grid(
             row=0, column=0, sticky="w", padx=(0, 10)
         )
-        self.batch_size = tk.StringVar(value="1000")
+        self.batch_size = tk.StringVar(value="auto")
         ttk.Entry(options_grid, textvariable=self.batch_size, width=10).grid(
             row=0, column=1, sticky="w"
         )
@@ -671,7 +671,11 @@ class MainWindow:
         self.import_btn.config(state="disabled", text="Importing...")
 
         options = {
-            "batch_size": int(self.batch_size.get() or 1000),
+            "batch_size": (
+                int(self.batch_size.get())
+                if self.batch_size.get().strip().isdigit()
+                else "auto"
+            ),
             "mode": self.import_mode.get(),
         }
 
@@ -32,7 +32,10 @@ class DatabaseConfig:
     pool_size: int = 5
     max_overflow: int = 10
     pool_timeout: int = 30
-    pool_recycle: int = 3600
+    pool_recycle: int = 3600  # max connection lifetime in seconds
+    min_idle: int = 2
+    idle_timeout: int = 600
+    validation_idle_seconds: int = 30
 
     def get_connection_params(self) -> Dict[str, Any]:
         """Get connection parameters for database manager"""
@@ -4,15 +4,35 @@ Smart Schema Creation & Relationship Detection System
 เฮียตอมจัดหั้ย!!! 🚀
 """
 
+import os
 import re
+import time
 import logging
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from pathlib import Path
 import json
+import numpy as np
 import pandas as pd
 
+from utils.date_inference import (
+    EXCEL_SERIAL,
+    DateFormatCache,
+    infer_date_format,
+    looks_like_date_column,
+    parse_dates,
+)
+from utils.type_inference import (
+    NUMERIC_TYPES,
+    TEMPORAL_TYPES,
+    ColumnStats,
+    narrow_sql_type,
+    padded_string_length,
+    widen_type,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +52,7 @@ class ColumnSchema:
     foreign_column: Optional[str] = None
     constraints: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    stats: Optional[ColumnStats] = field(default=None, repr=False)
 
 
 @dataclass
@@ -63,6 +84,24 @@ class DataTypeDetector:
             "percentage": r"^\d+[\.\,]?\d*%$",
         }
 
+        # One regex tests every pattern: each sits in an optional lookahead,
+        # so a single match call per value reports all patterns it fits
+        self.pattern_classifier = re.compile(
+            "".join(
+                f"(?:(?=(?P<{name}>{pattern})))?"
+                for name, pattern in self.type_patterns.items()
+            ),
+            re.IGNORECASE,
+        )
+        self.pattern_sample_size = 100
+
+        # Pattern match ratios per analyzed (sheet, column)
+        self.pattern_matches: Dict[Tuple[Any, str], Dict[str, float]] = {}
+
+        # Date formats of analyzed columns by (sheet, column), reused when
+        # loading them
+        self.date_formats = DateFormatCache()
+
         self.sql_type_mapping = {
             "sqlite": {
                 "integer": "INTEGER",
@@ -94,40 +133,90 @@ class DataTypeDetector:
             },
         }
 
-    def analyze_column(self, data: pd.Series, column_name: str) -> Dict[str, Any]:
-        """Deep analysis of column data"""
-        non_null_data = data.dropna()
-        total_count = len(data)
-        non_null_count = len(non_null_data)
-
-        if non_null_count == 0:
+    def analyze_column(
+        self,
+        data: pd.Series,
+        column_name: str,
+        column_stats: Optional[ColumnStats] = None,
+        sheet_name: Any = None,
+    ) -> Dict[str, Any]:
+        """Deep analysis of column data
+
+        ``column_stats`` may carry stats merged over every chunk of a
+        streamed sheet; otherwise they are computed from ``data``. Pattern
+        matches and a detected date format are remembered under
+        (sheet_name, column_name).
+        """
+        analysis, pattern_ratios = self.inspect_column(data, column_name, column_stats)
+        self.remember_column(sheet_name, column_name, analysis, pattern_ratios)
+        return analysis
+
+    def inspect_column(
+        self,
+        data: pd.Series,
+        column_name: str,
+        column_stats: Optional[ColumnStats] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Analyze a column without touching detector state
+
+        Returns the analysis and the column's pattern match ratios; safe
+        to call from several threads at once.
+        """
+        if column_stats is None:
+            column_stats = ColumnStats(column_name)
+            column_stats.update(data)
+
+        if column_stats.non_null_count == 0:
             return {
                 "data_type": "string",
                 "nullable": True,
                 "max_length": 255,
                 "constraints": [],
                 "metadata": {"null_ratio": 1.0},
-            }
+                "column_stats": column_stats,
+            }, {}
 
-        # Convert to string for pattern analysis
-        str_data = non_null_data.astype(str)
-
-        # Statistical analysis
+        non_null_data = data.dropna()
+        summary = column_stats.summary()
         stats = {
-            "null_ratio": (total_count - non_null_count) / total_count,
-            "unique_count": non_null_data.nunique(),
-            "unique_ratio": non_null_data.nunique() / non_null_count,
-            "max_length": str_data.str.len().max(),
-            "min_length": str_data.str.len().min(),
-            "avg_length": str_data.str.len().mean(),
+            key: summary[key]
+            for key in (
+                "null_ratio",
+                "unique_count",
+                "unique_ratio",
+                "max_length",
+                "min_length",
+                "avg_length",
+            )
         }
 
+        # Classify sampled values against every pattern once
+        str_data = non_null_data.astype(str)
+        pattern_ratios = self.match_patterns(str_data)
+
         # Type detection priority
-        detected_type = self._detect_specific_type(str_data, stats)
+        detected_type = self._detect_specific_type(
+            str_data, column_stats, pattern_ratios
+        )
+
+        # Excel serial day numbers under a date-like column name
+        date_format = column_stats.date_format
+        if detected_type in ("integer", "float") and looks_like_date_column(
+            column_name
+        ):
+            if infer_date_format(non_null_data, allow_serial=True) == EXCEL_SERIAL:
+                date_format = EXCEL_SERIAL
+                detected_type = "date" if detected_type == "integer" else "datetime"
 
         # Generate constraints and metadata
-        constraints = self._generate_constraints(non_null_data, detected_type, stats)
-        metadata = self._generate_metadata(non_null_data, detected_type, stats)
+        constraints = self._generate_constraints(
+            non_null_data, detected_type, {**stats, "min_value": summary["min_value"]}
+        )
+        metadata = self._generate_metadata(
+            non_null_data, detected_type, stats, pattern_ratios
+        )
+        if detected_type in ("date", "datetime"):
+            metadata["date_format"] = date_format
 
         return {
             "data_type": detected_type,
@@ -135,70 +224,78 @@ class DataTypeDetector:
             "max_length": self._calculate_optimal_length(detected_type, stats),
             "constraints": constraints,
             "metadata": {**stats, **metadata},
-        }
-
-    def _detect_specific_type(self, str_data: pd.Series, stats: Dict) -> str:
-        """Detect specific data type with pattern matching"""
-        sample_size = min(100, len(str_data))
-        sample = str_data.head(sample_size)
-
-        # Pattern-based detection
-        for pattern_name, pattern in self.type_patterns.items():
-            matches = sample.str.match(pattern, case=False).sum()
-            match_ratio = matches / sample_size
-
-            if match_ratio > 0.8:  # 80% pattern match
-                type_mapping = {
-                    "email": "string",
-                    "phone": "string",
-                    "url": "text",
-                    "uuid": "uuid",
-                    "ip_address": "string",
-                    "date_iso": "date",
-                    "datetime_iso": "datetime",
-                    "currency": "decimal",
-                    "percentage": "float",
-                }
-                return type_mapping.get(pattern_name, "string")
+            "column_stats": column_stats,
+        }, pattern_ratios
 
-        # Numeric type detection
-        try:
-            numeric_data = pd.to_numeric(str_data, errors="coerce")
-            valid_numeric = ~numeric_data.isna()
-            numeric_ratio = valid_numeric.sum() / len(str_data)
-
-            if numeric_ratio > 0.9:  # 90% numeric
-                if (numeric_data == numeric_data.astype(int, errors="ignore")).all():
-                    # Check integer range
-                    if numeric_data.max() > 2147483647:
-                        return "bigint"
-                    return "integer"
-                return "float"
-        except:
-            pass
-
-        # Boolean detection
-        unique_lower = set(str_data.str.lower().unique())
-        bool_values = {"true", "false", "1", "0", "yes", "no", "y", "n"}
-        if unique_lower.issubset(bool_values) and len(unique_lower) <= 2:
-            return "boolean"
-
-        # Date/time detection
-        try:
-            pd.to_datetime(str_data, errors="raise")
-            return "datetime"
-        except:
-            pass
+    def remember_column(
+        self,
+        sheet_name: Any,
+        column_name: str,
+        analysis: Dict[str, Any],
+        pattern_ratios: Dict[str, float],
+    ):
+        """Record an inspected column's pattern matches and date format"""
+        key = (sheet_name, column_name)
+        self.pattern_matches[key] = pattern_ratios
+        if "date_format" in analysis["metadata"]:
+            self.date_formats.set(key, analysis["metadata"]["date_format"])
+
+    def match_patterns(self, str_data: pd.Series) -> Dict[str, float]:
+        """Share of sampled values matching each type pattern, in one pass"""
+        sample = str_data.head(self.pattern_sample_size)
+        counts = [0] * len(self.type_patterns)
+
+        match = self.pattern_classifier.match
+        for value in sample:
+            for index, group in enumerate(match(value).groups()):
+                if group is not None:
+                    counts[index] += 1
+
+        total = len(sample) or 1
+        return {name: count / total for name, count in zip(self.type_patterns, counts)}
+
+    def _detect_specific_type(
+        self,
+        str_data: pd.Series,
+        column_stats: ColumnStats,
+        pattern_ratios: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """Detect specific data type from column stats and text patterns"""
+        detected_type = column_stats.infer_type()
+        if detected_type not in ("string", "text"):
+            return detected_type
+
+        if pattern_ratios is None:
+            pattern_ratios = self.match_patterns(str_data)
+
+        # Pattern-based detection for text that is not a plain scalar
+        pattern_name = self._best_pattern(pattern_ratios)
+        if pattern_name:
+            type_mapping = {
+                "email": "string",
+                "phone": "string",
+                "url": "text",
+                "uuid": "uuid",
+                "ip_address": "string",
+                "date_iso": "date",
+                "datetime_iso": "datetime",
+                "currency": "decimal",
+                "percentage": "float",
+            }
+            return type_mapping.get(pattern_name, "string")
 
         # JSON detection
-        if self._looks_like_json(sample):
+        if self._looks_like_json(str_data.head(self.pattern_sample_size)):
             return "json"
 
-        # String vs Text based on length
-        if stats["max_length"] > 500 or stats["avg_length"] > 100:
-            return "text"
+        return detected_type
 
-        return "string"
+    def _best_pattern(self, pattern_ratios: Dict[str, float]) -> Optional[str]:
+        """First pattern, in declaration order, matching over 80% of values"""
+        for pattern_name, ratio in pattern_ratios.items():
+            if ratio > 0.8:
+                return pattern_name
+        return None
 
     def _looks_like_json(self, data: pd.Series) -> bool:
         """Check if data looks like JSON"""
@@ -228,9 +325,8 @@ class DataTypeDetector:
 
         # Check constraints based on type
         if data_type in ["integer", "bigint", "float", "decimal"]:
-            min_val = data.min()
-            max_val = data.max()
-            if min_val >= 0:
+            min_val = stats.get("min_value")
+            if min_val is not None and min_val >= 0:
                 constraints.append("CHECK (value >= 0)")
 
         # String length constraints
@@ -240,24 +336,29 @@ class DataTypeDetector:
         return constraints
 
     def _generate_metadata(
-        self, data: pd.Series, data_type: str, stats: Dict
+        self,
+        data: pd.Series,
+        data_type: str,
+        stats: Dict,
+        pattern_ratios: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
         """Generate column metadata"""
         metadata = {
             "suggested_index": stats["unique_ratio"] > 0.7,
             "data_quality_score": self._calculate_quality_score(data, stats),
-            "pattern_detected": self._detect_pattern_name(data),
+            "pattern_detected": self._detect_pattern_name(data, pattern_ratios),
             "business_meaning": self._infer_business_meaning(data.name, data_type),
         }
 
         # Type-specific metadata
         if data_type in ["integer", "bigint", "float"]:
+            numeric_data = pd.to_numeric(data, errors="coerce")
             metadata.update(
                 {
-                    "min_value": data.min(),
-                    "max_value": data.max(),
-                    "mean_value": data.mean(),
-                    "std_value": data.std(),
+                    "min_value": numeric_data.min(),
+                    "max_value": numeric_data.max(),
+                    "mean_value": numeric_data.mean(),
+                    "std_value": numeric_data.std(),
                 }
             )
 
@@ -266,8 +367,7 @@ class DataTypeDetector:
     def _calculate_optimal_length(self, data_type: str, stats: Dict) -> Optional[int]:
         """Calculate optimal column length"""
         if data_type == "string":
-            # Add 20% buffer to max length, minimum 50
-            return max(50, int(stats["max_length"] * 1.2))
+            return padded_string_length(stats["max_length"])
         elif data_type == "text":
             return None  # No length limit for text
         return None
@@ -287,16 +387,13 @@ class DataTypeDetector:
 
         return max(0, min(1, score))
 
-    def _detect_pattern_name(self, data: pd.Series) -> Optional[str]:
+    def _detect_pattern_name(
+        self, data: pd.Series, pattern_ratios: Optional[Dict[str, float]] = None
+    ) -> Optional[str]:
         """Detect specific patterns in data"""
-        str_data = data.astype(str).head(50)
-
-        for pattern_name, pattern in self.type_patterns.items():
-            matches = str_data.str.match(pattern, case=False).sum()
-            if matches / len(str_data) > 0.8:
-                return pattern_name
-
-        return None
+        if pattern_ratios is None:
+            pattern_ratios = self.match_patterns(data.astype(str))
+        return self._best_pattern(pattern_ratios)
 
     def _infer_business_meaning(
         self, column_name: str, data_type: str
@@ -327,37 +424,136 @@ class DataTypeDetector:
         return None
 
 
+@dataclass
+class ColumnSignature:
+    """Compact value summary of one column for relationship discovery
+
+    ``hashes`` holds the sorted, distinct 64-bit hashes of the column's
+    values in string form, so value overlap between two columns is a
+    vectorized membership test instead of a pair of Python sets.
+    ``sketch`` keeps the smallest hashes (a K-minimum-values sample of the
+    distinct values) for a cheap containment estimate before the exact one.
+    """
+
+    table: str
+    column: str
+    row_count: int
+    non_null_count: int
+    distinct_count: int
+    numeric: bool
+    text: bool
+    hashes: np.ndarray
+    sketch: np.ndarray
+
+    @classmethod
+    def from_series(
+        cls, table: str, column: str, data: pd.Series, sketch_size: int = 256
+    ) -> "ColumnSignature":
+        non_null = data.dropna()
+        if len(non_null):
+            hashes = np.unique(
+                pd.util.hash_pandas_object(non_null.astype(str), index=False)
+            )
+            numeric = bool(pd.to_numeric(non_null, errors="coerce").notna().all())
+        else:
+            hashes = np.empty(0, dtype=np.uint64)
+            numeric = False
+
+        return cls(
+            table=table,
+            column=column,
+            row_count=len(data),
+            non_null_count=len(non_null),
+            distinct_count=len(hashes),
+            numeric=numeric,
+            text=pd.api.types.is_object_dtype(data)
+            or pd.api.types.is_string_dtype(data),
+            hashes=hashes,
+            sketch=hashes[:sketch_size],
+        )
+
+    @property
+    def is_unique(self) -> bool:
+        """Every row holds a distinct, non-null value"""
+        return self.row_count > 0 and self.distinct_count == self.row_count
+
+    def containment_estimate(self, other: "ColumnSignature") -> float:
+        """Estimated share of this column's distinct values found in other"""
+        if len(self.sketch) == 0:
+            return 0.0
+        return float(_contains(other.hashes, self.sketch).mean())
+
+    def containment(self, other: "ColumnSignature") -> float:
+        """Exact share of this column's distinct values found in other"""
+        if len(self.hashes) == 0:
+            return 0.0
+        return float(_contains(other.hashes, self.hashes).mean())
+
+
+def _contains(sorted_hashes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Membership of values in a sorted hash array"""
+    if len(sorted_hashes) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_hashes, values)
+    positions[positions == len(sorted_hashes)] = 0
+    return sorted_hashes[positions] == values
+
+
 class RelationshipDetector:
-    """Automatic foreign key and relationship detection"""
+    """Automatic foreign key and relationship detection
 
-    def __init__(self):
+    Every column is summarized once into a ColumnSignature; candidate
+    pairs are then scored from signatures alone, so the work grows with
+    the number of columns rather than with repeated full-value sets.
+    With ``discover_by_value`` set, columns are also matched against
+    unique key columns of other tables whose names give no hint.
+    """
+
+    def __init__(self, discover_by_value: bool = False):
         self.confidence_threshold = 0.8
         self.naming_patterns = {
             "foreign_key": [r"(.+)_id$", r"(.+)id$", r"fk_(.+)$", r"ref_(.+)$"],
             "primary_key": [r"^id$", r"^(.+)_id$", r"^pk_", r"^primary_"],
         }
+        self.discover_by_value = discover_by_value
+        self.sketch_size = 256
+        self.sketch_margin = 0.1  # ~3 standard errors of a 256-value sample
+        self.min_discovery_distinct = 10
+
+    def build_signatures(
+        self, tables_data: Dict[str, pd.DataFrame]
+    ) -> Dict[str, Dict[str, ColumnSignature]]:
+        """One signature per column of every table"""
+        return {
+            table_name: {
+                column: ColumnSignature.from_series(
+                    table_name, column, df[column], self.sketch_size
+                )
+                for column in df.columns
+            }
+            for table_name, df in tables_data.items()
+        }
 
     def detect_relationships(
         self, tables_data: Dict[str, pd.DataFrame]
     ) -> Dict[str, List[Dict[str, Any]]]:
         """Detect relationships between tables"""
         relationships = {}
+        signatures = self.build_signatures(tables_data)
 
-        # Get all potential keys
-        potential_keys = self._identify_potential_keys(tables_data)
-
-        for table_name, df in tables_data.items():
+        for table_name, table_signatures in signatures.items():
             table_relationships = []
 
-            for column in df.columns:
+            for column, fk_signature in table_signatures.items():
                 # Check if column looks like foreign key
                 fk_candidates = self._find_foreign_key_candidates(
-                    column, df[column], tables_data, table_name
+                    column, fk_signature, signatures, table_name
                 )
 
                 for candidate in fk_candidates:
+                    pk_signature = signatures[candidate["table"]][candidate["column"]]
                     confidence = self._calculate_relationship_confidence(
-                        df[column], tables_data[candidate["table"]][candidate["column"]]
+                        fk_signature, pk_signature
                     )
 
                     if confidence >= self.confidence_threshold:
@@ -369,10 +565,7 @@ class RelationshipDetector:
                                 "references_column": candidate["column"],
                                 "confidence": confidence,
                                 "relationship_type": self._infer_relationship_type(
-                                    df,
-                                    column,
-                                    tables_data[candidate["table"]],
-                                    candidate["column"],
+                                    fk_signature, pk_signature
                                 ),
                             }
                         )
@@ -382,24 +575,22 @@ class RelationshipDetector:
         return relationships
 
     def _identify_potential_keys(
-        self, tables_data: Dict[str, pd.DataFrame]
+        self, signatures: Dict[str, Dict[str, ColumnSignature]]
     ) -> Dict[str, Dict[str, Any]]:
         """Identify potential primary and foreign keys"""
         keys = {}
 
-        for table_name, df in tables_data.items():
+        for table_name, table_signatures in signatures.items():
             table_keys = {"primary": [], "foreign": []}
 
-            for column in df.columns:
-                col_data = df[column]
-
+            for column, signature in table_signatures.items():
                 # Primary key detection
-                if self._looks_like_primary_key(column, col_data):
+                if self._looks_like_primary_key(column, signature):
                     table_keys["primary"].append(
                         {
                             "column": column,
                             "confidence": self._calculate_pk_confidence(
-                                column, col_data
+                                column, signature
                             ),
                         }
                     )
@@ -417,31 +608,29 @@ class RelationshipDetector:
 
         return keys
 
-    def _looks_like_primary_key(self, column_name: str, data: pd.Series) -> bool:
+    def _looks_like_primary_key(
+        self, column_name: str, signature: ColumnSignature
+    ) -> bool:
         """Check if column looks like primary key"""
         # Name-based detection
         for pattern in self.naming_patterns["primary_key"]:
-            if re.match(pattern, column_name.lower()):
-                # Data-based validation
-                return (
-                    data.nunique() == len(data)  # Unique
-                    and data.notna().all()  # No nulls
-                    and len(data) > 0  # Has data
-                )
+            if re.match(pattern, str(column_name).lower()):
+                # Data-based validation: unique, no nulls, has data
+                return signature.is_unique
 
         return False
 
     def _looks_like_foreign_key(self, column_name: str) -> bool:
         """Check if column name suggests foreign key"""
         for pattern in self.naming_patterns["foreign_key"]:
-            if re.match(pattern, column_name.lower()):
+            if re.match(pattern, str(column_name).lower()):
                 return True
         return False
 
     def _extract_referenced_table(self, column_name: str) -> Optional[str]:
         """Extract referenced table name from FK column name"""
         for pattern in self.naming_patterns["foreign_key"]:
-            match = re.match(pattern, column_name.lower())
+            match = re.match(pattern, str(column_name).lower())
             if match:
                 return match.group(1)
         return None
@@ -449,8 +638,8 @@ class RelationshipDetector:
     def _find_foreign_key_candidates(
         self,
         column: str,
-        data: pd.Series,
-        all_tables: Dict[str, pd.DataFrame],
+        signature: ColumnSignature,
+        signatures: Dict[str, Dict[str, ColumnSignature]],
         current_table: str,
     ) -> List[Dict[str, str]]:
         """Find potential foreign key targets"""
@@ -458,100 +647,125 @@ class RelationshipDetector:
 
         # Extract potential table name from column
         potential_table = self._extract_referenced_table(column)
+        by_value = (
+            self.discover_by_value
+            and signature.distinct_count >= self.min_discovery_distinct
+        )
 
-        for table_name, df in all_tables.items():
+        for table_name, table_signatures in signatures.items():
             if table_name == current_table:
                 continue
 
+            matched = set()
+
             # Check if table name matches potential reference
             if potential_table and potential_table in table_name.lower():
                 # Look for matching columns
-                for col in df.columns:
-                    if self._looks_like_primary_key(col, df[col]):
-                        candidates.append({"table": table_name, "column": col})
+                for col, col_signature in table_signatures.items():
+                    if self._looks_like_primary_key(col, col_signature):
+                        matched.add(col)
 
             # Also check for exact column name matches
-            if column in df.columns:
-                candidates.append({"table": table_name, "column": column})
+            if column in table_signatures:
+                matched.add(column)
+
+            # Unique key columns that could contain this column's values
+            if by_value:
+                for col, col_signature in table_signatures.items():
+                    if (
+                        col_signature.is_unique
+                        and col_signature.distinct_count >= signature.distinct_count
+                        and self._could_reference(signature, col_signature)
+                    ):
+                        matched.add(col)
+
+            candidates.extend(
+                {"table": table_name, "column": col}
+                for col in table_signatures
+                if col in matched
+            )
 
         return candidates
 
+    def _could_reference(
+        self, fk_signature: ColumnSignature, pk_signature: ColumnSignature
+    ) -> bool:
+        """Sketch prefilter: can this pair still reach the threshold?"""
+        type_score = self._check_type_compatibility(fk_signature, pk_signature)
+        needed = (self.confidence_threshold - type_score * 0.3) / 0.7
+        estimate = fk_signature.containment_estimate(pk_signature)
+
+        # A full sketch is exact; a sampled one gets an error margin
+        if fk_signature.distinct_count <= len(fk_signature.sketch):
+            return estimate >= needed
+        return estimate >= needed - self.sketch_margin
+
     def _calculate_relationship_confidence(
-        self, fk_data: pd.Series, pk_data: pd.Series
+        self, fk_signature: ColumnSignature, pk_signature: ColumnSignature
     ) -> float:
         """Calculate confidence score for relationship"""
-        # Remove nulls for comparison
-        fk_non_null = fk_data.dropna()
-        pk_non_null = pk_data.dropna()
-
-        if len(fk_non_null) == 0 or len(pk_non_null) == 0:
+        if fk_signature.non_null_count == 0 or pk_signature.non_null_count == 0:
             return 0.0
 
-        # Check value overlap
-        fk_values = set(fk_non_null.astype(str))
-        pk_values = set(pk_non_null.astype(str))
-
-        overlap = len(fk_values.intersection(pk_values))
-        overlap_ratio = overlap / len(fk_values) if len(fk_values) > 0 else 0
-
         # Data type compatibility
-        type_compatible = self._check_type_compatibility(fk_data, pk_data)
+        type_compatible = self._check_type_compatibility(fk_signature, pk_signature)
+
+        # Check value overlap, skipping pairs the sketch already rules out
+        if not self._could_reference(fk_signature, pk_signature):
+            overlap_ratio = fk_signature.containment_estimate(pk_signature)
+        else:
+            overlap_ratio = fk_signature.containment(pk_signature)
 
         # Calculate confidence
         confidence = (overlap_ratio * 0.7) + (type_compatible * 0.3)
         return confidence
 
-    def _check_type_compatibility(self, data1: pd.Series, data2: pd.Series) -> float:
+    def _check_type_compatibility(
+        self, signature1: ColumnSignature, signature2: ColumnSignature
+    ) -> float:
         """Check if data types are compatible"""
-        try:
-            # Try to convert both to same type
-            pd.to_numeric(data1, errors="raise")
-            pd.to_numeric(data2, errors="raise")
+        if signature1.numeric and signature2.numeric:
             return 1.0  # Both numeric
-        except:
-            pass
 
         # String comparison
-        if data1.dtype == "object" and data2.dtype == "object":
+        if signature1.text and signature2.text:
             return 0.8
 
         return 0.5  # Partial compatibility
 
     def _infer_relationship_type(
-        self, table1: pd.DataFrame, col1: str, table2: pd.DataFrame, col2: str
+        self, signature1: ColumnSignature, signature2: ColumnSignature
     ) -> str:
         """Infer relationship type (1:1, 1:M, M:M)"""
-        # Count unique values
-        table1_unique = table1[col1].nunique()
-        table2_unique = table2[col2].nunique()
-
-        table1_count = len(table1)
-        table2_count = len(table2)
+        unique1 = signature1.distinct_count == signature1.row_count
+        unique2 = signature2.distinct_count == signature2.row_count
 
         # Determine relationship type
-        if table1_unique == table1_count and table2_unique == table2_count:
+        if unique1 and unique2:
             return "1:1"
-        elif table1_unique < table1_count and table2_unique == table2_count:
+        elif not unique1 and unique2:
             return "M:1"
-        elif table1_unique == table1_count and table2_unique < table2_count:
+        elif unique1 and not unique2:
             return "1:M"
         else:
             return "M:M"
 
-    def _calculate_pk_confidence(self, column_name: str, data: pd.Series) -> float:
+    def _calculate_pk_confidence(
+        self, column_name: str, signature: ColumnSignature
+    ) -> float:
         """Calculate primary key confidence"""
         confidence = 0.0
 
         # Name-based confidence
-        if column_name.lower() == "id":
+        if str(column_name).lower() == "id":
             confidence += 0.3
-        elif "_id" in column_name.lower():
+        elif "_id" in str(column_name).lower():
             confidence += 0.2
 
         # Data-based confidence
-        if data.nunique() == len(data):  # Unique
+        if signature.distinct_count == signature.row_count:  # Unique
             confidence += 0.4
-        if data.notna().all():  # No nulls
+        if signature.non_null_count == signature.row_count:  # No nulls
             confidence += 0.3
 
         return confidence
@@ -647,6 +861,17 @@ class IndexSuggestionEngine:
         return suggestions
 
 
+_worker_detector: Optional[DataTypeDetector] = None
+
+
+def _analyze_column_task(column_name: str, data: pd.Series):
+    """Process pool entry point: inspect one column with a per-process detector"""
+    global _worker_detector
+    if _worker_detector is None:
+        _worker_detector = DataTypeDetector()
+    return _worker_detector.inspect_column(data, column_name)
+
+
 class AutoTableGenerator:
     """Main auto table generation service"""
 
@@ -663,6 +888,10 @@ class AutoTableGenerator:
             "optimize_data_types": True,
             "generate_constraints": True,
             "backup_existing": True,
+            # Column analysis fan-out: "thread" or "process" pools
+            "parallel_analysis": False,
+            "analysis_workers": None,
+            "analysis_executor": "thread",
         }
 
         # State tracking
@@ -680,9 +909,17 @@ class AutoTableGenerator:
         )
 
         # Step 1: Analyze individual tables
+        workers = self._analysis_workers(excel_data)
+        if workers > 1:
+            column_analyses = self._analyze_columns_parallel(excel_data, workers)
+        else:
+            column_analyses = {}
+
         for sheet_name, df in excel_data.items():
             logger.info(f"📊 Analyzing sheet: {sheet_name}")
-            schema = self._analyze_single_table(sheet_name, df)
+            schema = self._analyze_single_table(
+                sheet_name, df, column_analyses.get(sheet_name)
+            )
             schemas[sheet_name] = schema
 
         # Step 2: Detect relationships
@@ -702,17 +939,197 @@ class AutoTableGenerator:
         self.generated_schemas = schemas
         return schemas
 
-    def _analyze_single_table(self, table_name: str, df: pd.DataFrame) -> TableSchema:
-        """Analyze single table and generate schema"""
+    def analyze_excel_file(
+        self,
+        file_path: str,
+        sheet_names: List[str] = None,
+        options: Dict[str, Any] = None,
+    ) -> Dict[str, TableSchema]:
+        """Load workbook sheets in parallel and generate their schemas"""
+        from .excel_service import ExcelService
+
+        logger.info(f"📂 Loading sheets from {Path(file_path).name}")
+        excel_data = ExcelService().read_sheets(file_path, sheet_names, options)
+        return self.analyze_excel_data(excel_data)
+
+    def propose_schema(
+        self,
+        file_path: str,
+        sheet_name: Any = 0,
+        options: Dict[str, Any] = None,
+        sample_size: int = 10000,
+        on_widen: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Tuple[TableSchema, "ProgressiveSchemaInference"]:
+        """Propose a schema for a large sheet without profiling every row
+
+        The proposal is analyzed from a random sample of the sheet while
+        the rest keeps streaming in the background. Call
+        refresh_proposal() with the returned inference to fold in what it
+        has learned since; inference.wait() blocks until every row is in,
+        or returns False with inference.error set if reading fails.
+
+        The sample is uniform over the whole sheet only when the sheet is
+        in the columnar cache. Otherwise it covers the first
+        ``sample_size`` rows, and types that first appear later in the
+        sheet arrive through refresh_proposal().
+        """
+        from .progressive_schema import ProgressiveSchemaInference
+
+        options = {**(options or {}), "sheet_name": sheet_name}
+        inference = ProgressiveSchemaInference(
+            file_path, options, sample_size, on_widen=on_widen
+        )
+        inference.start()
+
+        table_name = inference.excel_service.open_session(file_path).sheet_name(
+            sheet_name
+        )
+        logger.info(
+            f"📊 Proposing schema for {table_name} from a {inference.sampling} sample"
+        )
+        schema = self._analyze_single_table(table_name, inference.sample_frame())
+        self.refresh_proposal(schema, inference)
+        return schema, inference
+
+    def refresh_proposal(
+        self, schema: TableSchema, inference: "ProgressiveSchemaInference"
+    ) -> List[str]:
+        """Widen a proposed schema to the inference's latest types
+
+        Adds per-column confidence to column metadata and returns the
+        names of the columns whose type was widened.
+        """
+        generic_types = NUMERIC_TYPES + TEMPORAL_TYPES + ["string", "text"]
+        proposal = inference.proposal()
+        widened = []
+
+        for column in schema.columns:
+            progress = proposal.get(column.original_name)
+            if progress is None:
+                continue
+
+            column.metadata["confidence"] = progress["confidence"]
+            column.stats = inference.tracker.engine.columns.get(column.original_name)
+            if progress["nullable"] and not column.is_primary_key:
+                column.nullable = True
+
+            # Pattern types (uuid, json, ...) are left to the sample analysis
+            if column.data_type not in generic_types:
+                continue
+
+            data_type = widen_type(column.data_type, progress["type"])
+            if data_type != column.data_type:
+                column.data_type = data_type
+                widened.append(column.name)
+
+            max_length = self.type_detector._calculate_optimal_length(
+                data_type, {"max_length": progress["max_length"]}
+            )
+            if max_length is None or data_type != "string":
+                column.max_length = max_length
+            else:
+                column.max_length = max(column.max_length or 0, max_length)
+
+        schema.metadata.update(
+            {
+                "row_count": inference.total_rows,
+                "rows_seen": inference.tracker.rows_seen,
+                "sampling": inference.sampling,
+                "final": inference.done,
+            }
+        )
+        return widened
+
+    def _analysis_workers(self, excel_data: Dict[str, pd.DataFrame]) -> int:
+        """Worker count for column analysis, 1 when running sequentially"""
+        if not self.config.get("parallel_analysis"):
+            return 1
+        column_count = sum(len(df.columns) for df in excel_data.values())
+        workers = self.config.get("analysis_workers") or os.cpu_count() or 1
+        return max(1, min(workers, column_count))
+
+    def _analyze_columns_parallel(
+        self, excel_data: Dict[str, pd.DataFrame], workers: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Analyze the columns of every sheet concurrently
+
+        Columns of all sheets form one task list, so wide and narrow sheets
+        share the pool. Workers only inspect columns and return their
+        results; pattern matches and date formats are recorded here on the
+        calling thread in submission order under (sheet, column), and the
+        analyses are grouped per sheet in column order, which keeps the
+        schemas and detector state identical to a sequential run.
+        """
+        tasks = [
+            (sheet_name, col_name)
+            for sheet_name, df in excel_data.items()
+            for col_name in df.columns
+        ]
+        use_processes = self.config.get("analysis_executor") == "process"
+        logger.info(
+            f"⚡ Analyzing {len(tasks)} columns with {workers} "
+            f"{'processes' if use_processes else 'threads'}"
+        )
+
+        columns = [col_name for _, col_name in tasks]
+        data = [excel_data[sheet][col_name] for sheet, col_name in tasks]
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        _analyze_column_task,
+                        columns,
+                        data,
+                        chunksize=max(1, len(tasks) // (workers * 4)),
+                    )
+                )
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        lambda col_name, series: self.type_detector.inspect_column(
+                            series, col_name
+                        ),
+                        columns,
+                        data,
+                    )
+                )
+
+        for (sheet_name, col_name), (analysis, pattern_ratios) in zip(tasks, results):
+            self.type_detector.remember_column(
+                sheet_name, col_name, analysis, pattern_ratios
+            )
+        analyses = [analysis for analysis, _ in results]
+
+        grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in excel_data}
+        for (sheet_name, _), analysis in zip(tasks, analyses):
+            grouped[sheet_name].append(analysis)
+        return grouped
+
+    def _analyze_single_table(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        column_analyses: Optional[List[Dict[str, Any]]] = None,
+    ) -> TableSchema:
+        """Analyze single table and generate schema
+
+        ``column_analyses`` may hold analyze_column results computed
+        elsewhere, one per column in column order.
+        """
         # Clean table name
         clean_table_name = self._clean_table_name(table_name)
 
         # Analyze columns
         columns = []
-        for col_name in df.columns:
-            logger.debug(f"  📋 Analyzing column: {col_name}")
-
-            analysis = self.type_detector.analyze_column(df[col_name], col_name)
+        for index, col_name in enumerate(df.columns):
+            if column_analyses is not None:
+                analysis = column_analyses[index]
+            else:
+                logger.debug(f"  📋 Analyzing column: {col_name}")
+                analysis = self.type_detector.analyze_column(
+                    df[col_name], col_name, sheet_name=table_name
+                )
 
             column_schema = ColumnSchema(
                 name=self._clean_column_name(col_name),
@@ -722,6 +1139,7 @@ class AutoTableGenerator:
                 nullable=analysis["nullable"],
                 constraints=analysis["constraints"],
                 metadata=analysis["metadata"],
+                stats=analysis.get("column_stats"),
             )
 
             # Detect primary key
@@ -790,24 +1208,31 @@ class AutoTableGenerator:
         statements = {}
 
         for table_name, schema in schemas.items():
-            sql = self._generate_create_sql(schema, db_type)
+            sql = self._generate_create_sql(schema, db_type, schemas=schemas)
             statements[table_name] = sql
 
         return statements
 
-    def _generate_create_sql(self, schema: TableSchema, db_type: str) -> str:
-        """Generate CREATE TABLE SQL for specific database"""
-        type_mapping = self.type_detector.sql_type_mapping[db_type]
+    def _generate_create_sql(
+        self,
+        schema: TableSchema,
+        db_type: str,
+        include_foreign_keys: bool = True,
+        schemas: Optional[Dict[str, TableSchema]] = None,
+    ) -> str:
+        """Generate CREATE TABLE SQL for specific database
 
+        With ``schemas`` a foreign key column is declared with exactly the
+        type of the column it references, which SQL Server requires.
+        """
         # Column definitions
         column_defs = []
 
         for col in schema.columns:
-            col_def = f"[{col.name}] {type_mapping[col.data_type]}"
-
-            # Length specification
-            if col.max_length and col.data_type == "string" and db_type == "sqlserver":
-                col_def = f"[{col.name}] NVARCHAR({col.max_length})"
+            sql_type = self._column_sql_type(
+                *self._type_source(schema, col, schemas), db_type
+            )
+            col_def = f"[{col.name}] {sql_type}"
 
             # Nullable
             if not col.nullable:
@@ -817,17 +1242,18 @@ class AutoTableGenerator:
             if col.default_value is not None:
                 col_def += f" DEFAULT {col.default_value}"
 
-            # Primary key
+            # Primary key, detected on a sheet column and loaded with it;
+            # SQL Server rejects explicit values for an IDENTITY column
             if col.is_primary_key and db_type == "sqlite":
                 col_def += " PRIMARY KEY AUTOINCREMENT"
             elif col.is_primary_key and db_type == "sqlserver":
-                col_def += " IDENTITY(1,1) PRIMARY KEY"
+                col_def += " PRIMARY KEY"
 
             column_defs.append(col_def)
 
         # Foreign key constraints
         fk_constraints = []
-        for fk in schema.foreign_keys:
+        for fk in schema.foreign_keys if include_foreign_keys else []:
             fk_constraint = (
                 f"FOREIGN KEY ([{fk['column']}]) "
                 f"REFERENCES [{fk['references_table']}]([{fk['references_column']}])"
@@ -835,24 +1261,99 @@ class AutoTableGenerator:
             fk_constraints.append(fk_constraint)
 
         # Combine all parts
-        all_defs = column_defs + fk_constraints
+        all_defs = ",\n    ".join(column_defs + fk_constraints)
 
         sql = f"""CREATE TABLE [{schema.name}] (
-    {',\\n    '.join(all_defs)}
+    {all_defs}
 );"""
 
         return sql
 
+    def _column_sql_type(
+        self, schema: TableSchema, col: ColumnSchema, db_type: str
+    ) -> str:
+        """SQL type of a column, narrowed for SQL Server when possible"""
+        sql_type = self.type_detector.sql_type_mapping[db_type][col.data_type]
+
+        # Length specification
+        if col.max_length and col.data_type == "string" and db_type == "sqlserver":
+            sql_type = f"NVARCHAR({col.max_length})"
+
+        # Smallest type holding the observed values, only from stats
+        # covering every row; strings keep the analysis length headroom
+        if (
+            db_type == "sqlserver"
+            and self.config["optimize_data_types"]
+            and schema.metadata.get("final", True)
+            and col.stats
+            and not col.is_primary_key
+        ):
+            narrowed = narrow_sql_type(
+                col.stats, col.data_type, min_length=col.max_length or 1
+            )
+            if narrowed:
+                sql_type = narrowed
+
+        return sql_type
+
+    def _type_source(
+        self,
+        schema: TableSchema,
+        col: ColumnSchema,
+        schemas: Optional[Dict[str, TableSchema]],
+    ) -> Tuple[TableSchema, ColumnSchema]:
+        """Column whose type a column is declared with
+
+        Foreign keys are followed until a primary key or a column without
+        a further reference, so every column of a chain gets one type.
+        """
+        seen = {(schema.name, col.name)}
+        while schemas and not col.is_primary_key:
+            fk = next(
+                (fk for fk in schema.foreign_keys if fk["column"] == col.name), None
+            )
+            parent = schemas.get(fk["references_table"]) if fk else None
+            referenced = next(
+                (
+                    candidate
+                    for candidate in (parent.columns if parent else [])
+                    if fk["references_column"]
+                    in (candidate.name, candidate.original_name)
+                ),
+                None,
+            )
+            if referenced is None or (parent.name, referenced.name) in seen:
+                break
+            seen.add((parent.name, referenced.name))
+            schema, col = parent, referenced
+
+        return schema, col
+
     def create_tables_automatically(
         self, excel_data: Dict[str, pd.DataFrame], options: Dict[str, Any] = None
     ) -> Dict[str, Any]:
-        """Automatically create tables from Excel data"""
+        """Automatically create tables from Excel data
+
+        Runs as a load-aware DDL plan: bare tables first, then the bulk
+        load when ``load_data`` is set, then every index and deferred
+        foreign key in one pass over the loaded rows, so inserts never
+        maintain secondary indexes. SQLite keeps its foreign keys in
+        CREATE TABLE but loads with enforcement off, then reports rows
+        that break them in ``foreign_key_violations``. Seconds per phase
+        are reported in ``phase_timings``.
+
+        Options:
+            load_data: Insert each sheet into its new table (default False).
+            batch_size: Rows per insert batch when loading (default 1000).
+        """
         options = options or {}
         results = {
             "created_tables": [],
             "failed_tables": [],
             "warnings": [],
             "schemas": {},
+            "foreign_key_violations": {},
+            "phase_timings": {},
             "execution_time": 0,
         }
 
@@ -861,14 +1362,25 @@ class AutoTableGenerator:
         try:
             # Step 1: Analyze and generate schemas
             logger.info("🚀 Starting automatic table generation")
+            phase_start = time.perf_counter()
             schemas = self.analyze_excel_data(excel_data)
+            self._drop_non_unique_references(schemas, excel_data, results["warnings"])
             results["schemas"] = {
                 name: self._schema_to_dict(schema) for name, schema in schemas.items()
             }
+            results["phase_timings"]["analyze"] = time.perf_counter() - phase_start
 
-            # Step 2: Create tables in dependency order
+            # Step 2: Create bare tables in dependency order. SQL Server adds
+            # foreign keys after the load; SQLite can only declare them in
+            # CREATE TABLE, so it loads with enforcement off and checks after.
             creation_order = self._determine_creation_order(schemas)
+            db_type = self._get_database_type()
+            load_data = options.get("load_data", False)
+            defer_foreign_keys = load_data and db_type == "sqlserver"
+            check_foreign_keys = load_data and db_type == "sqlite"
+            created: Dict[str, Dict[str, Any]] = {}
 
+            phase_start = time.perf_counter()
             for table_name in creation_order:
                 schema = schemas[table_name]
 
@@ -878,8 +1390,12 @@ class AutoTableGenerator:
                         self._backup_existing_table(table_name)
 
                     # Generate and execute CREATE statement
-                    db_type = self._get_database_type()
-                    create_sql = self._generate_create_sql(schema, db_type)
+                    create_sql = self._generate_create_sql(
+                        schema,
+                        db_type,
+                        include_foreign_keys=not defer_foreign_keys,
+                        schemas=schemas,
+                    )
 
                     # Drop existing table if replace mode
                     if options.get("replace_existing", False):
@@ -889,19 +1405,13 @@ class AutoTableGenerator:
                     success = self._execute_create_table(create_sql, table_name)
 
                     if success:
-                        results["created_tables"].append(
-                            {
-                                "table_name": table_name,
-                                "columns": len(schema.columns),
-                                "relationships": len(schema.foreign_keys),
-                                "indexes": len(schema.indexes),
-                            }
-                        )
-
-                        # Create indexes
-                        if self.config["auto_create_indexes"]:
-                            self._create_indexes(schema)
-
+                        created[table_name] = {
+                            "table_name": table_name,
+                            "columns": len(schema.columns),
+                            "relationships": len(schema.foreign_keys),
+                            "indexes": len(schema.indexes),
+                        }
+                        results["created_tables"].append(created[table_name])
                         logger.info(f"✅ Created table: {table_name}")
                     else:
                         results["failed_tables"].append(table_name)
@@ -910,8 +1420,61 @@ class AutoTableGenerator:
                     logger.error(f"❌ Failed to create table {table_name}: {e}")
                     results["failed_tables"].append(table_name)
                     results["warnings"].append(f"Table {table_name}: {str(e)}")
+            results["phase_timings"]["create_tables"] = (
+                time.perf_counter() - phase_start
+            )
 
-            # Step 3: Generate summary report
+            # Step 3: Bulk load into tables without secondary indexes
+            if load_data:
+                phase_start = time.perf_counter()
+                load_options = (
+                    {**options, "foreign_keys": False}
+                    if check_foreign_keys
+                    else options
+                )
+                for table_name, entry in created.items():
+                    entry["rows_loaded"] = self._load_table(
+                        schemas[table_name], excel_data[table_name], load_options
+                    )
+                    if entry["rows_loaded"] < len(excel_data[table_name]):
+                        results["warnings"].append(
+                            f"Table {table_name}: data load failed"
+                        )
+                results["phase_timings"]["load_data"] = (
+                    time.perf_counter() - phase_start
+                )
+
+            # Step 4: Build indexes once over the loaded data
+            if self.config["auto_create_indexes"]:
+                phase_start = time.perf_counter()
+                for table_name in created:
+                    self._create_indexes(schemas[table_name])
+                results["phase_timings"]["create_indexes"] = (
+                    time.perf_counter() - phase_start
+                )
+
+            # Step 5: Add the foreign keys held back from CREATE TABLE, or
+            # check the ones SQLite did not enforce during the load
+            if defer_foreign_keys:
+                phase_start = time.perf_counter()
+                for table_name in created:
+                    self._add_foreign_keys(schemas[table_name])
+                results["phase_timings"]["add_constraints"] = (
+                    time.perf_counter() - phase_start
+                )
+            elif check_foreign_keys:
+                phase_start = time.perf_counter()
+                for table_name in created:
+                    violations = self._check_foreign_keys(
+                        schemas[table_name], schemas, results["warnings"]
+                    )
+                    if violations:
+                        results["foreign_key_violations"][table_name] = violations
+                results["phase_timings"]["check_constraints"] = (
+                    time.perf_counter() - phase_start
+                )
+
+            # Step 6: Generate summary report
             results["execution_time"] = (datetime.now() - start_time).total_seconds()
 
             # Save generation history
@@ -920,6 +1483,13 @@ class AutoTableGenerator:
             logger.info(
                 f"🎉 Table generation completed: {len(results['created_tables'])} created, {len(results['failed_tables'])} failed"
             )
+            logger.info(
+                "⏱️ Phase timings: "
+                + ", ".join(
+                    f"{phase} {seconds:.2f}s"
+                    for phase, seconds in results["phase_timings"].items()
+                )
+            )
 
         except Exception as e:
             logger.error(f"💥 Auto table generation failed: {e}")
@@ -1061,6 +1631,182 @@ class AutoTableGenerator:
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to create index {index['name']}: {e}")
 
+    def _load_table(
+        self, schema: TableSchema, df: pd.DataFrame, options: Dict[str, Any]
+    ) -> int:
+        """Bulk insert a sheet into its generated table; returns rows loaded
+
+        Text columns detected as dates are parsed with the format found
+        during analysis, so they load as DATE/DATETIME values.
+        """
+        if not self.connection_service or df.empty:
+            return 0
+
+        df = df.rename(columns={col.original_name: col.name for col in schema.columns})
+        sheet_name = schema.metadata.get("original_name", schema.name)
+        for col in schema.columns:
+            fmt = self.type_detector.date_formats.get((sheet_name, col.original_name))
+            series = df[col.name]
+            if not fmt or pd.api.types.is_datetime64_any_dtype(series):
+                continue
+
+            parsed = parse_dates(series, fmt)
+            present = series.notna() & (series.astype(str).str.strip() != "")
+            if parsed[present].notna().all():
+                df[col.name] = parsed
+            else:
+                logger.warning(f"⚠️ Column {col.name} has values not matching {fmt}")
+
+        date_columns = {col.name for col in schema.columns if col.data_type == "date"}
+        datetime_columns = [
+            col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])
+        ]
+        df = df.astype(object).where(df.notna(), None)
+        for col in datetime_columns:
+            # Plain dates and datetimes bind on every driver, Timestamps do not
+            df[col] = pd.Series(
+                [
+                    (
+                        None
+                        if value is None
+                        else (
+                            value.date()
+                            if col in date_columns
+                            else value.to_pydatetime()
+                        )
+                    )
+                    for value in df[col]
+                ],
+                index=df.index,
+                dtype=object,
+            )
+        records = df.to_dict("records")
+
+        if self.connection_service.bulk_insert(
+            schema.name, records, options.get("batch_size", 1000), options
+        ):
+            logger.info(f"📥 Loaded {len(records)} rows into {schema.name}")
+            return len(records)
+
+        logger.error(f"❌ Failed to load data into {schema.name}")
+        return 0
+
+    def _add_foreign_keys(self, schema: TableSchema):
+        """Add foreign key constraints after the referenced data is loaded"""
+        for fk in schema.foreign_keys:
+            constraint_name = f"FK_{schema.name}_{fk['column']}"
+            fk_sql = (
+                f"ALTER TABLE [{schema.name}] ADD CONSTRAINT [{constraint_name}] "
+                f"FOREIGN KEY ([{fk['column']}]) "
+                f"REFERENCES [{fk['references_table']}]([{fk['references_column']}])"
+            )
+            try:
+                success, result = self.connection_service.execute_query(fk_sql)
+                if success:
+                    logger.info(f"🔗 Added foreign key: {constraint_name}")
+                else:
+                    logger.warning(
+                        f"⚠️ Failed to add foreign key {constraint_name}: {result}"
+                    )
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to add foreign key {constraint_name}: {e}")
+
+    def _drop_non_unique_references(
+        self,
+        schemas: Dict[str, TableSchema],
+        excel_data: Dict[str, pd.DataFrame],
+        warnings: List[str],
+    ):
+        """Remove foreign keys whose referenced column holds duplicates
+
+        Both databases require a unique referenced column; SQLite would
+        otherwise reject every write to the child table.
+        """
+        for schema in schemas.values():
+            kept = []
+            for fk in schema.foreign_keys:
+                parent = schemas.get(fk["references_table"])
+                column = next(
+                    (
+                        col
+                        for col in (parent.columns if parent else [])
+                        if fk["references_column"] in (col.name, col.original_name)
+                    ),
+                    None,
+                )
+                df = excel_data.get(fk["references_table"])
+                if (
+                    column is not None
+                    and df is not None
+                    and column.original_name in df.columns
+                    and df[column.original_name].dropna().is_unique
+                ):
+                    kept.append(fk)
+                    continue
+
+                warnings.append(
+                    f"Table {schema.name}: skipped foreign key {fk['column']}, "
+                    f"{fk['references_table']}.{fk['references_column']} is not unique"
+                )
+                for col in schema.columns:
+                    if col.name == fk["column"]:
+                        col.is_foreign_key = False
+                        col.foreign_table = None
+                        col.foreign_column = None
+            schema.foreign_keys = kept
+
+    def _check_foreign_keys(
+        self,
+        schema: TableSchema,
+        schemas: Dict[str, TableSchema],
+        warnings: List[str],
+    ) -> int:
+        """Verify SQLite foreign keys after an unchecked load
+
+        SQLite rejects every write to a table whose foreign key references
+        a column without a unique index ("foreign key mismatch"), so such
+        a column gets one first; when that fails the other foreign keys
+        are still checked. Returns the number of rows whose value has no
+        parent row; each problem is also added to ``warnings``.
+        """
+        if not schema.foreign_keys:
+            return 0
+
+        for fk in schema.foreign_keys:
+            parent = schemas.get(fk["references_table"])
+            if parent and fk["references_column"] in parent.primary_keys:
+                continue
+
+            index_sql = (
+                f"CREATE UNIQUE INDEX IF NOT EXISTS "
+                f"[uq_{fk['references_table']}_{fk['references_column']}] "
+                f"ON [{fk['references_table']}] ([{fk['references_column']}])"
+            )
+            success, result = self.connection_service.execute_query(index_sql)
+            if not success:
+                warnings.append(
+                    f"Table {schema.name}: foreign key {fk['column']} references "
+                    f"non-unique column {fk['references_table']}."
+                    f"{fk['references_column']}; writes to {schema.name} will "
+                    f"fail until it is made unique"
+                )
+                continue
+
+        success, result = self.connection_service.execute_query(
+            "SELECT * FROM pragma_foreign_key_check(?)", (schema.name,)
+        )
+        if not success:
+            warnings.append(f"Table {schema.name}: foreign key check failed: {result}")
+            return 0
+
+        if result:
+            warnings.append(
+                f"Table {schema.name}: {len(result)} rows reference missing "
+                f"parent rows"
+            )
+            logger.warning(f"⚠️ {len(result)} foreign key violations in {schema.name}")
+        return len(result)
+
     def _generate_index_sql(self, index: Dict[str, Any], table_name: str) -> str:
         """Generate CREATE INDEX SQL"""
         index_type = index["type"]
@@ -0,0 +1,340 @@
+"""
+services/columnar_cache.py
+Columnar Cache - Arrow IPC copies of parsed worksheets
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarCache:
+    """On-disk Arrow IPC cache of parsed sheets
+
+    Entries are keyed by (path, size, mtime, sheet, header option, parsing
+    engine), so a workbook edited on disk never serves stale data and each
+    engine's parse is kept apart. Files are written in
+    record batches and read back through memory maps, which lets callers
+    pull the first rows or stream batches without loading the whole sheet.
+    The least recently used entries are evicted once the cache directory
+    grows past ``max_size_mb``. pyarrow is optional; without it every
+    lookup misses and nothing is written.
+    """
+
+    FILE_SUFFIX = ".arrow"
+
+    def __init__(self, cache_dir: str = "cache/columnar", max_size_mb: int = 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.batch_rows = 5000
+
+        try:
+            import pyarrow  # noqa: F401
+
+            self.available = True
+        except ImportError:
+            self.available = False
+            logger.debug("pyarrow not installed, columnar cache disabled")
+
+    def key_for(
+        self,
+        file_path: str,
+        sheet_name: Any = 0,
+        has_header: bool = True,
+        engine: str = "openpyxl",
+    ) -> Optional[str]:
+        """Cache key of one sheet of a workbook as it is on disk now"""
+        if not self.available:
+            return None
+
+        try:
+            path = Path(file_path).absolute()
+            stat = path.stat()
+        except OSError:
+            return None
+
+        identity = json.dumps(
+            [
+                str(path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                sheet_name,
+                has_header,
+                engine,
+            ],
+            default=str,
+        )
+        return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[pd.DataFrame]:
+        """Whole cached sheet, or None on a miss"""
+        reader = self._open(key)
+        if reader is None:
+            return None
+        return reader.read_pandas()
+
+    def head(self, key: Optional[str], nrows: int) -> Optional[pd.DataFrame]:
+        """First rows of a cached sheet, reading only the batches needed"""
+        reader = self._open(key)
+        if reader is None:
+            return None
+
+        batches = []
+        remaining = nrows
+        for index in range(reader.num_record_batches):
+            if remaining <= 0:
+                break
+            batch = reader.get_batch(index)
+            batches.append(batch.slice(0, remaining))
+            remaining -= batch.num_rows
+
+        import pyarrow as pa
+
+        if not batches:
+            return reader.schema.empty_table().to_pandas()
+        return pa.Table.from_batches(batches, reader.schema).to_pandas()
+
+    def num_rows(self, key: Optional[str]) -> Optional[int]:
+        """Row count of a cached sheet from batch metadata"""
+        reader = self._open(key)
+        if reader is None:
+            return None
+        return sum(
+            reader.get_batch(index).num_rows
+            for index in range(reader.num_record_batches)
+        )
+
+    def take(
+        self, key: Optional[str], indices: Iterable[int]
+    ) -> Optional[pd.DataFrame]:
+        """Rows at the given positions of a cached sheet"""
+        reader = self._open(key)
+        if reader is None:
+            return None
+
+        import pyarrow as pa
+
+        # read_all() over a memory map does not copy the column buffers
+        return reader.read_all().take(pa.array(list(indices), pa.int64())).to_pandas()
+
+    def iter_frames(
+        self, key: Optional[str], chunk_size: int
+    ) -> Optional[Iterator[pd.DataFrame]]:
+        """Stream a cached sheet as DataFrames of at most chunk_size rows"""
+        reader = self._open(key)
+        if reader is None:
+            return None
+
+        def frames():
+            table = reader.read_all()
+            for batch in table.to_batches(max_chunksize=chunk_size):
+                yield batch.to_pandas()
+
+        return frames()
+
+    def put(self, key: Optional[str], df: pd.DataFrame) -> bool:
+        """Store a parsed sheet"""
+        writer = self.writer(key)
+        if writer is None:
+            return False
+
+        try:
+            for start in range(0, len(df), self.batch_rows):
+                writer.write(df.iloc[start : start + self.batch_rows])
+            if len(df) == 0:
+                writer.write(df)
+            return writer.commit()
+        finally:
+            writer.close()
+
+    def writer(self, key: Optional[str]) -> Optional["ColumnarCacheWriter"]:
+        """Incremental writer for a sheet that is parsed in chunks"""
+        if not self.available or key is None:
+            return None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        return ColumnarCacheWriter(self, self._path(key))
+
+    def evict(self):
+        """Remove least recently used entries beyond the size limit"""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry)
+                for entry in self.cache_dir.glob(f"*{self.FILE_SUFFIX}")
+            ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_size_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= size
+                logger.debug(f"Evicted columnar cache entry {entry.name}")
+            except OSError as e:
+                logger.warning(f"Failed to evict {entry.name}: {e}")
+
+    def clear(self) -> bool:
+        """Remove every cached sheet"""
+        try:
+            for entry in self.cache_dir.glob(f"*{self.FILE_SUFFIX}"):
+                entry.unlink()
+            return True
+        except OSError as e:
+            logger.error(f"Columnar cache clear error: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count and disk usage"""
+        entries = list(self.cache_dir.glob(f"*{self.FILE_SUFFIX}"))
+        return {
+            "available": self.available,
+            "entries": len(entries),
+            "size_mb": round(sum(e.stat().st_size for e in entries) / 1048576, 2),
+            "max_size_mb": round(self.max_size_bytes / 1048576, 2),
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.FILE_SUFFIX}"
+
+    def _open(self, key: Optional[str]):
+        """Memory-map a cache entry and open it as an IPC file reader"""
+        if not self.available or key is None:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        import pyarrow as pa
+
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+            os.utime(path)  # Mark as recently used for eviction
+            return reader
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Discarding unreadable columnar cache entry: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+
+class ColumnarCacheWriter:
+    """Appends DataFrame chunks to a cache entry and publishes it atomically
+
+    The schema is taken from the first chunk. A column that is all empty
+    there has no type yet; the first chunk that gives it one widens the
+    schema, rewriting the chunks already written. A later chunk that
+    still cannot be cast abandons the entry, since a partial copy must
+    never be served. Nothing is visible to readers until commit()
+    succeeds.
+    """
+
+    def __init__(self, cache: ColumnarCache, path: Path):
+        self.cache = cache
+        self.path = path
+        self.temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        self._sink = None
+        self._writer = None
+        self._schema = None
+        self._failed = False
+
+    def write(self, df: pd.DataFrame):
+        """Append one chunk"""
+        if self._failed:
+            return
+
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._open_file(table.schema)
+            elif not table.schema.equals(self._schema):
+                schema = _widened_schema(self._schema, table.schema)
+                if schema is None:
+                    raise ValueError("columns changed between chunks")
+                if not schema.equals(self._schema):
+                    self._rewrite(schema)
+                table = table.cast(schema)
+            self._writer.write_table(table, max_chunksize=self.cache.batch_rows)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.debug(f"Sheet not cacheable as Arrow: {e}")
+            self._failed = True
+
+    def _open_file(self, schema):
+        import pyarrow as pa
+
+        self._schema = schema
+        self._sink = pa.OSFile(str(self.temp_path), "wb")
+        self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def _rewrite(self, schema):
+        """Recast the chunks written so far to a widened schema"""
+        import pyarrow as pa
+
+        self._writer.close()
+        self._sink.close()
+        # Read into memory, not through a map, as the file is overwritten
+        source = pa.BufferReader(self.temp_path.read_bytes())
+        written = pa.ipc.open_file(source).read_all().cast(schema)
+
+        self._open_file(schema)
+        self._writer.write_table(written, max_chunksize=self.cache.batch_rows)
+
+    def commit(self) -> bool:
+        """Publish the entry once every chunk has been written"""
+        if self._failed or self._writer is None:
+            return False
+
+        try:
+            self._writer.close()
+            self._sink.close()
+            self._writer = self._sink = None
+            os.replace(self.temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to publish columnar cache entry: {e}")
+            return False
+
+        self.cache.evict()
+        return True
+
+    def close(self):
+        """Discard the entry unless it was committed"""
+        try:
+            if self._writer is not None:
+                self._writer.close()
+            if self._sink is not None:
+                self._sink.close()
+        except Exception:
+            pass
+        finally:
+            self._writer = self._sink = None
+            if self.temp_path.exists():
+                self.temp_path.unlink(missing_ok=True)
+
+
+def _widened_schema(current, incoming):
+    """Schema fitting both, filling in columns typed only as null so far
+
+    None when the columns differ. Typed columns keep the current type;
+    incoming values are cast to it.
+    """
+    import pyarrow as pa
+
+    if current.names != incoming.names:
+        return None
+
+    fields = []
+    for field, other in zip(current, incoming):
+        if pa.types.is_null(field.type) and not pa.types.is_null(other.type):
+            field = field.with_type(other.type)
+        fields.append(field)
+    return pa.schema(fields, metadata=incoming.metadata)
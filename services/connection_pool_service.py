@@ -6,19 +6,59 @@ Supports both SQLite and SQL Server with automatic failover
 
 import sqlite3
 import threading
-import queue
 import time
 import os
-from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime
-from contextlib import contextmanager
+from collections import deque
+from typing import Dict, Any, Deque, Optional, Tuple, List, Union
+from datetime import date, datetime
+from contextlib import ExitStack, contextmanager
 import logging
 
+from services.parallel_bulk_writer import ParallelBulkWriter
+from services.query_log import QueryLog
+from services.sqlite_writer import SQLiteWriteQueue, is_read_only
+from services.sqlserver_insert_engine import SqlServerInsertEngine
+from utils.batch_size_controller import BatchSizeController, profile_key
+from utils.type_inference import TypeWideningTracker, sql_type_for
+
 logger = logging.getLogger(__name__)
 
+# Store dates as ISO text, as sqlite3's deprecated default adapters do
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+
+
+class _Waiter:
+    """A thread queued for a connection, woken by its own condition"""
+
+    __slots__ = ("condition", "grant", "enqueued_at")
+
+    def __init__(self, lock):
+        self.condition = threading.Condition(lock)
+        self.grant = None
+        self.enqueued_at = time.monotonic()
+
+
+# Grant telling a waiter it holds a slot to open a new connection
+_CREATE = object()
+
 
 class ConnectionPool:
-    """Thread-safe connection pool with automatic management"""
+    """Thread-safe connection pool with automatic management
+
+    Checkout never polls: a thread that finds no idle connection and no
+    spare capacity queues a waiter and blocks on its condition. Returning
+    or closing a connection hands it (or the freed slot) to the oldest
+    waiter and wakes only that thread, so waiters are served in FIFO order
+    and new arrivals cannot jump the queue.
+
+    Connections are validated lazily: only one that sat idle longer than
+    ``validation_idle_seconds``, or that was returned after an error, pays
+    for a ``SELECT 1``. Connections older than ``max_lifetime`` are closed
+    instead of reused. A background reaper closes expired connections and
+    those idle past ``idle_timeout`` down to ``min_idle``, and pre-warms
+    the pool back up to ``min_idle``.
+    """
 
     def __init__(
         self,
@@ -26,28 +66,61 @@ class ConnectionPool:
         pool_size: int = 5,
         max_overflow: int = 10,
         timeout: int = 30,
+        min_idle: int = 2,
+        max_lifetime: Optional[float] = 3600,
+        idle_timeout: Optional[float] = 600,
+        validation_idle_seconds: float = 30,
+        reaper_interval: float = 30,
     ):
         self.connection_config = connection_config
         self.pool_size = pool_size
         self.max_overflow = max_overflow
         self.timeout = timeout
+        self.min_idle = min(min_idle, pool_size)
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.validation_idle_seconds = validation_idle_seconds
+        self.reaper_interval = reaper_interval
 
         # Pool management
-        self.connections = queue.Queue(maxsize=pool_size)
+        self.connections: Deque[Any] = deque()
         self.checked_out = set()
         self.overflow_connections = set()
+        self.waiters: Deque[_Waiter] = deque()
         self.lock = threading.RLock()
+        self._open = 0  # idle + checked out + being opened or validated
+
+        # Per-connection monotonic timestamps
+        self.opened_at: Dict[Any, float] = {}
+        self.last_used: Dict[Any, float] = {}
 
         # Statistics
         self.created_at = datetime.now()
         self.total_connections_created = 0
         self.connection_errors = 0
+        self.total_waits = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_waiters = 0
+        self.checkout_timeouts = 0
+        self.validations = 0
+        self.validation_failures = 0
+        self.expired_connections = 0
+        self.reaped_connections = 0
         self._shutdown = False
 
         # Initialize pool
         self._ensure_database_exists()
         self._initialize_pool()
 
+        self._reaper_stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        if reaper_interval and reaper_interval > 0:
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="connection-pool-reaper", daemon=True
+            )
+            self._reaper.start()
+
     def _ensure_database_exists(self):
         """Auto-create database if needed"""
         db_type = self.connection_config.get("type", "sqlite")
@@ -90,11 +163,12 @@ class ConnectionPool:
 
     def _initialize_pool(self):
         """Initialize pool with minimum connections"""
-        for _ in range(min(self.pool_size, 2)):
+        for _ in range(self.min_idle):
             try:
                 conn = self._create_connection()
-                self.connections.put(conn)
-                self.total_connections_created += 1
+                self._register_locked(conn)
+                self.connections.append(conn)
+                self._open += 1
             except Exception as e:
                 logger.warning(f"Failed to pre-create connection: {e}")
 
@@ -104,46 +178,163 @@ class ConnectionPool:
             raise Exception("Connection pool is shutting down")
 
         timeout = timeout or self.timeout
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        retry = False
 
-        while time.time() - start_time < timeout:
-            try:
-                # Try to get from pool
-                conn = self.connections.get_nowait()
-                if self._is_connection_valid(conn):
+        while True:
+            grant = self._acquire(deadline, timeout, front=retry)
+            retry = True
+
+            if grant is _CREATE:
+                try:
+                    conn = self._create_connection()
+                except Exception as e:
+                    logger.error(f"Failed to create connection: {e}")
                     with self.lock:
-                        self.checked_out.add(conn)
-                    return conn
-                else:
-                    try:
-                        conn.close()
-                    except:
-                        pass
+                        self.connection_errors += 1
+                        self._discard_locked()
+                    # Back off briefly before retrying a failing server
+                    time.sleep(min(0.1, max(0.0, deadline - time.monotonic())))
                     continue
-            except queue.Empty:
-                pass
 
-            # Pool is empty, try to create new connection
+                with self.lock:
+                    if self._open > self.pool_size:
+                        self.overflow_connections.add(conn)
+                    self._register_locked(conn)
+                    self.checked_out.add(conn)
+                return conn
+
+            conn = grant
+            if self._usable(conn):
+                with self.lock:
+                    self.checked_out.add(conn)
+                return conn
+
             with self.lock:
-                total_active = len(self.checked_out) + len(self.overflow_connections)
-                if total_active < self.pool_size + self.max_overflow:
-                    try:
-                        conn = self._create_connection()
-                        if total_active >= self.pool_size:
-                            self.overflow_connections.add(conn)
-                        self.checked_out.add(conn)
-                        self.total_connections_created += 1
-                        return conn
-                    except Exception as e:
-                        self.connection_errors += 1
-                        logger.error(f"Failed to create connection: {e}")
+                self._close_locked(conn)
+                self._discard_locked()
 
-            time.sleep(0.1)
+    def _usable(self, conn) -> bool:
+        """Reuse check: expire old connections, validate only stale ones
 
-        raise Exception(f"Connection timeout after {timeout} seconds")
+        Counters are updated under the pool lock; the validation query
+        itself runs outside it.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if self._expired(conn, now):
+                self.expired_connections += 1
+                return False
+            if now - self.last_used.get(conn, 0.0) <= self.validation_idle_seconds:
+                return True
+            self.validations += 1
+
+        if self._is_connection_valid(conn):
+            return True
+        with self.lock:
+            self.validation_failures += 1
+        return False
 
-    def return_connection(self, conn):
-        """Return connection to pool with validation"""
+    def _expired(self, conn, now: float) -> bool:
+        if not self.max_lifetime:
+            return False
+        return now - self.opened_at.get(conn, now) > self.max_lifetime
+
+    def _acquire(self, deadline: float, timeout: float, front: bool = False):
+        """Take an idle connection or a slot to open one, queueing if needed"""
+        with self.lock:
+            if self._shutdown:
+                raise Exception("Connection pool is shutting down")
+
+            # Step 1: Serve immediately only when nobody is already waiting
+            if not self.waiters or front:
+                grant = self._grant_locked()
+                if grant is not None:
+                    return grant
+
+            # Step 2: Queue up and sleep until a release hands us a grant
+            waiter = _Waiter(self.lock)
+            if front:
+                self.waiters.appendleft(waiter)
+            else:
+                self.waiters.append(waiter)
+            self.max_waiters = max(self.max_waiters, len(self.waiters))
+
+            while waiter.grant is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._shutdown:
+                    self.waiters.remove(waiter)
+                    if self._shutdown:
+                        raise Exception("Connection pool is shutting down")
+                    self.checkout_timeouts += 1
+                    raise Exception(f"Connection timeout after {timeout} seconds")
+                waiter.condition.wait(remaining)
+
+            waited = time.monotonic() - waiter.enqueued_at
+            self.total_waits += 1
+            self.total_wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+            return waiter.grant
+
+    def _grant_locked(self):
+        """An idle connection, a slot for a new one, or None when exhausted"""
+        if self.connections:
+            return self.connections.pop()
+        if self._open < self.pool_size + self.max_overflow:
+            self._open += 1
+            return _CREATE
+        return None
+
+    def _dispatch_locked(self):
+        """Hand whatever is available to waiters, oldest first"""
+        while self.waiters:
+            grant = self._grant_locked()
+            if grant is None:
+                break
+            waiter = self.waiters.popleft()
+            waiter.grant = grant
+            waiter.condition.notify()
+
+    def _discard_locked(self):
+        """Account for a closed connection and pass its slot on"""
+        self._open -= 1
+        self._dispatch_locked()
+
+    def _release_locked(self, conn):
+        """Put a healthy connection back into service"""
+        if self.waiters:
+            # Direct handoff: the oldest waiter gets this connection
+            waiter = self.waiters.popleft()
+            waiter.grant = conn
+            waiter.condition.notify()
+        elif conn in self.overflow_connections:
+            self._close_locked(conn)
+            self._open -= 1
+        else:
+            self.connections.append(conn)
+
+    def _register_locked(self, conn):
+        now = time.monotonic()
+        self.opened_at[conn] = now
+        self.last_used[conn] = now
+        self.total_connections_created += 1
+
+    def _close_locked(self, conn):
+        """Close a connection and forget its bookkeeping"""
+        try:
+            conn.close()
+        except:
+            pass
+        self.opened_at.pop(conn, None)
+        self.last_used.pop(conn, None)
+        self.overflow_connections.discard(conn)
+
+    def return_connection(self, conn, validate: bool = False):
+        """Return connection to pool
+
+        Returned connections are not validated unless ``validate`` is set,
+        e.g. after the caller hit an error on it.
+        """
         if self._shutdown or not conn:
             try:
                 if conn:
@@ -152,6 +343,8 @@ class ConnectionPool:
                 pass
             return
 
+        valid = not validate or self._is_connection_valid(conn)
+
         with self.lock:
             if conn not in self.checked_out:
                 try:
@@ -161,29 +354,14 @@ class ConnectionPool:
                 return
 
             self.checked_out.remove(conn)
+            now = time.monotonic()
+            self.last_used[conn] = now
 
-            if self._is_connection_valid(conn):
-                if conn in self.overflow_connections:
-                    self.overflow_connections.remove(conn)
-                    try:
-                        conn.close()
-                    except:
-                        pass
-                else:
-                    try:
-                        self.connections.put_nowait(conn)
-                    except queue.Full:
-                        try:
-                            conn.close()
-                        except:
-                            pass
+            if not valid or self._shutdown or self._expired(conn, now):
+                self._close_locked(conn)
+                self._discard_locked()
             else:
-                try:
-                    conn.close()
-                except:
-                    pass
-                if conn in self.overflow_connections:
-                    self.overflow_connections.remove(conn)
+                self._release_locked(conn)
 
     def _create_connection(self):
         """Create new database connection"""
@@ -196,8 +374,16 @@ class ConnectionPool:
         else:
             raise ValueError(f"Unsupported database type: {db_type}")
 
-    def _create_sqlite_connection(self):
-        """Create SQLite connection with optimizations"""
+    def _create_sqlite_connection(self, read_only: Optional[bool] = None):
+        """Create SQLite connection with optimizations
+
+        ``read_only`` (default: the ``read_only`` key of the config) opens a
+        connection that refuses writes, for the reader pool of single-writer
+        mode.
+        """
+        if read_only is None:
+            read_only = self.connection_config.get("read_only", False)
+
         try:
             db_file = self.connection_config.get("file", "denso888_data.db")
 
@@ -220,6 +406,8 @@ class ConnectionPool:
             cursor.execute("PRAGMA synchronous = NORMAL")
             cursor.execute("PRAGMA cache_size = 10000")
             cursor.execute("PRAGMA temp_store = memory")
+            if read_only:
+                cursor.execute("PRAGMA query_only = ON")
             cursor.close()
 
             return conn
@@ -291,14 +479,89 @@ class ConnectionPool:
         except Exception:
             return False
 
+    def release_idle_connections(self) -> int:
+        """Close connections sitting idle in the pool"""
+        closed = 0
+
+        with self.lock:
+            while self.connections:
+                self._close_locked(self.connections.pop())
+                closed += 1
+            self._open -= closed
+            self._dispatch_locked()  # Freed slots go to queued waiters
+
+        return closed
+
+    # ================ REAPER ================
+    def _reap_loop(self):
+        while not self._reaper_stop.wait(self.reaper_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Connection pool reaper failed: {e}")
+
+    def reap(self) -> Dict[str, int]:
+        """Close expired and surplus idle connections, then top up to min_idle"""
+        if self._shutdown:
+            return {"closed": 0, "created": 0}
+
+        now = time.monotonic()
+        closed = 0
+
+        with self.lock:
+            # Step 1: Coldest connections sit at the left of the idle deque
+            for conn in list(self.connections):
+                idle = now - self.last_used.get(conn, now)
+                surplus = len(self.connections) > self.min_idle
+                if self._expired(conn, now) or (
+                    self.idle_timeout and idle > self.idle_timeout and surplus
+                ):
+                    self.connections.remove(conn)
+                    self._close_locked(conn)
+                    self._open -= 1
+                    closed += 1
+            self.reaped_connections += closed
+            self._dispatch_locked()
+
+            # Step 2: Reserve slots to pre-warm, never dipping into overflow
+            slots = 0
+            while (
+                len(self.connections) + slots < self.min_idle
+                and self._open < self.pool_size
+            ):
+                self._open += 1
+                slots += 1
+
+        created = 0
+        for _ in range(slots):
+            try:
+                conn = self._create_connection()
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm connection: {e}")
+                with self.lock:
+                    self.connection_errors += 1
+                    self._discard_locked()
+                continue
+
+            with self.lock:
+                self._register_locked(conn)
+                self._release_locked(conn)
+            created += 1
+
+        if closed or created:
+            logger.debug(f"Pool reaper closed {closed}, opened {created} connections")
+        return {"closed": closed, "created": created}
+
     @contextmanager
     def get_managed_connection(self):
         """Context manager for automatic connection management"""
         conn = None
+        failed = False
         try:
             conn = self.get_connection()
             yield conn
         except Exception as e:
+            failed = True
             if conn:
                 try:
                     conn.rollback()
@@ -307,23 +570,26 @@ class ConnectionPool:
             raise
         finally:
             if conn:
-                self.return_connection(conn)
+                self.return_connection(conn, validate=failed)
 
     def close_all(self):
         """Close all connections safely"""
         self._shutdown = True
+        self._reaper_stop.set()
+        if self._reaper is not None and self._reaper is not threading.current_thread():
+            self._reaper.join(timeout=5)
 
         with self.lock:
+            # Wake every waiter so it can fail fast
+            for waiter in self.waiters:
+                waiter.condition.notify()
+
             # Close pool connections
-            while True:
+            while self.connections:
                 try:
-                    conn = self.connections.get_nowait()
-                    try:
-                        conn.close()
-                    except:
-                        pass
-                except queue.Empty:
-                    break
+                    self.connections.pop().close()
+                except:
+                    pass
 
             # Close checked out connections
             for conn in list(self.checked_out):
@@ -340,23 +606,371 @@ class ConnectionPool:
                 except:
                     pass
             self.overflow_connections.clear()
+            self.opened_at.clear()
+            self.last_used.clear()
+            self._open = 0
 
     def get_stats(self) -> Dict[str, Any]:
         """Get pool statistics"""
         with self.lock:
+            now = time.monotonic()
+            idle_times = [now - self.last_used.get(c, now) for c in self.connections]
             return {
                 "pool_size": self.pool_size,
-                "connections_in_pool": self.connections.qsize(),
+                "min_idle": self.min_idle,
+                "open_connections": self._open,
+                "connections_in_pool": len(self.connections),
                 "checked_out_connections": len(self.checked_out),
                 "overflow_connections": len(self.overflow_connections),
                 "total_connections_created": self.total_connections_created,
                 "connection_errors": self.connection_errors,
+                "waiting_requests": len(self.waiters),
+                "max_waiting_requests": self.max_waiters,
+                "total_waits": self.total_waits,
+                "avg_wait_ms": (
+                    self.total_wait_time / self.total_waits * 1000
+                    if self.total_waits
+                    else 0.0
+                ),
+                "max_wait_ms": self.max_wait_time * 1000,
+                "checkout_timeouts": self.checkout_timeouts,
+                "validations": self.validations,
+                "validation_failures": self.validation_failures,
+                "expired_connections": self.expired_connections,
+                "reaped_connections": self.reaped_connections,
+                "longest_idle_seconds": max(idle_times, default=0.0),
                 "is_shutdown": self._shutdown,
             }
 
 
+class BulkLoad:
+    """One table load fed chunk by chunk, see ConnectionPoolService.bulk_load
+
+    The first insert() checks or creates the table and prepares the insert
+    statement, the SQL Server insert engine and, in SQLite bulk load mode,
+    one connection held with the load profile applied until close(). In
+    single-writer mode the writer is instead leased for one commit group
+    at a time, so writes queued behind the load run between groups. With
+    SQL Server ``parallel_workers`` one ParallelBulkWriter takes every
+    chunk, and insert() returns once the chunk is queued. Later chunks
+    only widen columns they outgrow and insert.
+
+    ``rows_committed`` counts rows once their transaction commits, which
+    may be several chunks after insert() returned; ``on_commit`` is
+    called with the row count of each commit.
+    """
+
+    def __init__(
+        self,
+        service: "ConnectionPoolService",
+        table_name: str,
+        options: Dict[str, Any],
+    ):
+        config = service.current_config or {}
+        pool = service.current_pool
+
+        self.service = service
+        self.table_name = table_name
+        self.options = options
+        self.db_type = config.get("type", "sqlite")
+        self.bulk_load = self.db_type == "sqlite" and options.get(
+            "bulk_load", config.get("bulk_load", False)
+        )
+        self.fast_executemany = self.db_type == "sqlserver" and options.get(
+            "fast_executemany", config.get("fast_executemany", False)
+        )
+        self.foreign_keys = self.db_type != "sqlite" or options.get(
+            "foreign_keys", True
+        )
+        self.commit_every = max(1, int(options.get("commit_every", 1)))
+        # One pooled connection stays free for ALTERs that widen columns
+        self.workers = min(
+            options.get("parallel_workers", config.get("parallel_workers", 1)),
+            pool.pool_size + pool.max_overflow - 1,
+        )
+        self.parallel = self.db_type == "sqlserver" and self.workers > 1
+        self.on_chunk = options.get("on_chunk")
+        self.on_commit = options.get("on_commit")
+        self.rows_written = 0
+        self.rows_committed = 0
+
+        self.columns: Optional[List[str]] = None
+        self.insert_sql: Optional[str] = None
+        self.insert_engine: Optional[SqlServerInsertEngine] = None
+
+        # SQLite bulk load mode: one connection for the whole load, or
+        # the writer connection leased per commit group
+        self._conn = None
+        self._held = ExitStack()
+        self._group = ExitStack()
+        self._lease_per_group = False
+        self._open_batches = 0
+        self._open_rows = 0
+
+        # SQL Server parallel mode: one writer for the whole load
+        self._writer: Optional[ParallelBulkWriter] = None
+        self._pending: Deque[List[Any]] = deque()
+        self._last_chunk_done = 0.0
+
+    def insert(self, rows: List[Dict], batch_size: Optional[int] = None) -> int:
+        """Insert one chunk in batches of ``batch_size`` (default: the whole
+        chunk); raises when the insert fails"""
+        if not rows:
+            return 0
+
+        start = time.perf_counter()
+        batch_size = max(1, batch_size or len(rows))
+
+        if self.columns is None:
+            self._prepare(rows)
+        else:
+            self.service._widen_columns(self.table_name, rows)
+
+        if self.parallel:
+            self._insert_parallel(rows, batch_size)
+            return len(rows)
+
+        if self.bulk_load:
+            inserted = self._insert_held(rows, batch_size)
+        else:
+            inserted = self._insert_chunk(rows, batch_size)
+            self._committed(inserted)
+
+        self.rows_written += inserted
+        if self.on_chunk:
+            self.on_chunk(rows, time.perf_counter() - start)
+        return inserted
+
+    def close(self, failed: bool = False):
+        """Commit the open batch group, or roll it back, and release the
+        held connection; in parallel mode wait for the queued batches, or
+        drop them on failure"""
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            if failed:
+                writer.cancel()
+            try:
+                writer.finish()
+            except Exception:
+                if not failed:
+                    raise
+
+        try:
+            self._end_group(failed)
+        finally:
+            self._conn = None
+            self._held.close()
+
+    # ================ SETUP ================
+    def _prepare(self, rows: List[Dict]):
+        """Table, insert statement and load connection, from the first chunk"""
+        service = self.service
+
+        # Auto-create table if needed, typed from the whole first chunk;
+        # later chunks widen columns whose values outgrow that type
+        if not service._ensure_table_exists(self.table_name, rows):
+            service._widen_columns(self.table_name, rows)
+
+        self.columns = list(rows[0].keys())
+        placeholders = ", ".join(["?" for _ in self.columns])
+        columns_str = ", ".join([f"[{col}]" for col in self.columns])
+        self.insert_sql = (
+            f"INSERT INTO [{self.table_name}] ({columns_str}) VALUES ({placeholders})"
+        )
+
+        if self.fast_executemany:
+            self.insert_engine = SqlServerInsertEngine(
+                service.get_table_schema(self.table_name),
+                memory_budget_mb=self.options.get("memory_budget_mb", 64),
+            )
+
+        if self.bulk_load:
+            if service.current_writer is not None:
+                self._lease_per_group = True
+            else:
+                self._conn = self._hold_connection(self._held)
+
+    def _hold_connection(self, stack: ExitStack):
+        """Hold one SQLite connection with the load profile applied, until
+        ``stack`` closes
+
+        Writer mode leases the writer connection and leaves the locking
+        mode alone, so readers stay unblocked while the writer loads.
+        """
+        service = self.service
+        writer = service.current_writer
+
+        if writer is not None:
+            conn = stack.enter_context(writer.lease())
+        else:
+            conn = stack.enter_context(service.current_pool.get_managed_connection())
+
+        # The pragma is ignored inside a transaction, so it is switched
+        # before the load opens one
+        if not self.foreign_keys:
+            stack.enter_context(service._sqlite_foreign_keys(conn, enabled=False))
+
+        stack.enter_context(
+            service._sqlite_load_profile(conn, exclusive_lock=writer is None)
+        )
+        return conn
+
+    def _begin_group(self):
+        """Open a commit group, leasing the writer for it in writer mode"""
+        if self._lease_per_group:
+            self._conn = self._hold_connection(self._group)
+        self._conn.execute("BEGIN")
+
+    def _end_group(self, failed: bool = False):
+        """Commit the open group, or roll it back, and release a leased writer"""
+        conn = self._conn
+        try:
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK" if failed else "COMMIT")
+                if not failed:
+                    self._committed(self._open_rows)
+        finally:
+            self._open_batches = 0
+            self._open_rows = 0
+            if self._lease_per_group:
+                self._conn = None
+                self._group.close()
+
+    # ================ INSERT PATHS ================
+    def _insert_held(self, rows: List[Dict], batch_size: int) -> int:
+        """Insert batches on the held connection inside BEGIN/COMMIT
+
+        The SQLite connections run in autocommit mode, so without an
+        explicit transaction every row is committed to the WAL separately.
+        Groups of ``commit_every`` batches share one transaction, across
+        chunk boundaries; groups committed before a failure are kept.
+        """
+        try:
+            for i in range(0, len(rows), batch_size):
+                if self._open_batches == 0:
+                    self._begin_group()
+
+                batch = rows[i : i + batch_size]
+                self._conn.executemany(
+                    self.insert_sql,
+                    [[row.get(col) for col in self.columns] for row in batch],
+                )
+                self._open_batches += 1
+                self._open_rows += len(batch)
+
+                if self._open_batches >= self.commit_every:
+                    self._end_group()
+
+        except Exception:
+            self._end_group(failed=True)
+            raise
+
+        return len(rows)
+
+    def _insert_chunk(self, rows: List[Dict], batch_size: int) -> int:
+        """Insert one chunk on a connection of its own, committed at the end"""
+        service = self.service
+
+        def load(conn) -> int:
+            if self.insert_engine:
+                inserted = self.insert_engine.insert(
+                    conn, self.insert_sql, self.columns, rows
+                )
+                conn.commit()
+                return inserted
+            return service._insert_batches(
+                conn, self.insert_sql, self.columns, rows, batch_size
+            )
+
+        def unchecked_load(conn) -> int:
+            # The pragma is ignored inside a transaction, so it is switched
+            # before the load opens one
+            with service._sqlite_foreign_keys(conn, enabled=False):
+                if service.current_writer is not None:
+                    conn.execute("BEGIN IMMEDIATE")
+                return load(conn)
+
+        run_load = load if self.foreign_keys else unchecked_load
+        if service.current_writer is not None:
+            return service.current_writer.run(run_load, transaction=self.foreign_keys)
+
+        with service.current_pool.get_managed_connection() as conn:
+            return run_load(conn)
+
+    def _insert_parallel(self, rows: List[Dict], batch_size: int):
+        """Queue one chunk for the parallel writer of the whole load
+
+        The writer and its pooled connections are started on the first
+        chunk. Rows are counted, and ``on_chunk`` called, as the chunk's
+        batches commit. The chunk is timed on the wall clock, from when it
+        was fed or the previous chunk finished, whichever is later, to its
+        last commit; the workers overlap, so their summed batch times would
+        overstate it several times over.
+        """
+        if self._writer is None:
+            self._writer = ParallelBulkWriter(
+                self.service.current_pool,
+                self.insert_sql,
+                self.columns,
+                workers=self.workers,
+                insert_engine=self.insert_engine,
+                on_batch=self._batch_written,
+            )
+            self._writer.start()
+
+        if self.insert_engine:
+            batch_size = min(batch_size, self.insert_engine.batch_rows(self.columns))
+
+        # [chunk, batches still uncommitted, time it was fed]
+        self._pending.append([rows, -(-len(rows) // batch_size), time.perf_counter()])
+        if not self._writer.feed(rows, batch_size):
+            raise Exception(self._writer.error or "Parallel insert stopped")
+
+    def _batch_written(self, result: Dict[str, Any]):
+        """Parallel writer callback, called in batch order on a worker
+        thread, one call at a time"""
+        on_batch = self.options.get("on_batch")
+        if on_batch:
+            on_batch(result)
+
+        self.rows_written += result["rows"]
+        self._committed(result["rows"])
+        chunk = self._pending[0]
+        chunk[1] -= 1
+        if chunk[1] == 0:
+            self._pending.popleft()
+            done = time.perf_counter()
+            seconds = done - max(chunk[2], self._last_chunk_done)
+            self._last_chunk_done = done
+            if self.on_chunk:
+                self.on_chunk(chunk[0], seconds)
+
+    def _committed(self, rows: int):
+        """Count rows whose transaction just committed"""
+        if not rows:
+            return
+        self.rows_committed += rows
+        if self.on_commit:
+            self.on_commit(rows)
+
+
 class ConnectionPoolService:
-    """Enhanced connection pool service with multiple database support"""
+    """Enhanced connection pool service with multiple database support
+
+    SQLite connections configured with ``single_writer`` route every write
+    through one SQLiteWriteQueue, while reads (SELECT, WITH queries without
+    DML, EXPLAIN and reporting PRAGMAs) use a pool of read-only WAL
+    connections that are never blocked by an import in progress. Each
+    write is committed on its own there, so execute_query() fails on
+    BEGIN, COMMIT and other transaction control statements.
+    """
+
+    # PRAGMA profile applied to SQLite connections during bulk loads
+    SQLITE_BULK_LOAD_PRAGMAS = {
+        "synchronous": "OFF",
+        "cache_size": -262144,  # 256 MB page cache
+        "locking_mode": "EXCLUSIVE",
+    }
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
@@ -365,6 +979,18 @@ class ConnectionPoolService:
         self.current_config: Optional[Dict[str, Any]] = None
         self._lock = threading.RLock()
 
+        # SQLite single-writer mode: one writer per database, keyed like pools
+        self.writers: Dict[str, SQLiteWriteQueue] = {}
+        self.current_writer: Optional[SQLiteWriteQueue] = None
+
+        # Column types of auto-created tables, widened as batches arrive
+        self._type_trackers: Dict[str, TypeWideningTracker] = {}
+
+        # Optional log of query shapes and latency for the index advisor
+        self.query_log: Optional[QueryLog] = None
+        if self.config.get("query_log"):
+            self.enable_query_log(self.config.get("query_log_path"))
+
         # Service statistics
         self.service_stats = {
             "connections_created": 0,
@@ -383,15 +1009,25 @@ class ConnectionPoolService:
                 # Reuse existing pool if available
                 if pool_key in self.pools:
                     self.current_pool = self.pools[pool_key]
+                    self.current_writer = self.writers.get(pool_key)
                     self.current_config = config
                     return True
 
-                # Create new pool
+                single_writer = config.get("type", "sqlite") == "sqlite" and (
+                    config.get("single_writer", False)
+                )
+
+                # Create new pool, read-only when writes go through the writer
                 pool = ConnectionPool(
-                    config,
+                    {**config, "read_only": True} if single_writer else config,
                     pool_size=config.get("pool_size", 5),
                     max_overflow=config.get("max_overflow", 10),
                     timeout=config.get("timeout", 30),
+                    min_idle=config.get("min_idle", 2),
+                    max_lifetime=config.get("pool_recycle", 3600),
+                    idle_timeout=config.get("idle_timeout", 600),
+                    validation_idle_seconds=config.get("validation_idle_seconds", 30),
+                    reaper_interval=config.get("reaper_interval", 30),
                 )
 
                 # Test pool with a connection
@@ -400,11 +1036,22 @@ class ConnectionPoolService:
                     cursor.execute("SELECT 1")
                     cursor.close()
 
+                writer = None
+                if single_writer:
+                    writer = SQLiteWriteQueue(
+                        lambda: pool._create_sqlite_connection(read_only=False)
+                    )
+                    self.writers[pool_key] = writer
+
                 # Store pool
                 self.pools[pool_key] = pool
                 self.current_pool = pool
+                self.current_writer = writer
                 self.current_config = config
 
+                if config.get("query_log") and self.query_log is None:
+                    self.enable_query_log(config.get("query_log_path"))
+
                 logger.info(
                     f"Connected to {config.get('type')} database with connection pool"
                 )
@@ -414,17 +1061,46 @@ class ConnectionPoolService:
             logger.error(f"Failed to connect to database: {e}")
             return False
 
+    def enable_query_log(self, path: Optional[str] = None) -> QueryLog:
+        """Start recording query shapes and latency"""
+        if self.query_log is None:
+            self.query_log = QueryLog(path or "logs/query_log.json")
+            logger.info("Query logging enabled")
+        return self.query_log
+
+    def disable_query_log(self):
+        """Stop recording, saving what was logged"""
+        if self.query_log is not None:
+            self.query_log.save()
+            self.query_log = None
+
     def execute_query(self, query: str, params: tuple = ()) -> Tuple[bool, Any]:
         """Execute query using connection pool"""
         if not self.current_pool:
             return False, "No database connection available"
 
+        start = time.perf_counter()
+        success, result = self._execute_query(query, params)
+        if success and self.query_log is not None:
+            self.query_log.record(query, params, time.perf_counter() - start)
+        return success, result
+
+    def _execute_query(self, query: str, params: tuple) -> Tuple[bool, Any]:
         try:
+            # Reads never queue behind the writer
+            read_only = is_read_only(query)
+            if self.current_writer is not None and not read_only:
+                affected_rows = self.current_writer.execute(query, params)
+                return (
+                    True,
+                    f"Query executed successfully. {affected_rows} rows affected.",
+                )
+
             with self.current_pool.get_managed_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
 
-                if query.strip().upper().startswith("SELECT"):
+                if read_only:
                     if hasattr(cursor, "fetchall"):
                         rows = cursor.fetchall()
                         # Convert to list of dicts for consistency
@@ -497,7 +1173,9 @@ class ConnectionPoolService:
                 query = f"PRAGMA table_info([{table_name}])"
             else:  # SQL Server
                 query = """
-                    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+                    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT,
+                           CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION,
+                           NUMERIC_SCALE, DATETIME_PRECISION
                     FROM INFORMATION_SCHEMA.COLUMNS 
                     WHERE TABLE_NAME = ?
                     ORDER BY ORDINAL_POSITION
@@ -527,6 +1205,10 @@ class ConnectionPoolService:
                                 "nullable": row.get("IS_NULLABLE", "YES") == "YES",
                                 "default": row.get("COLUMN_DEFAULT"),
                                 "primary_key": False,
+                                "max_length": row.get("CHARACTER_MAXIMUM_LENGTH"),
+                                "precision": row.get("NUMERIC_PRECISION"),
+                                "scale": row.get("NUMERIC_SCALE"),
+                                "datetime_precision": row.get("DATETIME_PRECISION"),
                             }
                         )
                 return schema
@@ -538,56 +1220,199 @@ class ConnectionPoolService:
             return []
 
     def bulk_insert(
-        self, table_name: str, data: List[Dict], batch_size: int = 1000
+        self,
+        table_name: str,
+        data: List[Dict],
+        batch_size: int = 1000,
+        options: Optional[Dict[str, Any]] = None,
     ) -> bool:
-        """Bulk insert data with batching"""
+        """Bulk insert data with batching
+
+        Options:
+            bulk_load: For SQLite, wrap batches in explicit transactions and
+                apply the bulk load PRAGMA profile while inserting. Defaults
+                to the ``bulk_load`` key of the connection config.
+            commit_every: Number of batches grouped into one transaction
+                in bulk load mode (default 1).
+            fast_executemany: For SQL Server, bind parameters as typed
+                arrays derived from the table schema and send each batch
+                in one round trip. Defaults to the ``fast_executemany`` key
+                of the connection config.
+            memory_budget_mb: Parameter buffer budget that sizes
+                fast_executemany batches (default 64).
+            parallel_workers: For SQL Server, insert batches concurrently
+                over this many pooled connections, committing each batch.
+                Capped one below the pool's capacity so column widening
+                can still check out a connection. Defaults to the
+                ``parallel_workers`` key of the connection config (1,
+                serial).
+            on_batch: Callback receiving each parallel batch result
+                (batch, rows, seconds, worker) in batch order.
+            foreign_keys: For SQLite, pass False to load with foreign key
+                enforcement off on the load connection; the caller checks
+                the constraints afterwards (default True).
+        """
         if not self.current_pool or not data:
             return False
 
         try:
-            # Get first row to determine columns
-            sample_row = data[0]
-            columns = list(sample_row.keys())
-
-            # Auto-create table if needed
-            self._ensure_table_exists(table_name, sample_row)
-
-            # Prepare insert SQL
-            placeholders = ", ".join(["?" for _ in columns])
-            columns_str = ", ".join([f"[{col}]" for col in columns])
-            insert_sql = (
-                f"INSERT INTO [{table_name}] ({columns_str}) VALUES ({placeholders})"
-            )
+            with self.bulk_load(table_name, options) as load:
+                load.insert(data, batch_size)
 
-            total_inserted = 0
+            logger.info(f"Bulk insert completed: {load.rows_written} records")
+            return True
 
-            with self.current_pool.get_managed_connection() as conn:
-                cursor = conn.cursor()
+        except Exception as e:
+            logger.error(f"Bulk insert failed: {e}")
+            return False
+
+    @contextmanager
+    def bulk_load(self, table_name: str, options: Optional[Dict[str, Any]] = None):
+        """Load one table from a stream of row chunks
+
+        Yields a BulkLoad whose insert() takes one chunk at a time, for
+        imports that read their rows chunk by chunk. Takes the
+        bulk_insert() options; the bulk load PRAGMA profile, exclusive
+        lock and ``commit_every`` grouping apply to the whole load rather
+        than to each chunk. On exit the last batch group is committed, or
+        rolled back when the body raised.
+
+        Options:
+            on_chunk: Callback receiving each inserted chunk and the seconds
+                it took, in chunk order.
+            on_commit: Callback receiving the row count of each commit, once
+                the rows are durable.
+        """
+        if not self.current_pool:
+            raise Exception("No database connection available")
 
-                # Insert in batches
-                for i in range(0, len(data), batch_size):
-                    batch = data[i : i + batch_size]
-                    batch_values = []
+        load = BulkLoad(self, table_name, options or {})
+        try:
+            yield load
+        except BaseException:
+            load.close(failed=True)
+            raise
+        load.close()
 
-                    for row in batch:
-                        values = [row.get(col) for col in columns]
-                        batch_values.append(values)
+    def _insert_batches(
+        self,
+        conn,
+        insert_sql: str,
+        columns: List[str],
+        data: List[Dict],
+        batch_size: int,
+    ) -> int:
+        """Insert rows batch by batch and commit once at the end"""
+        total_inserted = 0
+        cursor = conn.cursor()
+
+        # Insert in batches
+        for i in range(0, len(data), batch_size):
+            batch = data[i : i + batch_size]
+            batch_values = []
+
+            for row in batch:
+                values = [row.get(col) for col in columns]
+                batch_values.append(values)
+
+            cursor.executemany(insert_sql, batch_values)
+            total_inserted += len(batch_values)
+
+        conn.commit()
+        cursor.close()
+        return total_inserted
 
-                    cursor.executemany(insert_sql, batch_values)
-                    total_inserted += len(batch_values)
+    @contextmanager
+    def _sqlite_foreign_keys(self, conn, enabled: bool):
+        """Temporarily switch foreign key enforcement on a connection
+
+        Any transaction the body leaves open is rolled back before the
+        previous setting is restored, since the pragma has no effect
+        inside one.
+        """
+        cursor = conn.cursor()
+        previous = cursor.execute("PRAGMA foreign_keys").fetchone()[0]
+        cursor.execute(f"PRAGMA foreign_keys = {'ON' if enabled else 'OFF'}")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            cursor.execute(f"PRAGMA foreign_keys = {previous}")
+            cursor.close()
 
-                conn.commit()
-                cursor.close()
+    @contextmanager
+    def _sqlite_load_profile(self, conn, exclusive_lock: bool = True):
+        """Temporarily apply the bulk load PRAGMA profile to a connection
+
+        Without ``exclusive_lock`` the locking mode is left alone, so WAL
+        readers can keep reading while the load runs.
+        """
+        cursor = conn.cursor()
+        previous = {}
+        pragmas = {
+            pragma: value
+            for pragma, value in self.SQLITE_BULK_LOAD_PRAGMAS.items()
+            if exclusive_lock or pragma != "locking_mode"
+        }
 
-            logger.info(f"Bulk insert completed: {total_inserted} records")
-            return True
+        try:
+            for pragma, value in pragmas.items():
+                previous[pragma] = cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+                cursor.execute(f"PRAGMA {pragma} = {value}")
 
-        except Exception as e:
-            logger.error(f"Bulk insert failed: {e}")
-            return False
+            if "locking_mode" in previous:
+                self._acquire_exclusive_lock(conn)
+
+            yield conn
+
+        finally:
+            for pragma, value in reversed(list(previous.items())):
+                try:
+                    cursor.execute(f"PRAGMA {pragma} = {value}")
+                except Exception as e:
+                    logger.warning(f"Failed to restore PRAGMA {pragma}: {e}")
+
+            # The exclusive lock is only released on the next database access
+            if "locking_mode" in previous:
+                try:
+                    cursor.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+                except Exception as e:
+                    logger.warning(f"Failed to release exclusive lock: {e}")
+
+            cursor.close()
+
+    def _acquire_exclusive_lock(self, conn, timeout_ms: int = 2000):
+        """Take the exclusive lock up front or fall back to normal locking
+
+        In WAL mode every other open connection blocks the exclusive lock,
+        so idle pooled connections are closed first. If a checked-out
+        connection still holds the database, the load continues with
+        normal locking instead of waiting out the busy timeout.
+        """
+        self.current_pool.release_idle_connections()
+
+        cursor = conn.cursor()
+        busy_timeout = cursor.execute("PRAGMA busy_timeout").fetchone()[0]
 
-    def _ensure_table_exists(self, table_name: str, sample_row: Dict):
-        """Auto-create table if it doesn't exist"""
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {timeout_ms}")
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("COMMIT")
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            cursor.execute("PRAGMA locking_mode = NORMAL")
+            cursor.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            logger.warning(
+                f"Exclusive lock unavailable ({e}), bulk load continues with normal locking"
+            )
+        finally:
+            cursor.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+            cursor.close()
+
+    def _ensure_table_exists(self, table_name: str, sample_rows: List[Dict]) -> bool:
+        """Auto-create table if it doesn't exist; True if it was created"""
         try:
             # Check if table exists
             if self.current_config.get("type") == "sqlite":
@@ -600,44 +1425,29 @@ class ConnectionPoolService:
             success, result = self.execute_query(check_query, (table_name,))
 
             if success and result:
-                return  # Table exists
+                return False  # Table exists
 
             # Create table
-            self._create_table_from_sample(table_name, sample_row)
+            self._create_table_from_sample(table_name, sample_rows)
+            return True
 
         except Exception as e:
             logger.error(f"Error ensuring table exists: {e}")
+            return False
 
-    def _create_table_from_sample(self, table_name: str, sample_row: Dict):
-        """Create table from sample data"""
+    def _create_table_from_sample(self, table_name: str, sample_rows: List[Dict]):
+        """Create table with column types inferred from sample rows"""
+        db_type = (
+            "sqlite" if self.current_config.get("type") == "sqlite" else "sqlserver"
+        )
         columns = []
 
-        for col_name, value in sample_row.items():
+        tracker = TypeWideningTracker()
+        tracker.observe(sample_rows)
+        for col_name in sample_rows[0].keys():
+            data_type = tracker.types.setdefault(col_name, "string")
             clean_name = self._clean_column_name(col_name)
-
-            # Detect column type
-            if value is None:
-                col_type = "TEXT"
-            elif isinstance(value, bool):
-                col_type = (
-                    "BOOLEAN" if self.current_config.get("type") == "sqlite" else "BIT"
-                )
-            elif isinstance(value, int):
-                col_type = (
-                    "INTEGER" if self.current_config.get("type") == "sqlite" else "INT"
-                )
-            elif isinstance(value, float):
-                col_type = (
-                    "REAL" if self.current_config.get("type") == "sqlite" else "FLOAT"
-                )
-            else:
-                col_type = (
-                    "TEXT"
-                    if self.current_config.get("type") == "sqlite"
-                    else "NVARCHAR(255)"
-                )
-
-            columns.append(f"[{clean_name}] {col_type}")
+            columns.append(f"[{clean_name}] {sql_type_for(data_type, db_type)}")
 
         # Add ID column
         if self.current_config.get("type") == "sqlite":
@@ -655,9 +1465,120 @@ class ConnectionPoolService:
                 )
             """
 
-        self.execute_query(create_sql)
+        success, _ = self.execute_query(create_sql)
+        if success:
+            self._type_trackers[table_name] = tracker
         logger.info(f"Created table: {table_name}")
 
+    def _widen_columns(self, table_name: str, rows: List[Dict]):
+        """Widen auto-created columns that a new batch no longer fits
+
+        SQLite columns take any value, so widening there only updates the
+        tracked types; SQL Server columns are altered in place.
+        """
+        tracker = self._type_trackers.get(table_name)
+        if tracker is None:
+            return
+
+        for event in tracker.observe(rows):
+            logger.info(
+                f"Widening column {event['column']} of {table_name} from "
+                f"{event['from_type']} to {event['to_type']}"
+            )
+            if self.current_config.get("type") == "sqlite":
+                continue
+
+            clean_name = self._clean_column_name(event["column"])
+            sql_type = sql_type_for(event["to_type"], "sqlserver")
+            success, result = self.execute_query(
+                f"ALTER TABLE [{table_name}] ALTER COLUMN [{clean_name}] {sql_type} NULL"
+            )
+            if not success:
+                logger.error(f"Failed to widen column {clean_name}: {result}")
+
+    @contextmanager
+    def deferred_indexes(
+        self, table_name: str, timings: Optional[Dict[str, float]] = None
+    ):
+        """Suspend a table's secondary indexes around a bulk load
+
+        Non-unique secondary indexes are dropped (SQLite) or disabled (SQL
+        Server) on entry and rebuilt in one pass on exit, even when the
+        load fails. Primary keys and unique indexes stay in place so the
+        load is still checked against them. Seconds spent on each side are
+        written to ``timings`` as drop_indexes and rebuild_indexes.
+        """
+        timings = timings if timings is not None else {}
+
+        start = time.perf_counter()
+        indexes = self.suspend_indexes(table_name)
+        timings["drop_indexes"] = time.perf_counter() - start
+
+        try:
+            yield indexes
+        finally:
+            start = time.perf_counter()
+            self.rebuild_indexes(table_name, indexes)
+            timings["rebuild_indexes"] = time.perf_counter() - start
+
+    def suspend_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        """Drop or disable non-unique secondary indexes of a table"""
+        if self.current_config.get("type") == "sqlite":
+            success, rows = self.execute_query(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table_name,),
+            )
+            indexes = [
+                row
+                for row in (rows if success else [])
+                if not row["sql"].upper().startswith("CREATE UNIQUE")
+            ]
+            statement = "DROP INDEX [{name}]"
+        else:
+            success, rows = self.execute_query(
+                "SELECT i.name FROM sys.indexes i "
+                "WHERE i.object_id = OBJECT_ID(?) AND i.type = 2 "
+                "AND i.is_primary_key = 0 AND i.is_unique = 0 "
+                "AND i.is_unique_constraint = 0 AND i.is_disabled = 0",
+                (table_name,),
+            )
+            indexes = rows if success else []
+            statement = "ALTER INDEX [{name}] ON [{table}] DISABLE"
+
+        suspended = []
+        for index in indexes:
+            success, result = self.execute_query(
+                statement.format(name=index["name"], table=table_name)
+            )
+            if success:
+                suspended.append(index)
+            else:
+                logger.warning(f"Could not suspend index {index['name']}: {result}")
+
+        if suspended:
+            logger.info(f"Suspended {len(suspended)} indexes on {table_name}")
+        return suspended
+
+    def rebuild_indexes(self, table_name: str, indexes: List[Dict[str, Any]]) -> int:
+        """Rebuild indexes returned by suspend_indexes; returns the count"""
+        rebuilt = 0
+        for index in indexes:
+            if index.get("sql"):
+                statement = index["sql"]
+            else:
+                statement = f"ALTER INDEX [{index['name']}] ON [{table_name}] REBUILD"
+
+            success, result = self.execute_query(statement)
+            if success:
+                rebuilt += 1
+            else:
+                logger.error(f"Failed to rebuild index {index['name']}: {result}")
+
+        if indexes:
+            logger.info(f"Rebuilt {rebuilt}/{len(indexes)} indexes on {table_name}")
+        return rebuilt
+
     def _clean_column_name(self, name: str) -> str:
         """Clean column name for database compatibility"""
         import re
@@ -669,6 +1590,27 @@ class ConnectionPoolService:
         clean = clean.strip("_").lower()
         return clean if clean else "column"
 
+    def batch_size_controller(
+        self, table_name: str, batch_size: Union[int, str, None] = "auto"
+    ) -> BatchSizeController:
+        """Batch size controller for inserts into a table of this connection
+
+        ``batch_size`` is a fixed row count or "auto" to adapt it, starting
+        from the size remembered for this connection profile and table.
+        """
+        config = self.current_config or {}
+        return BatchSizeController(
+            profile_key(
+                config.get("type", "sqlite"),
+                config.get("file"),
+                config.get("server", ""),
+                config.get("database", ""),
+            ),
+            table_name,
+            batch_size,
+            memory_budget_mb=config.get("memory_budget_mb", 64),
+        )
+
     def _generate_pool_key(self, config: Dict[str, Any]) -> str:
         """Generate unique key for connection pool"""
         db_type = config.get("type", "sqlite")
@@ -689,22 +1631,35 @@ class ConnectionPoolService:
 
         if self.current_pool:
             stats["current_pool_stats"] = self.current_pool.get_stats()
+        if self.current_writer:
+            stats["current_writer_stats"] = self.current_writer.get_stats()
 
         return stats
 
     def close_all_pools(self):
         """Close all connection pools"""
         with self._lock:
+            for writer in self.writers.values():
+                try:
+                    writer.close()
+                except Exception as e:
+                    logger.error(f"Error closing SQLite writer: {e}")
+
             for pool in self.pools.values():
                 try:
                     pool.close_all()
                 except Exception as e:
                     logger.error(f"Error closing pool: {e}")
 
+            self.writers.clear()
+            self.current_writer = None
             self.pools.clear()
             self.current_pool = None
             self.current_config = None
 
+        if self.query_log is not None:
+            self.query_log.save()
+
     def __del__(self):
         """Cleanup on destruction"""
         try:
@@ -3,14 +3,33 @@ services/excel_service.py
 Excel Processing Service - Clean & Focused - FIXED
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Iterator, Optional
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import logging
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill
 
+from utils.data_profiler import DataProfiler
+from utils.date_inference import DateFormatCache, looks_like_date_column
+from utils.type_inference import (
+    ColumnStats,
+    TypeInferenceEngine,
+    infer_column_types,
+    sql_type_for,
+)
+
+from .columnar_cache import ColumnarCache
+from .parallel_sheet_loader import ParallelSheetLoader
+from .workbook_session import WorkbookSession
+from .xlsx_reader import (
+    XlsxSheetReader,
+    build_column_headers,
+    fit_row,
+    select_column_indexes,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,8 +38,28 @@ class ExcelService:
 
     def __init__(self):
         self.supported_extensions = [".xlsx", ".xls", ".xlsm", ".xlsb"]
+        self.streaming_extensions = [".xlsx", ".xlsm"]
+        self.default_chunk_size = 5000
         self.current_file = None
         self.file_info = {}
+        self.columnar_cache = ColumnarCache()
+        self.date_formats = DateFormatCache()
+        self._session: Optional[WorkbookSession] = None
+
+    def open_session(self, file_path: str) -> WorkbookSession:
+        """Return the open workbook session for a file, reusing it if current"""
+        if self._session is not None and self._session.is_current(str(file_path)):
+            return self._session
+
+        self.close_session()
+        self._session = WorkbookSession(str(file_path))
+        return self._session
+
+    def close_session(self):
+        """Close the cached workbook session"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze Excel file and return basic information"""
@@ -47,21 +86,33 @@ class ExcelService:
             logger.error(f"Failed to analyze Excel file: {e}")
             return {"error": str(e)}
 
+        finally:
+            # Release the file so Excel can save it while the app is open
+            self.close_session()
+
     def read_file(self, file_path: str, options: Dict[str, Any] = None) -> List[Dict]:
-        """Read Excel file and return data as list of dictionaries"""
+        """Read Excel file and return data as list of dictionaries
+
+        Set ``options["engine"] = "native"`` to parse .xlsx/.xlsm sheets with
+        XlsxSheetReader instead of openpyxl cell objects. Parsed sheets are
+        kept in the columnar cache unless ``options["use_cache"]`` is False.
+        ``options["columns"]`` limits reading to the listed source columns and
+        ``options["column_mappings"]`` renames source columns to target names;
+        mappings alone select their source columns. Mapped names are kept
+        as given instead of being cleaned. ``options["parse_dates"]`` turns
+        text and Excel serial date columns into datetimes: True infers each
+        column's format, a dict maps column names to known formats.
+        """
         try:
             options = options or {}
 
             # Read Excel file
-            df = pd.read_excel(
-                file_path,
-                header=0 if options.get("has_header", True) else None,
-                sheet_name=options.get("sheet_name", 0),
-            )
+            df = self.read_dataframe(file_path, options)
+            df = self._parse_date_columns(df, options, file_path)
 
             # Clean data if requested
             if options.get("clean_data", True):
-                df = self._clean_dataframe(df)
+                df = self._clean_dataframe(df, self._mapped_names(options))
 
             # Convert to list of dictionaries
             data = df.to_dict("records")
@@ -73,6 +124,350 @@ class ExcelService:
             logger.error(f"Failed to read Excel file: {e}")
             raise Exception(f"Excel read error: {str(e)}")
 
+    def read_dataframe(
+        self, file_path: str, options: Dict[str, Any] = None
+    ) -> pd.DataFrame:
+        """Read one sheet as an uncleaned DataFrame, preferring the columnar cache"""
+        options = options or {}
+        columns, mappings = self._projection(options)
+
+        cache_key = self._cache_key(file_path, options)
+        df = self.columnar_cache.get(cache_key)
+        if df is not None:
+            return self._project_frame(df, columns, mappings)
+
+        if self._use_native_engine(file_path, options):
+            # Projection is applied while parsing; only whole sheets are cached
+            df = self._read_native(file_path, options)
+            if columns is None:
+                self.columnar_cache.put(cache_key, df)
+            return df
+
+        df = pd.read_excel(
+            file_path,
+            header=0 if options.get("has_header", True) else None,
+            sheet_name=options.get("sheet_name", 0),
+            usecols=columns,
+        )
+
+        # Only whole sheets are cached
+        if columns is None:
+            self.columnar_cache.put(cache_key, df)
+        return self._project_frame(df, columns, mappings)
+
+    def read_sheets(
+        self,
+        file_path: str,
+        sheet_names: List[str] = None,
+        options: Dict[str, Any] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Read several sheets concurrently into uncleaned DataFrames
+
+        Options are passed to read_dataframe for every sheet, plus
+        ``max_workers`` and ``memory_limit_mb`` for the worker processes.
+        """
+        options = dict(options or {})
+        loader = ParallelSheetLoader(
+            max_workers=options.pop("max_workers", None),
+            memory_limit_mb=options.pop("memory_limit_mb", None),
+        )
+        if sheet_names is None:
+            sheet_names = self.get_sheet_names(file_path)
+        return loader.load(file_path, sheet_names, options)
+
+    def read_file_chunks(
+        self, file_path: str, options: Dict[str, Any] = None
+    ) -> Iterator[List[Dict]]:
+        """Stream Excel file as fixed-size chunks of row dictionaries
+
+        Rows are pulled from an openpyxl read-only worksheet, so only one
+        chunk is held in memory at a time. Duplicate removal happens within
+        each chunk because the whole sheet is never materialized. How a
+        column's missing values are filled is fixed by the first chunk
+        holding a value for it, so an all-empty chunk never turns a numeric
+        column into text; cells before that chunk stay None. The
+        ``engine`` option selects the native sheet parser as in read_file.
+        A completed stream is written through to the columnar cache, and
+        later streams of the unchanged sheet are served from it.
+        """
+        options = options or {}
+        chunk_size = max(1, int(options.get("chunk_size", self.default_chunk_size)))
+
+        if Path(file_path).suffix.lower() not in self.streaming_extensions:
+            # Legacy formats cannot be streamed by openpyxl
+            data = self.read_file(file_path, options)
+            for i in range(0, len(data), chunk_size):
+                yield data[i : i + chunk_size]
+            return
+
+        total_rows = 0
+        fills: Dict[str, str] = {}  # Missing-value handling, fixed per column
+        for df in self.iter_raw_frames(file_path, options):
+            chunk = self._frame_to_records(df, options, file_path, fills)
+            if chunk:
+                total_rows += len(chunk)
+                yield chunk
+
+        logger.info(f"Successfully streamed {total_rows} rows from Excel file")
+
+    def iter_raw_frames(
+        self, file_path: str, options: Dict[str, Any] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a sheet as uncleaned DataFrame chunks
+
+        Chunks come from the columnar cache when the sheet is cached, and
+        otherwise from the streaming parser with the completed stream
+        written through to the cache. Legacy formats are read whole and
+        sliced.
+        """
+        options = options or {}
+        chunk_size = max(1, int(options.get("chunk_size", self.default_chunk_size)))
+
+        if Path(file_path).suffix.lower() not in self.streaming_extensions:
+            df = self.read_dataframe(file_path, options)
+            for i in range(0, len(df), chunk_size):
+                yield df.iloc[i : i + chunk_size]
+            return
+
+        columns, mappings = self._projection(options)
+        cache_key = self._cache_key(file_path, options)
+        frames = self.columnar_cache.iter_frames(cache_key, chunk_size)
+        cache_writer = None
+        if frames is not None:
+            frames = (self._project_frame(df, columns, mappings) for df in frames)
+        else:
+            frames = self._stream_frames(file_path, options, chunk_size)
+            if columns is None:
+                cache_writer = self.columnar_cache.writer(cache_key)
+
+        try:
+            for df in frames:
+                if cache_writer:
+                    cache_writer.write(df)
+                yield df
+
+            if cache_writer:
+                cache_writer.commit()
+
+        finally:
+            if cache_writer:
+                cache_writer.close()
+
+    def _stream_frames(
+        self, file_path: str, options: Dict[str, Any], chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Parse a sheet into raw, uncleaned DataFrame chunks"""
+        native = self._use_native_engine(file_path, options)
+        try:
+            if native:
+                reader = XlsxSheetReader(file_path)
+            else:
+                reader = load_workbook(file_path, read_only=True, data_only=True)
+        except Exception as e:
+            logger.error(f"Failed to open Excel file for streaming: {e}")
+            raise Exception(f"Excel read error: {str(e)}")
+
+        sheet_name = options.get("sheet_name", 0)
+        has_header = options.get("has_header", True)
+        selected, mappings = self._projection(options)
+
+        try:
+            if native:
+                for batch in reader.iter_batches(
+                    sheet_name, chunk_size, has_header, selected
+                ):
+                    # Renames happen once per batch, not per row
+                    yield pd.DataFrame(
+                        {
+                            mappings.get(col, col): values
+                            for col, values in batch.items()
+                        }
+                    )
+                return
+
+            sheet = self._get_worksheet(reader, sheet_name)
+
+            columns = None
+            first_row = 1
+            if has_header:
+                header_row = next(sheet.iter_rows(max_row=1, values_only=True), None)
+                if header_row is None:
+                    return
+                columns = build_column_headers(header_row)
+                first_row = 2
+
+            indexes = None
+            names = columns
+            max_col = None
+            if selected is not None and columns is not None:
+                indexes = select_column_indexes(columns, selected)
+                names = [mappings.get(columns[i], columns[i]) for i in indexes]
+                max_col = max(indexes, default=0) + 1
+
+            buffer = []
+            blank_rows = 0
+            for row in sheet.iter_rows(
+                min_row=first_row, max_col=max_col, values_only=True
+            ):
+                # Blank rows are kept only once a populated row follows,
+                # so trailing formatted-but-empty rows are dropped
+                if all(value is None for value in row):
+                    if columns is not None:
+                        blank_rows += 1
+                    continue
+
+                if columns is None:
+                    columns = names = list(range(len(row)))
+                    if selected is not None:
+                        indexes = select_column_indexes(columns, selected)
+                        names = [mappings.get(columns[i], columns[i]) for i in indexes]
+
+                row = fit_row(row, len(columns))
+                if indexes is not None:
+                    row = tuple(row[i] for i in indexes)
+
+                pending = [(None,) * len(names)] * blank_rows + [row]
+                blank_rows = 0
+                for pending_row in pending:
+                    buffer.append(pending_row)
+                    if len(buffer) >= chunk_size:
+                        yield pd.DataFrame(buffer, columns=names)
+                        buffer = []
+
+            if buffer:
+                yield pd.DataFrame(buffer, columns=names)
+
+        finally:
+            reader.close()
+
+    def _get_worksheet(self, workbook, sheet_name: Any = 0):
+        """Resolve worksheet by index or name"""
+        if isinstance(sheet_name, int):
+            sheet = workbook.worksheets[sheet_name]
+        else:
+            sheet = workbook[sheet_name]
+
+        # Stored dimensions may be stale and would truncate rows
+        sheet.reset_dimensions()
+        return sheet
+
+    def _use_native_engine(self, file_path: str, options: Dict[str, Any]) -> bool:
+        """Check whether the native sheet parser was requested and applies"""
+        return (
+            options.get("engine", "openpyxl") == "native"
+            and Path(file_path).suffix.lower() in self.streaming_extensions
+        )
+
+    def _read_native(self, file_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+        """Read a whole sheet with the native parser"""
+        frames = list(self._stream_frames(file_path, options, self.default_chunk_size))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def _cache_key(
+        self, file_path: Any, options: Dict[str, Any] = None
+    ) -> Optional[str]:
+        """Columnar cache key for the sheet selected by options"""
+        options = options or {}
+        if not options.get("use_cache", True):
+            return None
+        return self.columnar_cache.key_for(
+            str(file_path),
+            options.get("sheet_name", 0),
+            options.get("has_header", True),
+            "native" if self._use_native_engine(file_path, options) else "openpyxl",
+        )
+
+    def _projection(
+        self, options: Dict[str, Any]
+    ) -> Tuple[Optional[List[Any]], Dict[Any, Any]]:
+        """Selected source columns and their renames from read options"""
+        mappings = dict(options.get("column_mappings") or {})
+        columns = options.get("columns")
+        if columns is None and mappings:
+            columns = list(mappings)
+        return (list(columns) if columns is not None else None), mappings
+
+    def _mapped_names(self, options: Dict[str, Any]) -> set:
+        """Target column names that must not be cleaned"""
+        return set((options.get("column_mappings") or {}).values())
+
+    def _project_frame(
+        self, df: pd.DataFrame, columns: Optional[List[Any]], mappings: Dict
+    ) -> pd.DataFrame:
+        """Select and rename the columns of an already parsed frame"""
+        if columns is not None:
+            select_column_indexes(list(df.columns), columns)
+            df = df[columns]
+        if mappings:
+            df = df.rename(columns=mappings)
+        return df
+
+    def _frame_to_records(
+        self,
+        df: pd.DataFrame,
+        options: Dict[str, Any],
+        file_path: str = None,
+        fills: Optional[Dict[str, str]] = None,
+    ) -> List[Dict]:
+        """Convert a raw chunk into cleaned row dictionaries"""
+        df = self._parse_date_columns(df, options, file_path)
+
+        if options.get("clean_data", True):
+            df = self._clean_dataframe(df, self._mapped_names(options), fills)
+        else:
+            df = df.dropna(how="all")
+
+        return df.to_dict("records")
+
+    def _parse_date_columns(
+        self, df: pd.DataFrame, options: Dict[str, Any], file_path: str = None
+    ) -> pd.DataFrame:
+        """Parse date columns with one cached explicit format per column
+
+        The format is inferred from the first chunk that reaches a column
+        and reused for later chunks and later reads of the same sheet.
+        A dict limits parsing to its columns, matched by name or cleaned
+        name and mapped to a format, or to None to infer one. A column is
+        only converted when every present value parses.
+        """
+        parse = options.get("parse_dates")
+        if not parse:
+            return df
+
+        known = parse if isinstance(parse, dict) else {}
+        source = (file_path, options.get("sheet_name", 0))
+
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(
+                series
+            ) or pd.api.types.is_bool_dtype(series):
+                continue
+
+            key = (source, col)
+            name = col if col in known else self._clean_column_name(col)
+            if name in known:
+                if known[name]:
+                    self.date_formats.set(key, known[name])
+            elif known:
+                continue  # Only the listed columns
+
+            parsed = self.date_formats.parse(
+                key, series, allow_serial=looks_like_date_column(col)
+            )
+            if parsed is None:
+                continue
+
+            present = series.notna() & (series.astype(str).str.strip() != "")
+            if parsed[present].notna().all():
+                df[col] = parsed
+            else:
+                logger.warning(f"Column {col} has values not matching its date format")
+
+        return df
+
     def export_data(
         self, data: List[Dict], file_path: str, format_type: str = "xlsx"
     ) -> bool:
@@ -100,8 +495,7 @@ class ExcelService:
     def get_sheet_names(self, file_path: str) -> List[str]:
         """Get list of sheet names in Excel file"""
         try:
-            excel_file = pd.ExcelFile(file_path)
-            return excel_file.sheet_names
+            return self.open_session(file_path).sheet_names
         except Exception as e:
             logger.error(f"Failed to get sheet names: {e}")
             return []
@@ -121,7 +515,7 @@ class ExcelService:
                 )
 
             # Try to read first row
-            pd.read_excel(file_path, nrows=1)
+            self.open_session(file_path).read_sample(nrows=1)
 
             return True, "File is valid"
 
@@ -168,7 +562,7 @@ class ExcelService:
 
         try:
             # Quick read test
-            pd.read_excel(file_path, nrows=1)
+            self.open_session(file_path).read_sample(nrows=1)
             return True
         except Exception:
             return False
@@ -191,15 +585,24 @@ class ExcelService:
     ) -> Dict[str, Any]:
         """Read sample data from Excel file"""
         try:
-            # Read sample rows
-            df_sample = pd.read_excel(file_path, nrows=sample_rows)
+            cache_key = self._cache_key(file_path)
+            df_sample = self.columnar_cache.head(cache_key, sample_rows)
+
+            if df_sample is not None:
+                # Sheet was parsed before, answer from the columnar copy
+                total_rows = self.columnar_cache.num_rows(cache_key)
+                row_count_exact = True
+            else:
+                session = self.open_session(file_path)
 
-            # Read full file for row count (more efficient way)
-            df_info = pd.read_excel(file_path, usecols=[0])
-            total_rows = len(df_info)
+                # Sample rows and row count share one open workbook
+                df_sample = session.read_sample(nrows=sample_rows)
+                total_rows = session.row_count()
+                row_count_exact = session.row_count_exact()
 
             return {
                 "total_rows": total_rows,
+                "row_count_exact": row_count_exact,
                 "total_columns": len(df_sample.columns),
                 "columns": list(df_sample.columns),
                 "data_types": {
@@ -213,21 +616,41 @@ class ExcelService:
             logger.error(f"Failed to read sample data: {e}")
             return {"error": str(e)}
 
-    def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean DataFrame for database import"""
+    def _clean_dataframe(
+        self,
+        df: pd.DataFrame,
+        preserve_columns: set = None,
+        fills: Optional[Dict[str, str]] = None,
+    ) -> pd.DataFrame:
+        """Clean DataFrame for database import
+
+        ``fills`` carries the missing-value handling of each column across
+        the chunks of one stream. A column keeps the handling of the first
+        chunk with a value in it; until then its missing cells stay None.
+        """
         try:
+            preserve_columns = preserve_columns or set()
+
             # Remove completely empty rows
             df = df.dropna(how="all")
 
-            # Clean column names
-            df.columns = [self._clean_column_name(col) for col in df.columns]
+            # Clean column names, keeping explicitly mapped target names
+            df.columns = [
+                col if col in preserve_columns else self._clean_column_name(col)
+                for col in df.columns
+            ]
 
             # Handle missing values
             for col in df.columns:
-                if df[col].dtype == "object":
-                    df[col] = df[col].fillna("").astype(str).str.strip()
-                else:
-                    df[col] = df[col].fillna(0)
+                kind = fills.get(col) if fills is not None else None
+                if kind is None:
+                    if fills is not None and df[col].isna().all():
+                        df[col] = df[col].astype(object).where(df[col].notna(), None)
+                        continue
+                    kind = self._fill_kind(df[col])
+                    if fills is not None:
+                        fills[col] = kind
+                df[col] = self._fill_missing(df[col], kind)
 
             # Remove duplicate rows
             df = df.drop_duplicates()
@@ -238,6 +661,31 @@ class ExcelService:
             logger.error(f"Failed to clean DataFrame: {e}")
             return df
 
+    def _fill_kind(self, series: pd.Series) -> str:
+        """How missing values of a column are filled: text, date or number"""
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            return "text"
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return "date"
+        return "number"
+
+    def _fill_missing(self, series: pd.Series, kind: str) -> pd.Series:
+        """Fill missing values of one column the way its kind requires"""
+        if kind == "text":
+            return series.fillna("").astype(str).str.strip()
+        if kind == "date":
+            # Missing dates stay NULL rather than becoming 0; plain
+            # datetimes bind on every driver, Timestamps do not
+            return pd.Series(
+                [
+                    None if pd.isna(value) else pd.Timestamp(value).to_pydatetime()
+                    for value in series
+                ],
+                index=series.index,
+                dtype=object,
+            )
+        return series.fillna(0)
+
     def _clean_column_name(self, name: str) -> str:
         """Clean column name for database compatibility"""
         import re
@@ -271,100 +719,12 @@ class ExcelService:
     def _analyze_data_quality(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze data quality metrics"""
         try:
-            total_cells = len(df) * len(df.columns)
-            null_cells = df.isnull().sum().sum()
-
-            return {
-                "total_rows": len(df),
-                "total_columns": len(df.columns),
-                "null_percentage": (
-                    round((null_cells / total_cells) * 100, 2) if total_cells > 0 else 0
-                ),
-                "duplicate_rows": df.duplicated().sum(),
-                "empty_columns": df.isnull().all().sum(),
-                "mixed_type_columns": self._detect_mixed_types(df),
-                "potential_issues": self._detect_potential_issues(df),
-            }
+            return DataProfiler.analyze_data_quality(df)
 
         except Exception as e:
             logger.error(f"Failed to analyze data quality: {e}")
             return {"error": str(e)}
 
-    def _detect_mixed_types(self, df: pd.DataFrame) -> List[str]:
-        """Detect columns with mixed data types"""
-        mixed_columns = []
-
-        for col in df.columns:
-            if df[col].dtype == "object":
-                # Check for mixed numeric/text data
-                non_null_data = df[col].dropna()
-                if len(non_null_data) > 0:
-                    numeric_count = 0
-                    for value in non_null_data:
-                        try:
-                            float(str(value))
-                            numeric_count += 1
-                        except (ValueError, TypeError):
-                            pass
-
-                    # If partially numeric, it might be mixed type
-                    if 0 < numeric_count < len(non_null_data):
-                        mixed_columns.append(col)
-
-        return mixed_columns
-
-    def _detect_potential_issues(self, df: pd.DataFrame) -> List[str]:
-        """Detect potential data issues"""
-        issues = []
-
-        # Check for very long strings that might cause database issues
-        for col in df.select_dtypes(include=["object"]).columns:
-            max_length = df[col].astype(str).str.len().max()
-            if max_length > 1000:
-                issues.append(
-                    f"Column '{col}' has very long text (max: {max_length} chars)"
-                )
-
-        # Check for columns with mostly null values
-        for col in df.columns:
-            null_percentage = (df[col].isnull().sum() / len(df)) * 100
-            if null_percentage > 90:
-                issues.append(
-                    f"Column '{col}' is mostly empty ({null_percentage:.1f}% null)"
-                )
-
-        # Check for potential date columns that aren't recognized
-        for col in df.select_dtypes(include=["object"]).columns:
-            sample_values = df[col].dropna().head(10)
-            date_like_count = 0
-            for value in sample_values:
-                if self._looks_like_date(str(value)):
-                    date_like_count += 1
-
-            if date_like_count > len(sample_values) * 0.7:
-                issues.append(
-                    f"Column '{col}' might contain dates but wasn't recognized"
-                )
-
-        return issues
-
-    def _looks_like_date(self, value: str) -> bool:
-        """Check if string looks like a date"""
-        import re
-
-        date_patterns = [
-            r"\d{4}-\d{2}-\d{2}",  # YYYY-MM-DD
-            r"\d{2}/\d{2}/\d{4}",  # MM/DD/YYYY or DD/MM/YYYY
-            r"\d{2}-\d{2}-\d{4}",  # MM-DD-YYYY or DD-MM-YYYY
-            r"\d{1,2}/\d{1,2}/\d{4}",  # M/D/YYYY
-        ]
-
-        for pattern in date_patterns:
-            if re.match(pattern, value.strip()):
-                return True
-
-        return False
-
     def create_template(
         self,
         template_type: str,
@@ -604,50 +964,47 @@ class ExcelService:
 
         return results
 
+    def infer_column_types(
+        self, file_path: str, options: Dict[str, Any] = None
+    ) -> Dict[str, ColumnStats]:
+        """Column stats merged over every chunk of a sheet
+
+        The sheet is streamed like read_file_chunks, but the raw chunks are
+        profiled before cleaning fills their nulls, so the inferred types
+        are exact for the whole sheet rather than for a leading sample.
+        Stats are keyed by the column names the import will use.
+        """
+        options = options or {}
+        engine = TypeInferenceEngine()
+        for df in self.iter_raw_frames(file_path, options):
+            engine.update(df.dropna(how="all"))
+
+        return {
+            self.import_column_name(col, options): stats
+            for col, stats in engine.columns.items()
+        }
+
+    def import_column_name(self, column: Any, options: Dict[str, Any] = None) -> str:
+        """Name a raw column gets in imported records"""
+        if column in self._mapped_names(options or {}):
+            return column
+        return self._clean_column_name(column)
+
     def get_column_suggestions(self, file_path: str) -> Dict[str, str]:
         """Get column type suggestions for database import"""
         try:
-            df = pd.read_excel(file_path, nrows=100)  # Sample for analysis
+            # Sample for analysis
+            df = self.columnar_cache.head(self._cache_key(file_path), 100)
+            if df is None:
+                df = pd.read_excel(file_path, nrows=100)
             suggestions = {}
 
-            for col in df.columns:
+            for col, data_type in infer_column_types(df).items():
                 clean_col = self._clean_column_name(col)
-
-                # Analyze data type
-                non_null_data = df[col].dropna()
-                if len(non_null_data) == 0:
-                    suggestions[clean_col] = "TEXT"
-                    continue
-
-                # Check for numeric data
-                try:
-                    pd.to_numeric(non_null_data)
-                    # Check if integers
-                    if non_null_data.astype(str).str.match(r"^\d+$").all():
-                        suggestions[clean_col] = "INTEGER"
-                    else:
-                        suggestions[clean_col] = "REAL"
-                    continue
-                except Exception:
-                    pass
-
-                # Check for dates
-                try:
-                    pd.to_datetime(non_null_data)
+                if data_type in ("date", "datetime"):
                     suggestions[clean_col] = "DATE"
-                    continue
-                except Exception:
-                    pass
-
-                # Check for boolean
-                unique_vals = set(str(v).lower() for v in non_null_data.unique())
-                bool_vals = {"true", "false", "yes", "no", "1", "0", "y", "n"}
-                if unique_vals.issubset(bool_vals):
-                    suggestions[clean_col] = "BOOLEAN"
-                    continue
-
-                # Default to text
-                suggestions[clean_col] = "TEXT"
+                else:
+                    suggestions[clean_col] = sql_type_for(data_type, "sqlite")
 
             return suggestions
 
@@ -0,0 +1,183 @@
+"""
+services/import_pipeline.py
+Pipelined Import Engine - overlapped read and write stages
+"""
+
+import threading
+import queue
+import time
+import logging
+from typing import Dict, Any, List, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_END_OF_STREAM = object()
+
+
+class ImportCancelled(Exception):
+    """Raised inside stages when the pipeline is stopped"""
+
+
+class ImportPipeline:
+    """Bounded read -> write pipeline with backpressure
+
+    The read stage runs on its own thread and hands chunks over through a
+    bounded queue, so parsing the next chunk overlaps with writing the
+    current one while memory stays capped at roughly ``queue_size``
+    chunks. Column selection and renames happen in the reader itself, so
+    chunks go to the writer as read. The write stage runs on the calling
+    thread, reports every chunk handed to the writer and checks
+    ``should_stop`` between chunks. Whether a written chunk is committed
+    yet is up to the writer.
+    """
+
+    def __init__(
+        self,
+        reader: Iterable[List[Dict]],
+        writer: Callable[[List[Dict]], bool],
+        queue_size: int = 4,
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_batch: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.should_stop = should_stop or (lambda: False)
+        self.on_batch = on_batch
+
+        self._read_queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._stop_event = threading.Event()
+        self._errors: List[BaseException] = []
+        self._start_time = 0.0
+
+        self.stats = {
+            "rows_written": 0,
+            "batches_written": 0,
+            "read_seconds": 0.0,
+            "write_seconds": 0.0,
+            "elapsed_seconds": 0.0,
+            "cancelled": False,
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Run all stages to completion and return pipeline statistics"""
+        self._start_time = time.perf_counter()
+
+        reader = threading.Thread(target=self._read_stage, daemon=True)
+        reader.start()
+
+        try:
+            self._write_stage()
+        finally:
+            self._stop_event.set()
+            reader.join(timeout=5)
+            self.stats["elapsed_seconds"] = time.perf_counter() - self._start_time
+
+        if self._errors:
+            raise self._errors[0]
+
+        return dict(self.stats)
+
+    def stop(self):
+        """Request cancellation of all stages"""
+        self._stop_event.set()
+
+    # ================ STAGES ================
+    def _read_stage(self):
+        """Pull chunks from the reader into the bounded read queue"""
+        try:
+            iterator = iter(self.reader)
+            while not self._stopping():
+                started = time.perf_counter()
+                chunk = next(iterator, _END_OF_STREAM)
+                self.stats["read_seconds"] += time.perf_counter() - started
+
+                self._put(self._read_queue, chunk)
+                if chunk is _END_OF_STREAM:
+                    break
+        except ImportCancelled:
+            pass
+        except Exception as e:
+            self._fail(e)
+        finally:
+            close = getattr(self.reader, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    def _write_stage(self):
+        """Write chunks on the calling thread, one at a time"""
+        try:
+            while True:
+                if self._stopping():
+                    raise ImportCancelled()
+
+                chunk = self._get(self._read_queue)
+                if chunk is _END_OF_STREAM:
+                    return
+                if not chunk:
+                    continue
+
+                started = time.perf_counter()
+                if not self.writer(chunk):
+                    raise Exception("Bulk insert operation failed")
+                self.stats["write_seconds"] += time.perf_counter() - started
+
+                self.stats["rows_written"] += len(chunk)
+                self.stats["batches_written"] += 1
+
+                if self.on_batch:
+                    self.on_batch(self._progress_snapshot(len(chunk)))
+        except ImportCancelled:
+            if not self._errors:
+                self.stats["cancelled"] = True
+                logger.info("Import pipeline cancelled between chunks")
+        except Exception as e:
+            self._fail(e)
+
+    # ================ HELPERS ================
+    def _stopping(self) -> bool:
+        """Check for cancellation from either stop() or should_stop"""
+        if not self._stop_event.is_set() and self.should_stop():
+            self._stop_event.set()
+        return self._stop_event.is_set()
+
+    def _progress_snapshot(self, batch_rows: int) -> Dict[str, Any]:
+        """Measured progress after a written chunk"""
+        elapsed = time.perf_counter() - self._start_time
+        return {
+            "batch_rows": batch_rows,
+            "rows_written": self.stats["rows_written"],
+            "batches_written": self.stats["batches_written"],
+            "elapsed_seconds": elapsed,
+            "rows_per_second": (
+                self.stats["rows_written"] / elapsed if elapsed > 0 else 0.0
+            ),
+        }
+
+    def _put(self, target: queue.Queue, item: Any):
+        """Blocking put that gives up when the pipeline stops"""
+        while True:
+            if self._stopping():
+                raise ImportCancelled()
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Blocking get that gives up when the pipeline stops"""
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if self._stopping():
+                    raise ImportCancelled()
+
+    def _fail(self, error: BaseException):
+        """Record a stage failure and stop the other stages"""
+        logger.error(f"Import pipeline stage failed: {error}")
+        self._errors.append(error)
+        self._stop_event.set()
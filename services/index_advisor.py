@@ -0,0 +1,558 @@
+"""
+services/index_advisor.py
+Index Advisor - workload-driven index recommendations from the query log
+"""
+
+import re
+import time
+import logging
+import statistics
+from typing import Dict, Any, List, Optional, Tuple
+
+from .query_log import QueryLog
+
+logger = logging.getLogger(__name__)
+
+IDENT = r"(?:\[[^\]]+\]|\"[^\"]+\"|\w+)"
+COLUMN_REF = rf"(?:({IDENT})\s*\.\s*)?({IDENT})"
+
+TABLE_PATTERN = re.compile(
+    rf"\b(?:FROM|JOIN|UPDATE)\s+((?:{IDENT}\s*\.\s*)*{IDENT})"
+    rf"(?:\s+(?:AS\s+)?({IDENT}))?",
+    re.IGNORECASE,
+)
+SELECT_LIST_PATTERN = re.compile(
+    r"^\s*SELECT\s+(?:DISTINCT\s+)?(?:TOP\s*\(?\s*\?\s*\)?\s+)?(.*?)\bFROM\b",
+    re.IGNORECASE | re.DOTALL,
+)
+WHERE_PATTERN = re.compile(
+    r"\bWHERE\b(.*?)(?=\b(?:GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|OFFSET|UNION)\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+ON_PATTERN = re.compile(
+    r"\bON\b(.*?)(?=\b(?:INNER|LEFT|RIGHT|FULL|CROSS|JOIN|WHERE|GROUP\s+BY"
+    r"|ORDER\s+BY|LIMIT)\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+ORDER_BY_PATTERN = re.compile(
+    r"\bORDER\s+BY\b(.*?)(?=\b(?:LIMIT|OFFSET|FETCH|OPTION)\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+PREDICATE_PATTERN = re.compile(
+    rf"{COLUMN_REF}\s*(<=|>=|<>|!=|=|<|>|\bNOT\s+LIKE\b|\bLIKE\b|\bNOT\s+IN\b"
+    rf"|\bIN\b|\bBETWEEN\b|\bIS\b)",
+    re.IGNORECASE,
+)
+JOIN_PATTERN = re.compile(rf"{COLUMN_REF}\s*=\s*{COLUMN_REF}")
+COLUMN_ITEM_PATTERN = re.compile(
+    rf"{COLUMN_REF}(?:\s+(?:AS\s+)?{IDENT})?(?:\s+(?:ASC|DESC))?", re.IGNORECASE
+)
+
+EQUALITY_OPERATORS = {"=", "IN", "IS"}
+RANGE_OPERATORS = {"<", "<=", ">", ">=", "BETWEEN", "LIKE"}
+
+KEYWORDS = {
+    "where",
+    "join",
+    "inner",
+    "left",
+    "right",
+    "full",
+    "cross",
+    "outer",
+    "on",
+    "set",
+    "group",
+    "order",
+    "having",
+    "limit",
+    "offset",
+    "union",
+    "with",
+    "and",
+    "or",
+    "not",
+    "null",
+}
+
+MAX_INCLUDE_COLUMNS = 5
+
+
+def _name(ident: Optional[str]) -> Optional[str]:
+    """Identifier without brackets or quotes"""
+    return ident.strip('[]"') if ident else ident
+
+
+class IndexAdvisor:
+    """Recommend indexes for the queries that actually run
+
+    Shapes in the QueryLog are parsed for the columns they filter on
+    (equality first, then one range column), join on and sort by. Shapes
+    needing the same key on a table are merged, keys that are a prefix of
+    another key fold into it, and keys an existing index already leads
+    with are dropped. Each recommendation is weighted by the time its
+    queries spent in the log.
+
+    create_index() measures the benefit by replaying the logged sample
+    queries before and after building the index; apply() auto-creates
+    the top recommendations and drops any that do not measurably help.
+    """
+
+    def __init__(
+        self,
+        connection_service,
+        query_log: Optional[QueryLog] = None,
+        min_executions: int = 5,
+    ):
+        self.connection_service = connection_service
+        self.query_log = query_log or connection_service.query_log
+        self.min_executions = min_executions
+        self._columns: Dict[str, List[str]] = {}
+
+    @property
+    def db_type(self) -> str:
+        config = self.connection_service.current_config or {}
+        return config.get("type", "sqlite")
+
+    # ================ RECOMMENDATIONS ================
+    def recommend(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Index recommendations ranked by the query time they address"""
+        if self.query_log is None:
+            return []
+
+        workload_ms = self.query_log.total_ms() or 1.0
+        candidates: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+        for entry in self.query_log.shapes(self.min_executions):
+            for table, key, include in self.candidate_keys(entry["shape"]):
+                candidate = candidates.setdefault(
+                    (table, key),
+                    {
+                        "table": table,
+                        "columns": list(key),
+                        "include": [],
+                        "workload": [],
+                    },
+                )
+                candidate["include"] = _merge_include(candidate["include"], include)
+                candidate["workload"].append(
+                    {
+                        "shape": entry["shape"],
+                        "executions": entry["count"],
+                        "total_ms": entry["total_ms"],
+                    }
+                )
+
+        merged = self._fold_prefixes(list(candidates.values()))
+        existing = {}
+        recommendations = []
+
+        for candidate in merged:
+            table = candidate["table"]
+            if table not in existing:
+                existing[table] = self.existing_index_keys(table)
+            if self._is_covered(candidate["columns"], existing[table]):
+                continue
+            recommendations.append(self._describe(candidate, workload_ms))
+
+        recommendations.sort(key=lambda rec: rec["time_spent_ms"], reverse=True)
+        return recommendations[:limit]
+
+    def candidate_keys(
+        self, shape: str
+    ) -> List[Tuple[str, Tuple[str, ...], List[str]]]:
+        """(table, key columns, covering columns) wanted by one query shape"""
+        aliases = self._table_aliases(shape)
+        if not aliases:
+            return []
+        tables = list(dict.fromkeys(aliases.values()))
+
+        equality: Dict[str, List[str]] = {table: [] for table in tables}
+        ranges: Dict[str, List[str]] = {table: [] for table in tables}
+        referenced: Dict[str, List[str]] = {table: [] for table in tables}
+
+        # Step 1: WHERE predicates
+        where = WHERE_PATTERN.search(shape)
+        if where:
+            for qualifier, column, operator in PREDICATE_PATTERN.findall(
+                where.group(1)
+            ):
+                table = self._resolve(qualifier, column, aliases, tables)
+                if table is None:
+                    continue
+                column = _name(column)
+                operator = " ".join(operator.upper().split())
+                referenced[table].append(column)
+                if operator in EQUALITY_OPERATORS:
+                    equality[table].append(column)
+                elif operator in RANGE_OPERATORS:
+                    ranges[table].append(column)
+
+        # Step 2: JOIN ... ON equalities are lookups on both sides
+        for on_clause in ON_PATTERN.findall(shape):
+            for left_q, left_c, right_q, right_c in JOIN_PATTERN.findall(on_clause):
+                for qualifier, column in ((left_q, left_c), (right_q, right_c)):
+                    table = self._resolve(qualifier, column, aliases, tables)
+                    if table is not None:
+                        equality[table].append(_name(column))
+                        referenced[table].append(_name(column))
+
+        # Step 3: ORDER BY helps only when every sort column is in one table
+        order_table, order_columns = None, []
+        order_by = ORDER_BY_PATTERN.search(shape)
+        if order_by:
+            resolved = [
+                self._resolve_item(item, aliases, tables)
+                for item in order_by.group(1).split(",")
+            ]
+            if resolved and all(resolved) and len({t for t, _ in resolved}) == 1:
+                order_table = resolved[0][0]
+                order_columns = [column for _, column in resolved]
+
+        # Step 4: Selected columns, for covering indexes
+        selected = self._selected_columns(shape, aliases, tables)
+
+        candidates = []
+        for table in tables:
+            key = sorted(set(equality[table]))
+            range_columns = [c for c in ranges[table] if c not in key]
+            if range_columns:
+                key.append(range_columns[0])
+            if table == order_table and (not range_columns or order_columns[0] in key):
+                key.extend(c for c in order_columns if c not in key)
+            if not key:
+                continue
+
+            include = []
+            if selected is not None:
+                wanted = selected.get(table, []) + referenced[table]
+                if table == order_table:
+                    wanted += order_columns
+                include = list(dict.fromkeys(c for c in wanted if c not in key))
+                if len(include) > MAX_INCLUDE_COLUMNS:
+                    include = []
+
+            candidates.append((table, tuple(key), include))
+        return candidates
+
+    def _describe(
+        self, candidate: Dict[str, Any], workload_ms: float
+    ) -> Dict[str, Any]:
+        """Recommendation in the IndexSuggestionEngine suggestion format"""
+        table, key, include = (
+            candidate["table"],
+            candidate["columns"],
+            candidate["include"],
+        )
+        executions = sum(item["executions"] for item in candidate["workload"])
+        time_spent = sum(item["total_ms"] for item in candidate["workload"])
+        share = time_spent / workload_ms
+
+        name = f"IDX_{table}_{'_'.join(key)}{'_cov' if include else ''}"[:128]
+        if include:
+            index_type = "covering"
+        else:
+            index_type = "composite" if len(key) > 1 else "regular"
+
+        return {
+            "type": index_type,
+            "table": table,
+            "columns": key,
+            "include": include,
+            "name": name,
+            "sql": self._index_sql(name, table, key, include),
+            "rationale": (
+                f"{executions} logged queries filter, join or sort on "
+                f"{', '.join(key)} ({time_spent:.0f} ms, {share:.0%} of logged time)"
+            ),
+            "priority": (
+                "high" if share >= 0.25 else "medium" if share >= 0.05 else "low"
+            ),
+            "executions": executions,
+            "time_spent_ms": time_spent,
+            "workload": candidate["workload"],
+        }
+
+    def _fold_prefixes(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Serve keys that prefix a longer key on the same table by that key"""
+        candidates.sort(key=lambda c: len(c["columns"]), reverse=True)
+        kept: List[Dict[str, Any]] = []
+        for candidate in candidates:
+            target = next(
+                (
+                    other
+                    for other in kept
+                    if other["table"] == candidate["table"]
+                    and other["columns"][: len(candidate["columns"])]
+                    == candidate["columns"]
+                ),
+                None,
+            )
+            if target is None:
+                kept.append(candidate)
+            else:
+                target["workload"].extend(candidate["workload"])
+                target["include"] = _merge_include(
+                    target["include"], candidate["include"]
+                )
+        return kept
+
+    # ================ CREATION AND MEASUREMENT ================
+    def create_index(
+        self, recommendation: Dict[str, Any], measure: bool = True, keep: bool = True
+    ) -> Dict[str, Any]:
+        """Build a recommended index, timing its queries before and after
+
+        With ``keep=False`` the index is dropped again after measuring,
+        which evaluates a recommendation without changing the schema.
+        """
+        result = {**recommendation, "created": False}
+
+        before = self.measure(recommendation) if measure else {}
+        success, message = self.connection_service.execute_query(recommendation["sql"])
+        if not success:
+            result["error"] = message
+            logger.error(f"Failed to create index {recommendation['name']}: {message}")
+            return result
+
+        result["created"] = True
+        after = self.measure(recommendation) if measure else {}
+        result.update(self._benefit(recommendation, before, after))
+
+        if not keep:
+            self.drop_index(recommendation)
+            result["created"] = False
+
+        logger.info(
+            f"Index {recommendation['name']}: "
+            + (
+                f"{result['before_ms']:.2f} ms -> {result['after_ms']:.2f} ms per query"
+                if result.get("before_ms") is not None
+                else "no replayable queries to measure"
+            )
+        )
+        return result
+
+    def apply(self, limit: int = 3, min_speedup: float = 1.1) -> List[Dict[str, Any]]:
+        """Auto-create the top recommendations that measurably help"""
+        results = []
+        for recommendation in self.recommend(limit):
+            result = self.create_index(recommendation)
+            speedup = result.get("speedup")
+            if result["created"] and speedup is not None and speedup < min_speedup:
+                self.drop_index(recommendation)
+                result["created"] = False
+                result["reason"] = f"speedup {speedup:.2f}x below {min_speedup:.2f}x"
+            results.append(result)
+        return results
+
+    def drop_index(self, recommendation: Dict[str, Any]) -> bool:
+        if self.db_type == "sqlite":
+            sql = f"DROP INDEX [{recommendation['name']}]"
+        else:
+            sql = (
+                f"DROP INDEX [{recommendation['name']}] ON [{recommendation['table']}]"
+            )
+        success, _ = self.connection_service.execute_query(sql)
+        return success
+
+    def measure(
+        self, recommendation: Dict[str, Any], repeats: int = 3
+    ) -> Dict[str, float]:
+        """Median milliseconds of each replayable logged query shape"""
+        timings = {}
+        for item in recommendation["workload"]:
+            sample = self.query_log.sample(item["shape"])
+            if sample is None or not sample[0].lstrip().upper().startswith("SELECT"):
+                continue
+            try:
+                runs = [self._time_query(*sample) for _ in range(max(1, repeats))]
+                timings[item["shape"]] = statistics.median(runs)
+            except Exception as e:
+                logger.debug(f"Could not replay query: {e}")
+        return timings
+
+    def _benefit(
+        self,
+        recommendation: Dict[str, Any],
+        before: Dict[str, float],
+        after: Dict[str, float],
+    ) -> Dict[str, Any]:
+        """Per-query and workload-wide savings from before/after timings"""
+        measured = [
+            item for item in recommendation["workload"] if item["shape"] in before
+        ]
+        measured = [item for item in measured if item["shape"] in after]
+        if not measured:
+            return {
+                "before_ms": None,
+                "after_ms": None,
+                "speedup": None,
+                "estimated_benefit_ms": None,
+            }
+
+        executions = sum(item["executions"] for item in measured)
+        before_ms = (
+            sum(before[i["shape"]] * i["executions"] for i in measured) / executions
+        )
+        after_ms = (
+            sum(after[i["shape"]] * i["executions"] for i in measured) / executions
+        )
+        return {
+            "before_ms": before_ms,
+            "after_ms": after_ms,
+            "speedup": before_ms / after_ms if after_ms > 0 else None,
+            # Savings had the index existed for the logged workload
+            "estimated_benefit_ms": (before_ms - after_ms)
+            * recommendation["executions"],
+        }
+
+    def _time_query(self, sql: str, params: tuple) -> float:
+        """Run a query directly on a pooled connection, bypassing the log"""
+        with self.connection_service.current_pool.get_managed_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                start = time.perf_counter()
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                return (time.perf_counter() - start) * 1000
+            finally:
+                cursor.close()
+
+    def _index_sql(
+        self, name: str, table: str, key: List[str], include: List[str]
+    ) -> str:
+        if self.db_type == "sqlite":
+            # No INCLUDE clause: covering columns trail the key
+            columns = ", ".join(f"[{c}]" for c in key + include)
+            return f"CREATE INDEX [{name}] ON [{table}] ({columns})"
+
+        sql = (
+            f"CREATE NONCLUSTERED INDEX [{name}] ON [{table}] "
+            f"({', '.join(f'[{c}]' for c in key)})"
+        )
+        if include:
+            sql += f" INCLUDE ({', '.join(f'[{c}]' for c in include)})"
+        return sql
+
+    # ================ SCHEMA LOOKUPS ================
+    def existing_index_keys(self, table: str) -> List[List[str]]:
+        """Key columns of every index on a table, lower-cased"""
+        if self.db_type == "sqlite":
+            query = (
+                "SELECT il.name AS index_name, ii.name AS column_name "
+                "FROM pragma_index_list(?) il JOIN pragma_index_info(il.name) ii "
+                "ORDER BY il.name, ii.seqno"
+            )
+        else:
+            query = (
+                "SELECT i.name AS index_name, c.name AS column_name "
+                "FROM sys.indexes i "
+                "JOIN sys.index_columns ic ON ic.object_id = i.object_id "
+                "AND ic.index_id = i.index_id "
+                "JOIN sys.columns c ON c.object_id = ic.object_id "
+                "AND c.column_id = ic.column_id "
+                "WHERE i.object_id = OBJECT_ID(?) AND ic.key_ordinal > 0 "
+                "ORDER BY i.name, ic.key_ordinal"
+            )
+
+        success, rows = self.connection_service.execute_query(query, (table,))
+        keys: Dict[str, List[str]] = {}
+        for row in rows if success else []:
+            keys.setdefault(row["index_name"], []).append(row["column_name"].lower())
+
+        # SQLite INTEGER PRIMARY KEY columns are the rowid, with no index entry
+        if self.db_type == "sqlite":
+            success, rows = self.connection_service.execute_query(
+                "SELECT name FROM pragma_table_info(?) "
+                "WHERE pk = 1 AND upper(type) = 'INTEGER'",
+                (table,),
+            )
+            if success and len(rows) == 1:
+                keys["rowid"] = [rows[0]["name"].lower()]
+
+        return list(keys.values())
+
+    def _is_covered(self, key: List[str], existing: List[List[str]]) -> bool:
+        wanted = [column.lower() for column in key]
+        return any(index[: len(wanted)] == wanted for index in existing)
+
+    def _table_columns(self, table: str) -> List[str]:
+        if table not in self._columns:
+            if self.db_type == "sqlite":
+                query = "SELECT name FROM pragma_table_info(?)"
+            else:
+                query = (
+                    "SELECT COLUMN_NAME AS name FROM INFORMATION_SCHEMA.COLUMNS "
+                    "WHERE TABLE_NAME = ?"
+                )
+            success, rows = self.connection_service.execute_query(query, (table,))
+            self._columns[table] = (
+                [row["name"].lower() for row in rows] if success else []
+            )
+        return self._columns[table]
+
+    # ================ PARSING ================
+    def _table_aliases(self, shape: str) -> Dict[str, str]:
+        """Alias (or table name) -> table for every table a shape reads"""
+        aliases = {}
+        for reference, alias in TABLE_PATTERN.findall(shape):
+            if reference.startswith("("):
+                continue
+            table = _name(re.split(r"\s*\.\s*", reference)[-1])
+            aliases[table.lower()] = table
+            if alias and alias.lower() not in KEYWORDS:
+                aliases[_name(alias).lower()] = table
+        return aliases
+
+    def _resolve(
+        self,
+        qualifier: str,
+        column: str,
+        aliases: Dict[str, str],
+        tables: List[str],
+    ) -> Optional[str]:
+        """Table a column reference belongs to, if it can be told"""
+        if column.lower() in KEYWORDS:
+            return None
+        if qualifier:
+            return aliases.get(_name(qualifier).lower())
+        if len(tables) == 1:
+            return tables[0]
+
+        owners = [t for t in tables if _name(column).lower() in self._table_columns(t)]
+        return owners[0] if len(owners) == 1 else None
+
+    def _resolve_item(
+        self, item: str, aliases: Dict[str, str], tables: List[str]
+    ) -> Optional[Tuple[str, str]]:
+        match = COLUMN_ITEM_PATTERN.fullmatch(item.strip())
+        if not match:
+            return None
+        qualifier, column = match.group(1), match.group(2)
+        table = self._resolve(qualifier, column, aliases, tables)
+        return (table, _name(column)) if table else None
+
+    def _selected_columns(
+        self, shape: str, aliases: Dict[str, str], tables: List[str]
+    ) -> Optional[Dict[str, List[str]]]:
+        """Plain columns in the SELECT list per table, None if any is *"""
+        match = SELECT_LIST_PATTERN.match(shape)
+        if not match:
+            return {}
+
+        selected: Dict[str, List[str]] = {}
+        for item in match.group(1).split(","):
+            item = item.strip()
+            if item == "*" or item.endswith(".*"):
+                return None
+            resolved = self._resolve_item(item, aliases, tables)
+            if resolved:
+                selected.setdefault(resolved[0], []).append(resolved[1])
+        return selected
+
+
+def _merge_include(current: List[str], extra: List[str]) -> List[str]:
+    """Union of covering columns, given up once it grows too wide"""
+    merged = list(dict.fromkeys(current + extra))
+    return merged if len(merged) <= MAX_INCLUDE_COLUMNS else []
@@ -0,0 +1,218 @@
+"""
+services/parallel_bulk_writer.py
+Parallel Bulk Writer - batches inserted concurrently over pooled connections
+"""
+
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelBulkWriter:
+    """Insert a row stream through several pooled connections at once
+
+    The calling thread cuts the stream into batches and feeds them through
+    a bounded queue to ``workers`` threads, each holding one connection
+    from the pool for the whole load. write() takes the whole stream at
+    once; an import reading chunk by chunk calls start(), then feed() per
+    chunk and finish(), keeping the same workers and connections. Every
+    batch is committed on its own, and pyodbc releases the GIL while it
+    waits on the server, so batches overlap on the wire.
+
+    Batch results are reported in batch order, whichever worker finishes
+    first. When a batch fails it is rolled back, the remaining workers
+    stop taking new batches and write() or finish() raises; batches
+    committed before the failure stay in the table.
+    """
+
+    def __init__(
+        self,
+        pool,
+        insert_sql: str,
+        columns: List[str],
+        workers: int = 4,
+        batch_size: int = 1000,
+        insert_engine=None,
+        on_batch: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.pool = pool
+        self.insert_sql = insert_sql
+        self.columns = columns
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.insert_engine = insert_engine
+        self.on_batch = on_batch
+
+        self._queue: "queue.Queue[Optional[Tuple[int, List[Dict]]]]" = queue.Queue(
+            maxsize=self.workers * 2
+        )
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._next_report = 0
+        self._next_batch = 0
+        self._error: Optional[str] = None
+
+        self._started = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+
+    def write(self, rows: Iterable[Dict]) -> List[Dict[str, Any]]:
+        """Insert every row and return per-batch results in batch order"""
+        self.start()
+        self.feed(rows)
+        return self.finish()
+
+    def start(self):
+        """Start the workers; rows are then passed in with feed()"""
+        self._started = time.perf_counter()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="bulk-writer"
+        )
+        self._futures = [self._executor.submit(self._work) for _ in range(self.workers)]
+
+    def feed(self, rows: Iterable[Dict], batch_size: Optional[int] = None) -> bool:
+        """Queue rows for the workers, cut into batches of ``batch_size``
+
+        Blocks while the queue is full. Batch numbers continue across
+        calls, so one writer can take a whole import chunk by chunk.
+        Returns False once a batch has failed.
+        """
+        try:
+            for batch in self._batches(rows, max(1, batch_size or self.batch_size)):
+                if self._stop.is_set():
+                    break
+                self._queue.put((self._next_batch, batch))
+                self._next_batch += 1
+        except Exception as e:
+            self._fail(f"Reading rows failed: {e}")
+        return not self._stop.is_set()
+
+    def cancel(self):
+        """Stop taking new batches; batches being written still commit"""
+        self._stop.set()
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Wait for the queued batches and return all results in batch order
+
+        Raises if a batch failed.
+        """
+        # One sentinel per worker; workers keep draining until theirs
+        for _ in self._futures:
+            self._queue.put(None)
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._executor.shutdown()
+
+        results = [self._results[index] for index in sorted(self._results)]
+        if self._error:
+            raise Exception(self._error)
+
+        total = sum(result["rows"] for result in results)
+        logger.info(
+            f"Parallel insert: {total} rows in {len(results)} batches over "
+            f"{self.workers} connections in {time.perf_counter() - self._started:.2f}s"
+        )
+        return results
+
+    @property
+    def error(self) -> Optional[str]:
+        """Message of the first failure, if any"""
+        return self._error
+
+    def _batches(self, rows: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+        if isinstance(rows, list):
+            for i in range(0, len(rows), batch_size):
+                yield rows[i : i + batch_size]
+            return
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # ================ WORKERS ================
+    def _work(self):
+        """Worker loop: one pooled connection, batches until the sentinel"""
+        try:
+            with self.pool.get_managed_connection() as conn:
+                while True:
+                    item = self._queue.get()
+                    if item is None:
+                        return
+                    if not self._stop.is_set():
+                        self._write_batch(conn, *item)
+        except Exception as e:
+            self._fail(f"Writer connection failed: {e}")
+            self._drain()
+
+    def _write_batch(self, conn, index: int, batch: List[Dict]):
+        start = time.perf_counter()
+        try:
+            if self.insert_engine is not None:
+                inserted = self.insert_engine.insert(
+                    conn, self.insert_sql, self.columns, batch
+                )
+            else:
+                cursor = conn.cursor()
+                try:
+                    cursor.executemany(
+                        self.insert_sql,
+                        [[row.get(col) for col in self.columns] for row in batch],
+                    )
+                finally:
+                    cursor.close()
+                inserted = len(batch)
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._fail(f"Batch {index} failed: {e}")
+            return
+
+        self._report(
+            {
+                "batch": index,
+                "rows": inserted,
+                "seconds": time.perf_counter() - start,
+                "worker": threading.current_thread().name,
+            }
+        )
+
+    def _report(self, result: Dict[str, Any]):
+        """Record a result and pass on every result now in batch order"""
+        with self._lock:
+            self._results[result["batch"]] = result
+            while self._next_report in self._results:
+                ready = self._results[self._next_report]
+                self._next_report += 1
+                if self.on_batch:
+                    try:
+                        self.on_batch(ready)
+                    except Exception as e:
+                        logger.error(f"Batch callback failed: {e}")
+
+    def _fail(self, message: str):
+        with self._lock:
+            if self._error is None:
+                self._error = message
+                logger.error(f"Parallel insert stopping: {message}")
+        self._stop.set()
+
+    def _drain(self):
+        """Keep consuming until this worker's sentinel so the feeder never blocks"""
+        while self._queue.get() is not None:
+            pass
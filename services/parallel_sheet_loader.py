@@ -0,0 +1,97 @@
+"""
+services/parallel_sheet_loader.py
+Parallel Sheet Loader - parse workbook sheets in worker processes
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _load_sheet(
+    file_path: str, sheet_name: str, options: Dict[str, Any]
+) -> pd.DataFrame:
+    """Worker entry point: parse one sheet into a DataFrame"""
+    from services.excel_service import ExcelService
+
+    service = ExcelService()
+    return service.read_dataframe(file_path, {**options, "sheet_name": sheet_name})
+
+
+class ParallelSheetLoader:
+    """Parse the sheets of one workbook concurrently in a process pool
+
+    Each worker opens the workbook itself and parses a single sheet, so
+    CPU-bound XML parsing spreads across cores. Frames come back to the
+    parent pickled; with pyarrow installed the workers also fill the
+    columnar cache, making later reads of the same sheets memory-mapped.
+    The worker count is bounded by the CPU count, the sheet count and,
+    when ``memory_limit_mb`` is set, by how many workers of that size fit
+    in the memory currently available. Workers are not capped themselves:
+    an address space limit counts mapped files and allocator reservations,
+    so it fails parses that would fit in physical memory.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, memory_limit_mb: Optional[int] = None
+    ):
+        self.max_workers = max_workers
+        self.memory_limit_mb = memory_limit_mb
+
+    def load(
+        self,
+        file_path: str,
+        sheet_names: List[str],
+        options: Dict[str, Any] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Parse the given sheets and return frames in workbook order"""
+        options = options or {}
+        file_path = str(file_path)
+        workers = self._worker_count(len(sheet_names))
+
+        if workers <= 1:
+            return {name: _load_sheet(file_path, name, options) for name in sheet_names}
+
+        logger.info(f"Loading {len(sheet_names)} sheets with {workers} processes")
+
+        frames: Dict[str, pd.DataFrame] = {}
+        failures = []
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_load_sheet, file_path, name, options): name
+                for name in sheet_names
+            }
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    frames[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to load sheet {name}: {e}")
+                    failures.append(f"{name}: {e}")
+
+        if failures:
+            raise Exception(f"Excel read error: {'; '.join(failures)}")
+
+        return {name: frames[name] for name in sheet_names}
+
+    def _worker_count(self, sheet_count: int) -> int:
+        """Workers allowed by CPUs, sheets and available memory"""
+        workers = min(self.max_workers or os.cpu_count() or 1, sheet_count)
+
+        if self.memory_limit_mb:
+            try:
+                import psutil
+
+                available_mb = psutil.virtual_memory().available / (1024 * 1024)
+                workers = min(workers, int(available_mb // self.memory_limit_mb))
+            except ImportError:
+                pass
+
+        return max(1, workers)
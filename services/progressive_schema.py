@@ -0,0 +1,291 @@
+"""
+services/progressive_schema.py
+Progressive Schema Inference - early schema proposals refined in the background
+"""
+
+import threading
+import logging
+from typing import Dict, Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.type_inference import TypeInferenceEngine, TypeWideningTracker
+
+logger = logging.getLogger(__name__)
+
+
+class ReservoirSample:
+    """Uniform random sample of rows from a stream of DataFrame chunks
+
+    Classic reservoir sampling (Algorithm R) with the replacement draws
+    for a whole chunk made in one vectorized call. After any number of
+    chunks every row seen so far is in the sample with equal probability.
+    """
+
+    def __init__(self, size: int = 10000, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self._rows: List[Dict[str, Any]] = []
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, df: pd.DataFrame):
+        """Offer every row of a chunk to the sample"""
+        count = len(df)
+
+        # Fill phase: the first rows go straight in
+        fill = min(max(self.size - len(self._rows), 0), count)
+        if fill:
+            self._rows.extend(df.iloc[:fill].to_dict("records"))
+
+        # Replacement phase: row i replaces a random slot with p = size / (i + 1)
+        if fill < count:
+            positions = np.arange(self.seen + fill, self.seen + count)
+            slots = self._rng.integers(0, positions + 1)
+            hits = np.nonzero(slots < self.size)[0]
+            if len(hits):
+                rows = df.iloc[fill + hits].to_dict("records")
+                for slot, row in zip(slots[hits], rows):
+                    self._rows[slot] = row
+
+        self.seen += count
+
+    def records(self) -> List[Dict[str, Any]]:
+        return list(self._rows)
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self._rows)
+
+
+class ProgressiveSchemaInference:
+    """Propose column types early and refine them while the sheet streams
+
+    start() returns a proposal right away: from a uniform sample of the
+    whole sheet when it is in the columnar cache, otherwise from the first
+    ``min_rows`` rows (default ``sample_size``), a prefix of the sheet. A
+    background thread then streams every remaining row into exact running
+    stats and the reservoir. Proposed types only widen; each widening is
+    recorded in ``events`` and passed to ``on_widen``, so callers can
+    alter a column instead of failing an insert.
+
+    Per-column confidence bounds the chance that unseen rows break the
+    proposed type: with no violation among n examined values, the rule
+    of three puts the violation rate below 3/n at 95%, applied to the
+    share of rows not yet streamed. It reaches 1.0 once the whole sheet
+    has been read.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        options: Dict[str, Any] = None,
+        sample_size: int = 10000,
+        excel_service=None,
+        on_widen: Optional[Callable[[Dict[str, Any]], None]] = None,
+        seed: Optional[int] = None,
+        min_rows: Optional[int] = None,
+    ):
+        if excel_service is None:
+            from .excel_service import ExcelService
+
+            excel_service = ExcelService()
+
+        self.file_path = str(file_path)
+        self.options = dict(options or {})
+        self.excel_service = excel_service
+        self.on_widen = on_widen
+        self.seed = seed
+        self.min_rows = sample_size if min_rows is None else min_rows
+
+        self.reservoir = ReservoirSample(sample_size, seed)
+        self.tracker = TypeWideningTracker()
+        self.sampling = "prefix"
+        self.total_rows: Optional[int] = None
+        self.error: Optional[str] = None
+
+        self._sample_stats: Dict[Any, Any] = {}
+        self._cached: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._finished = threading.Event()  # Refining ended, however it ended
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        return list(self.tracker.events)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> Dict[str, Dict[str, Any]]:
+        """Build the first proposal and start refining in the background"""
+        self.total_rows = self._estimate_total_rows()
+
+        # Step 1: Whole-sheet sample straight from the columnar cache
+        sample = self._cached_sample()
+        if sample is not None:
+            self.sampling = "reservoir"
+            self._cached = sample
+            engine = TypeInferenceEngine().update(sample)
+            self._sample_stats = engine.columns
+            self.tracker.types.update(
+                {
+                    column: stats.infer_type()
+                    for column, stats in engine.columns.items()
+                    if stats.non_null_count
+                }
+            )
+
+        # Step 2: Enough rows to seed the reservoir now, the rest on a
+        # background thread
+        frames = self.excel_service.iter_raw_frames(self.file_path, self.options)
+        while self.reservoir.seen < max(1, self.min_rows):
+            df = next(frames, None)
+            if df is None:
+                break
+            self._consume(df)
+
+        self._thread = threading.Thread(
+            target=self._refine, args=(frames,), name="progressive-schema", daemon=True
+        )
+        self._thread.start()
+        return self.proposal()
+
+    def proposal(self) -> Dict[str, Dict[str, Any]]:
+        """Current type, confidence, nullability and length of every column"""
+        with self._lock:
+            seen = self.tracker.rows_seen
+            coverage = 1.0 if self.done else self._coverage(seen)
+
+            proposal = {}
+            for column, stats in self.tracker.engine.columns.items():
+                examined = stats.non_null_count
+                sampled = self._sample_stats.get(column)
+                if sampled is not None:
+                    examined = max(examined, sampled.non_null_count)
+
+                unseen = 1.0 - coverage
+                confidence = 1.0 - unseen * min(
+                    1.0, 3.0 / examined if examined else 1.0
+                )
+
+                proposal[column] = {
+                    "type": self.tracker.types.get(column, "string"),
+                    "confidence": round(confidence, 4),
+                    "nullable": stats.null_count > 0
+                    or (sampled is not None and sampled.null_count > 0),
+                    "max_length": max(
+                        stats.max_length, sampled.max_length if sampled else 0
+                    ),
+                    "rows_seen": seen,
+                    "final": self.done,
+                }
+            return proposal
+
+    def sample_frame(self) -> pd.DataFrame:
+        """Uniform sample of the sheet when cached, else of the rows so far
+
+        Once every row has streamed the reservoir covers the whole sheet.
+        """
+        with self._lock:
+            if self._cached is not None and not self.done:
+                return self._cached.copy()
+            return self.reservoir.frame()
+
+    def sample_records(self) -> List[Dict[str, Any]]:
+        """Sample rows as dictionaries, e.g. for SchemaAnalyzer"""
+        with self._lock:
+            if self._cached is not None and not self.done:
+                return self._cached.to_dict("records")
+            return self.reservoir.records()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until refining ends; True when the whole sheet was read
+
+        Returns False once refining failed (see ``error``) or was stopped.
+        """
+        return self._finished.wait(timeout) and self.done
+
+    def stop(self):
+        """Stop refining; the proposal keeps what was seen so far"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    # ================ STREAMING ================
+    def _refine(self, frames):
+        try:
+            for df in frames:
+                if self._stop.is_set():
+                    frames.close()
+                    return
+                self._consume(df)
+            self._done.set()
+            logger.info(
+                f"Schema inference complete: {self.tracker.rows_seen} rows, "
+                f"{len(self.tracker.events)} type widenings"
+            )
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Progressive schema inference failed: {e}")
+        finally:
+            self._finished.set()
+
+    def _consume(self, df: pd.DataFrame):
+        df = df.dropna(how="all")
+        with self._lock:
+            events = self.tracker.observe(df)
+            self.reservoir.update(df)
+
+        for event in events:
+            logger.info(
+                f"Widening column {event['column']} from {event['from_type']} "
+                f"to {event['to_type']}"
+            )
+            if self.on_widen:
+                try:
+                    self.on_widen(event)
+                except Exception as e:
+                    logger.error(f"Widening callback failed: {e}")
+
+    # ================ SHEET SIZE ================
+    def _cache_key(self) -> Optional[str]:
+        return self.excel_service._cache_key(self.file_path, self.options)
+
+    def _cached_sample(self) -> Optional[pd.DataFrame]:
+        """Uniform sample of a cached sheet without reading all of it"""
+        if self.options.get("columns") or self.options.get("column_mappings"):
+            return None
+
+        cache = self.excel_service.columnar_cache
+        key = self._cache_key()
+        rows = cache.num_rows(key)
+        if not rows:
+            return None
+
+        rng = np.random.default_rng(self.seed)
+        size = min(self.reservoir.size, rows)
+        indices = np.sort(rng.choice(rows, size=size, replace=False))
+        return cache.take(key, indices)
+
+    def _estimate_total_rows(self) -> Optional[int]:
+        rows = self.excel_service.columnar_cache.num_rows(self._cache_key())
+        if rows is not None:
+            return rows
+
+        try:
+            session = self.excel_service.open_session(self.file_path)
+            return session.row_count(
+                self.options.get("sheet_name", 0),
+                self.options.get("has_header", True),
+            )
+        except Exception as e:
+            logger.debug(f"Row count unavailable: {e}")
+            return None
+
+    def _coverage(self, seen: int) -> float:
+        if not self.total_rows:
+            return 0.0
+        return min(1.0, seen / self.total_rows)
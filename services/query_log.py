@@ -0,0 +1,159 @@
+"""
+services/query_log.py
+Query Log - normalized query shapes with their latency
+"""
+
+import re
+import json
+import threading
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Identifiers are kept verbatim; string and numeric literals become "?"
+LITERAL_PATTERN = re.compile(
+    r"(\[[^\]]*\]|\"[^\"]*\")"
+    r"|N?'(?:[^']|'')*'"
+    r"|(?<![\w.])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+)
+COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+IN_LIST_PATTERN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Statements worth logging, and catalog lookups that are not workload
+LOGGED_STATEMENT = re.compile(r"^\s*(?:SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+CATALOG_PATTERN = re.compile(
+    r"\b(?:sqlite_master|sqlite_schema|pragma_\w+|sys\.\w+|INFORMATION_SCHEMA)\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_query(sql: str) -> str:
+    """Shape of a statement: literals as ?, IN lists folded, spacing collapsed"""
+    shape = COMMENT_PATTERN.sub(" ", sql)
+    shape = LITERAL_PATTERN.sub(lambda m: m.group(1) or "?", shape)
+    shape = IN_LIST_PATTERN.sub("IN (?)", shape)
+    return WHITESPACE_PATTERN.sub(" ", shape).strip().rstrip(";").strip()
+
+
+class QueryLog:
+    """Execution count and latency per normalized query shape
+
+    Every execution of the same statement shape lands in one entry, so
+    the log stays small however many queries run. At most ``max_shapes``
+    shapes are kept (the least recently seen are evicted) and the log is
+    saved to a JSON file every ``flush_every`` recordings. One raw sample
+    per shape is held in memory only, so an index can be measured by
+    replaying it without writing query parameters to disk.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = "logs/query_log.json",
+        max_shapes: int = 1000,
+        flush_every: int = 100,
+    ):
+        self.path = Path(path) if path else None
+        self.max_shapes = max_shapes
+        self.flush_every = flush_every
+
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+        self._samples: Dict[str, Tuple[str, tuple]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def record(self, sql: str, params: tuple = (), elapsed_seconds: float = 0.0):
+        """Add one execution of a statement"""
+        if not LOGGED_STATEMENT.match(sql) or CATALOG_PATTERN.search(sql):
+            return
+
+        shape = normalize_query(sql)
+        elapsed_ms = elapsed_seconds * 1000
+
+        with self._lock:
+            entry = self._shapes.pop(shape, None)
+            if entry is None:
+                entry = {
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "min_ms": elapsed_ms,
+                    "max_ms": elapsed_ms,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["min_ms"] = min(entry["min_ms"], elapsed_ms)
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_seen"] = datetime.now().isoformat()
+
+            # Re-inserted last, so the first key is the least recently seen
+            self._shapes[shape] = entry
+            self._samples[shape] = (sql, tuple(params or ()))
+            while len(self._shapes) > self.max_shapes:
+                evicted = next(iter(self._shapes))
+                del self._shapes[evicted]
+                self._samples.pop(evicted, None)
+
+            self._pending += 1
+            flush = self._pending >= self.flush_every
+
+        if flush:
+            self.save()
+
+    def shapes(self, min_count: int = 1) -> List[Dict[str, Any]]:
+        """Logged shapes by total time spent, heaviest first"""
+        with self._lock:
+            entries = [
+                {**entry, "avg_ms": entry["total_ms"] / entry["count"]}
+                for entry in self._shapes.values()
+                if entry["count"] >= min_count
+            ]
+        return sorted(entries, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def sample(self, shape: str) -> Optional[Tuple[str, tuple]]:
+        """A raw statement and its parameters seen for a shape"""
+        with self._lock:
+            return self._samples.get(shape)
+
+    def total_ms(self) -> float:
+        with self._lock:
+            return sum(entry["total_ms"] for entry in self._shapes.values())
+
+    def load(self):
+        """Read shapes saved by an earlier session"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            with self._lock:
+                self._shapes = {entry["shape"]: entry for entry in entries}
+        except Exception as e:
+            logger.error(f"Failed to load query log: {e}")
+
+    def save(self) -> bool:
+        """Write the shapes to the log file"""
+        if not self.path:
+            return False
+        try:
+            with self._lock:
+                entries = list(self._shapes.values())
+                self._pending = 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save query log: {e}")
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._shapes.clear()
+            self._samples.clear()
+            self._pending = 0
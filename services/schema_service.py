@@ -10,6 +10,8 @@ from pathlib import Path
 import json
 import re
 
+from utils.type_inference import ColumnStats
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,6 +58,7 @@ class ColumnDefinition:
             "sqlite": {
                 "string": "TEXT",
                 "integer": "INTEGER",
+                "bigint": "INTEGER",
                 "float": "REAL",
                 "boolean": "BOOLEAN",
                 "date": "TEXT",
@@ -66,6 +69,7 @@ class ColumnDefinition:
             "sqlserver": {
                 "string": "NVARCHAR(255)",
                 "integer": "INT",
+                "bigint": "BIGINT",
                 "float": "FLOAT",
                 "boolean": "BIT",
                 "date": "DATE",
@@ -158,10 +162,32 @@ class SchemaAnalyzer:
         # Analyze data columns
         for col_name in sample_data[0].keys():
             clean_name = SchemaAnalyzer._clean_column_name(col_name)
-            data_type = SchemaAnalyzer._detect_column_type(sample_data, col_name)
-            nullable = SchemaAnalyzer._detect_nullable(sample_data, col_name)
+            stats = SchemaAnalyzer._column_stats(sample_data, col_name)
+
+            columns.append(
+                ColumnDefinition(clean_name, stats.infer_type(), stats.null_count > 0)
+            )
 
-            columns.append(ColumnDefinition(clean_name, data_type, nullable))
+        return TableSchema(table_name, columns)
+
+    @staticmethod
+    def analyze_progressive(inference, table_name: str) -> TableSchema:
+        """Suggest a schema from a running ProgressiveSchemaInference
+
+        Types and nullability come from the inference's current proposal,
+        so calling this again after more rows have streamed can only
+        widen the suggested types.
+        """
+        columns = [ColumnDefinition("id", "integer", nullable=False, primary_key=True)]
+
+        for col_name, progress in inference.proposal().items():
+            columns.append(
+                ColumnDefinition(
+                    SchemaAnalyzer._clean_column_name(col_name),
+                    progress["type"],
+                    progress["nullable"],
+                )
+            )
 
         return TableSchema(table_name, columns)
 
@@ -192,82 +218,20 @@ class SchemaAnalyzer:
 
         return clean
 
+    @staticmethod
+    def _column_stats(data: List[Dict], column: str) -> ColumnStats:
+        """Single-pass stats of one column of sample rows"""
+        return ColumnStats.from_values((row.get(column) for row in data), column)
+
     @staticmethod
     def _detect_column_type(data: List[Dict], column: str) -> str:
         """Detect optimal column type from sample data"""
-        values = [row.get(column) for row in data if row.get(column) is not None]
-
-        if not values:
-            return "string"
-
-        # Type detection logic
-        all_integers = True
-        all_floats = True
-        all_booleans = True
-        all_dates = True
-
-        for value in values:
-            str_val = str(value).strip().lower()
-
-            # Check integer
-            try:
-                int(float(str_val))
-                if "." in str_val:
-                    all_integers = False
-            except (ValueError, TypeError):
-                all_integers = False
-                all_floats = False
-
-            # Check float
-            try:
-                float(str_val)
-            except (ValueError, TypeError):
-                all_floats = False
-
-            # Check boolean
-            if str_val not in ["true", "false", "1", "0", "yes", "no", "y", "n"]:
-                all_booleans = False
-
-            # Check date
-            if not SchemaAnalyzer._looks_like_date(str_val):
-                all_dates = False
-
-        # Return most specific type
-        if all_booleans and len(set(str(v).lower() for v in values)) <= 4:
-            return "boolean"
-        elif all_integers:
-            return "integer"
-        elif all_floats:
-            return "float"
-        elif all_dates:
-            return "datetime"
-        else:
-            # Check for long text
-            max_length = max(len(str(v)) for v in values)
-            return "text" if max_length > 255 else "string"
+        return SchemaAnalyzer._column_stats(data, column).infer_type()
 
     @staticmethod
     def _detect_nullable(data: List[Dict], column: str) -> bool:
-        """Detect if column should be nullable"""
-        total = len(data)
-        null_count = sum(
-            1
-            for row in data
-            if row.get(column) is None or str(row.get(column, "")).strip() == ""
-        )
-        return null_count > 0
-
-    @staticmethod
-    def _looks_like_date(value: str) -> bool:
-        """Check if value looks like date"""
-        import re
-
-        date_patterns = [
-            r"^\d{4}-\d{2}-\d{2}$",
-            r"^\d{2}/\d{2}/\d{4}$",
-            r"^\d{2}-\d{2}-\d{4}$",
-        ]
-        return any(re.match(pattern, value) for pattern in date_patterns)
+        """Detect if column should be nullable (blank strings count as null)"""
+        return SchemaAnalyzer._column_stats(data, column).null_count > 0
 
 
 class SchemaService:
@@ -0,0 +1,285 @@
+"""
+services/sqlite_writer.py
+SQLite Writer - every write through one connection on one thread
+"""
+
+import re
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Row-level DML that can share a transaction with other small writes
+COALESCABLE_STATEMENT = re.compile(
+    r"^\s*(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE
+)
+
+# Transaction control, which cannot span separately queued statements
+TRANSACTION_STATEMENT = re.compile(
+    r"^\s*(?:BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE
+)
+
+# Statements that only read and can run on any connection
+READ_STATEMENT = re.compile(r"^\s*(?:SELECT|EXPLAIN|VALUES)\b", re.IGNORECASE)
+CTE_STATEMENT = re.compile(r"^\s*WITH\b", re.IGNORECASE)
+DML_KEYWORD = re.compile(r"\b(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+PRAGMA_STATEMENT = re.compile(
+    r"^\s*PRAGMA\s+(?:\w+\.)?(\w+)\s*(?:\([^)]*\))?\s*;?\s*$", re.IGNORECASE
+)
+
+# Pragmas that report on the schema or database; an argument names
+# the object to report on rather than setting a value
+READ_ONLY_PRAGMAS = {
+    "collation_list",
+    "compile_options",
+    "database_list",
+    "foreign_key_check",
+    "foreign_key_list",
+    "function_list",
+    "index_info",
+    "index_list",
+    "index_xinfo",
+    "integrity_check",
+    "module_list",
+    "pragma_list",
+    "quick_check",
+    "table_info",
+    "table_list",
+    "table_xinfo",
+}
+
+
+def is_read_only(sql: str) -> bool:
+    """Whether a statement only reads: SELECT, EXPLAIN, a WITH query
+    without DML, or a reporting PRAGMA"""
+    if READ_STATEMENT.match(sql):
+        return True
+    if CTE_STATEMENT.match(sql):
+        return not DML_KEYWORD.search(sql)
+    pragma = PRAGMA_STATEMENT.match(sql)
+    return bool(pragma) and pragma.group(1).lower() in READ_ONLY_PRAGMAS
+
+
+class _WriteOp:
+    __slots__ = ("fn", "exclusive", "transaction", "future")
+
+    def __init__(self, fn: Callable, exclusive: bool, transaction: bool):
+        self.fn = fn
+        self.exclusive = exclusive
+        self.transaction = transaction
+        self.future: Future = Future()
+
+
+class SQLiteWriteQueue:
+    """Serialize SQLite writes onto a dedicated writer thread
+
+    SQLite admits one writer at a time; connections that write
+    concurrently just wait on each other's locks up to the busy timeout.
+    Here a single thread owns the only writable connection and executes
+    queued operations in order.
+
+    Small DML statements queued while the writer is busy are committed
+    together in one ``BEGIN IMMEDIATE`` transaction (group commit), each
+    inside its own savepoint so a failing statement does not undo its
+    neighbours. Larger operations passed to run() get the connection to
+    themselves. Callers block until their operation is committed.
+
+    Every queued operation is committed on its own, so a transaction
+    cannot be opened by one execute() and closed by a later one;
+    execute() rejects transaction control statements. Work that needs
+    one transaction goes through run() or lease().
+    """
+
+    def __init__(self, connect: Callable[[], Any], max_batch: int = 500):
+        self.max_batch = max_batch
+        self.connection = connect()
+
+        self._queue: "queue.Queue[Optional[_WriteOp]]" = queue.Queue()
+        self._closed = False
+        self.stats = {
+            "operations": 0,
+            "transactions": 0,
+            "coalesced_operations": 0,
+            "largest_batch": 0,
+            "failed_operations": 0,
+        }
+
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+
+    # ================ SUBMISSION ================
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """Run one write statement, returning the affected row count"""
+        if TRANSACTION_STATEMENT.match(sql):
+            raise Exception(
+                "Transaction control is not supported through the SQLite "
+                "writer queue; run the statements together with run()"
+            )
+
+        coalescable = bool(COALESCABLE_STATEMENT.match(sql))
+        future = self.submit(
+            lambda conn: conn.execute(sql, params).rowcount,
+            exclusive=not coalescable,
+            transaction=False,
+        )
+        return future.result()
+
+    def run(self, fn: Callable[[Any], Any], transaction: bool = False) -> Any:
+        """Run ``fn(connection)`` alone on the writer thread
+
+        With ``transaction`` the call is wrapped in BEGIN/COMMIT; otherwise
+        ``fn`` manages its own transactions.
+        """
+        return self.submit(fn, exclusive=True, transaction=transaction).result()
+
+    @contextmanager
+    def lease(self):
+        """Borrow the writer connection for work spanning several calls
+
+        The writer thread parks until the lease ends, so writes queued
+        meanwhile wait behind it. The borrower must commit or roll back
+        before the lease ends.
+        """
+        if threading.current_thread() is self._thread:
+            yield self.connection
+            return
+
+        held = threading.Event()
+        released = threading.Event()
+
+        def hold(conn):
+            held.set()
+            released.wait()
+
+        future = self.submit(hold, exclusive=True)
+        held.wait()
+        try:
+            yield self.connection
+        finally:
+            released.set()
+            future.result()
+
+    def submit(
+        self, fn: Callable[[Any], Any], exclusive: bool = False, transaction=False
+    ) -> Future:
+        if self._closed:
+            raise Exception("SQLite writer is closed")
+
+        op = _WriteOp(fn, exclusive, transaction)
+        if threading.current_thread() is self._thread:
+            # Re-entrant call from an operation: run inline, no deadlock
+            self._run_exclusive(op)
+        else:
+            self._queue.put(op)
+        return op.future
+
+    def close(self):
+        """Finish queued writes, then stop the thread and close the connection"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "queued_operations": self._queue.qsize()}
+
+    # ================ WRITER THREAD ================
+    def _run(self):
+        carry: Optional[_WriteOp] = None
+
+        while True:
+            op = carry if carry is not None else self._queue.get()
+            carry = None
+            if op is None:
+                return
+
+            if op.exclusive:
+                self._run_exclusive(op)
+                continue
+
+            # Group commit: take whatever small writes queued up meanwhile
+            batch = [op]
+            while len(batch) < self.max_batch:
+                try:
+                    queued = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is None or queued.exclusive:
+                    carry = queued
+                    break
+                batch.append(queued)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_WriteOp]):
+        conn = self.connection
+        cursor = conn.cursor()
+        results = []
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for op in batch:
+                cursor.execute("SAVEPOINT write_op")
+                try:
+                    result = op.fn(conn)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write_op")
+                    cursor.execute("RELEASE write_op")
+                    self.stats["failed_operations"] += 1
+                    op.future.set_exception(e)
+                    continue
+                cursor.execute("RELEASE write_op")
+                results.append((op, result))
+            cursor.execute("COMMIT")
+
+        except Exception as e:
+            logger.error(f"SQLite write transaction failed: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            for op in batch:
+                if not op.future.done():
+                    self.stats["failed_operations"] += 1
+                    op.future.set_exception(e)
+            return
+        finally:
+            cursor.close()
+
+        # Results are released only once the transaction is durable
+        for op, result in results:
+            op.future.set_result(result)
+
+        self.stats["operations"] += len(batch)
+        self.stats["transactions"] += 1
+        if len(batch) > 1:
+            self.stats["coalesced_operations"] += len(batch)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+
+    def _run_exclusive(self, op: _WriteOp):
+        conn = self.connection
+        try:
+            if op.transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            result = op.fn(conn)
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.stats["failed_operations"] += 1
+            op.future.set_exception(e)
+            return
+
+        self.stats["operations"] += 1
+        self.stats["transactions"] += 1
+        op.future.set_result(result)
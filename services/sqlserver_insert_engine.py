@@ -0,0 +1,174 @@
+"""
+services/sqlserver_insert_engine.py
+SQL Server Insert Engine - fast_executemany with typed parameter binding
+"""
+
+import re
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class SqlServerInsertEngine:
+    """Array-bound SQL Server inserts sized by a memory budget
+
+    pyodbc's ``fast_executemany`` sends a whole batch of parameters in one
+    round trip, but it allocates a buffer of ``rows x row width`` up front.
+    Parameter types and widths are taken from the target table schema
+    (``ConnectionPoolService.get_table_schema``) so that NVARCHAR, DECIMAL
+    and DATETIME2 values are bound as typed arrays, and the batch size is
+    derived from the buffer width instead of a fixed row count.
+    """
+
+    # Bytes of length/indicator buffer bound per parameter
+    INDICATOR_BYTES = 8
+
+    def __init__(
+        self,
+        table_schema: List[Dict[str, Any]],
+        memory_budget_mb: float = 64,
+        min_batch_rows: int = 100,
+        max_batch_rows: int = 50000,
+    ):
+        # Keyed by cleaned name, like the columns of auto-created tables
+        self.schema = {
+            self._clean_column_name(col["name"]): col for col in table_schema
+        }
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.min_batch_rows = min_batch_rows
+        self.max_batch_rows = max_batch_rows
+
+    def insert(
+        self, conn, insert_sql: str, columns: List[str], data: List[Dict]
+    ) -> int:
+        """Insert rows with fast_executemany, committed by the caller"""
+        input_sizes = self.input_sizes(columns)
+        batch_rows = self.batch_rows(columns)
+
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        total_inserted = 0
+
+        try:
+            for i in range(0, len(data), batch_rows):
+                batch = data[i : i + batch_rows]
+                batch_values = [
+                    [self._normalize_value(row.get(col)) for col in columns]
+                    for row in batch
+                ]
+
+                # Input sizes are reset by every execute call
+                cursor.setinputsizes(input_sizes)
+                cursor.executemany(insert_sql, batch_values)
+                total_inserted += len(batch_values)
+        finally:
+            cursor.close()
+
+        logger.debug(
+            f"fast_executemany inserted {total_inserted} rows "
+            f"in batches of {batch_rows}"
+        )
+        return total_inserted
+
+    def batch_rows(self, columns: List[str]) -> int:
+        """Rows per batch that fit the parameter buffer memory budget"""
+        row_bytes = self.row_bytes(columns)
+        rows = self.memory_budget_bytes // max(1, row_bytes)
+        return int(max(self.min_batch_rows, min(self.max_batch_rows, rows)))
+
+    def row_bytes(self, columns: List[str]) -> int:
+        """Estimated parameter buffer bytes for one row"""
+        return sum(self._column_binding(col)[1] for col in columns)
+
+    def input_sizes(self, columns: List[str]) -> List[Optional[Tuple[int, int, int]]]:
+        """setinputsizes() entries for the given insert columns"""
+        return [self._column_binding(col)[0] for col in columns]
+
+    def schema_column(self, column: str) -> Optional[Dict[str, Any]]:
+        """Table schema entry of an insert column, matched by cleaned name"""
+        return self.schema.get(self._clean_column_name(column))
+
+    def _column_binding(
+        self, column: str
+    ) -> Tuple[Optional[Tuple[int, int, int]], int]:
+        """Resolve (input size tuple, buffer bytes) for one column"""
+        import pyodbc
+
+        col = self.schema_column(column)
+        if not col:
+            # Unknown column, let the driver describe the parameter
+            return None, 256 + self.INDICATOR_BYTES
+
+        data_type = str(col.get("type", "")).lower()
+        length = col.get("max_length")
+        precision = col.get("precision") or 18
+        scale = col.get("scale") or 0
+
+        if data_type in ("nvarchar", "nchar", "ntext", "xml"):
+            if not length or length < 0 or data_type in ("ntext", "xml"):
+                # NVARCHAR(MAX) is streamed at execution time
+                binding = ((pyodbc.SQL_WLONGVARCHAR, 0, 0), 0)
+            else:
+                binding = ((pyodbc.SQL_WVARCHAR, length, 0), (length + 1) * 2)
+        elif data_type in ("varchar", "char", "text"):
+            if not length or length < 0 or data_type == "text":
+                binding = ((pyodbc.SQL_LONGVARCHAR, 0, 0), 0)
+            else:
+                binding = ((pyodbc.SQL_VARCHAR, length, 0), length + 1)
+        elif data_type in ("decimal", "numeric"):
+            binding = ((pyodbc.SQL_DECIMAL, precision, scale), precision + 2)
+        elif data_type in ("money", "smallmoney"):
+            binding = ((pyodbc.SQL_DECIMAL, 19, 4), 21)
+        elif data_type == "datetime2":
+            fraction = col.get("datetime_precision")
+            fraction = 7 if fraction is None else fraction
+            size = 19 if fraction == 0 else 20 + fraction
+            binding = ((pyodbc.SQL_TYPE_TIMESTAMP, size, fraction), 16)
+        elif data_type == "datetime":
+            binding = ((pyodbc.SQL_TYPE_TIMESTAMP, 23, 3), 16)
+        elif data_type == "smalldatetime":
+            binding = ((pyodbc.SQL_TYPE_TIMESTAMP, 16, 0), 16)
+        elif data_type == "date":
+            binding = ((pyodbc.SQL_TYPE_DATE, 10, 0), 6)
+        elif data_type == "bigint":
+            binding = ((pyodbc.SQL_BIGINT, 0, 0), 8)
+        elif data_type == "int":
+            binding = ((pyodbc.SQL_INTEGER, 0, 0), 4)
+        elif data_type == "smallint":
+            binding = ((pyodbc.SQL_SMALLINT, 0, 0), 2)
+        elif data_type == "tinyint":
+            binding = ((pyodbc.SQL_TINYINT, 0, 0), 1)
+        elif data_type == "bit":
+            binding = ((pyodbc.SQL_BIT, 0, 0), 1)
+        elif data_type in ("float", "real"):
+            binding = ((pyodbc.SQL_DOUBLE, 0, 0), 8)
+        elif data_type == "uniqueidentifier":
+            binding = ((pyodbc.SQL_GUID, 0, 0), 16)
+        else:
+            binding = (None, 256)
+
+        return binding[0], binding[1] + self.INDICATOR_BYTES
+
+    @staticmethod
+    def _normalize_value(value: Any) -> Any:
+        """Map NaN/NaT/pd.NA placeholders to NULL and unwrap NumPy scalars"""
+        if value is None:
+            return None
+        if pd.api.types.is_scalar(value) and pd.isna(value):  # NaN, NaT, pd.NA
+            return None
+        if hasattr(value, "item") and type(value).__module__ == "numpy":
+            return value.item()
+        return value
+
+    @staticmethod
+    def _clean_column_name(name: str) -> str:
+        """Clean column name for database compatibility"""
+        clean = str(name).strip()
+        clean = re.sub(r"[^\w\s]", "_", clean)
+        clean = re.sub(r"\s+", "_", clean)
+        clean = re.sub(r"_+", "_", clean)
+        clean = clean.strip("_").lower()
+        return clean if clean else "column"
@@ -0,0 +1,206 @@
+"""
+services/workbook_session.py
+Workbook Session - one open handle for all workbook metadata queries
+"""
+
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from .xlsx_reader import (
+    build_column_headers,
+    fit_row,
+    resolve_sheet_paths,
+    estimate_sheet_extent,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WorkbookSession:
+    """Single open workbook answering sheet, dimension and sample queries
+
+    The zip container and workbook metadata are parsed once when the
+    session opens, through a single file handle. Sheet names, dimensions,
+    sample rows and row counts are then served from that handle and
+    memoized, instead of every caller re-reading the file through
+    ``pd.read_excel``. Modern workbooks use an openpyxl read-only
+    workbook; legacy ``.xls``/``.xlsb`` files fall back to a single
+    ``pd.ExcelFile``. Close the session when done so the file is not held
+    open.
+    """
+
+    OPENPYXL_EXTENSIONS = [".xlsx", ".xlsm"]
+
+    def __init__(self, file_path: str):
+        path = Path(file_path)
+        stat = path.stat()
+
+        self.file_path = str(path.absolute())
+        self.file_size = stat.st_size
+        self.modified_time = stat.st_mtime
+        self.extension = path.suffix.lower()
+
+        self._lock = threading.RLock()
+        self._workbook = None
+        self._archive = None
+        self._excel_file = None
+        self._sheet_paths: Optional[Dict[str, str]] = None
+        self._samples: Dict[Tuple, pd.DataFrame] = {}
+        self._extents: Dict[str, Dict[str, Any]] = {}
+
+        if self.extension in self.OPENPYXL_EXTENSIONS:
+            self._workbook = load_workbook(
+                self.file_path, read_only=True, data_only=True
+            )
+            # Read-only workbooks keep their zip open; share it for sheet XML
+            self._archive = self._workbook._archive
+        else:
+            self._excel_file = pd.ExcelFile(self.file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the underlying workbook handle is still open"""
+        return self._workbook is not None or self._excel_file is not None
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names in workbook order"""
+        with self._lock:
+            if self._workbook is not None:
+                return list(self._workbook.sheetnames)
+            return list(self._excel_file.sheet_names)
+
+    def is_current(self, file_path: Optional[str] = None) -> bool:
+        """Check the session still matches the file on disk"""
+        if not self.is_open:
+            return False
+
+        try:
+            path = Path(file_path) if file_path else Path(self.file_path)
+            if str(path.absolute()) != self.file_path:
+                return False
+            stat = path.stat()
+            return (
+                stat.st_size == self.file_size and stat.st_mtime == self.modified_time
+            )
+        except OSError:
+            return False
+
+    def sheet_name(self, sheet: Any = 0) -> str:
+        """Resolve a sheet index or name to its name"""
+        names = self.sheet_names
+        if isinstance(sheet, int):
+            return names[sheet]
+        if sheet not in names:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        return sheet
+
+    def dimensions(self, sheet: Any = 0) -> Dict[str, Any]:
+        """Sheet extent, from the dimension tag when it can be trusted"""
+        with self._lock:
+            name = self.sheet_name(sheet)
+            if name not in self._extents:
+                self._extents[name] = self._read_extent(name)
+            return dict(self._extents[name])
+
+    def read_sample(
+        self, sheet: Any = 0, nrows: int = 10, has_header: bool = True
+    ) -> pd.DataFrame:
+        """First rows of a sheet as a DataFrame"""
+        with self._lock:
+            name = self.sheet_name(sheet)
+            key = (name, nrows, has_header)
+            if key not in self._samples:
+                self._samples[key] = self._read_sample(name, nrows, has_header)
+            return self._samples[key].copy()
+
+    def row_count(self, sheet: Any = 0, has_header: bool = True) -> int:
+        """Number of data rows in a sheet"""
+        extent = self.dimensions(sheet)
+        rows = extent["max_row"] - extent["min_row"] + 1 if extent["max_row"] else 0
+        return max(0, rows - 1) if has_header else rows
+
+    def row_count_exact(self, sheet: Any = 0) -> bool:
+        """Whether row_count() came from an exact count rather than metadata"""
+        return self.dimensions(sheet)["row_count_exact"]
+
+    def close(self):
+        """Close the workbook handle"""
+        with self._lock:
+            try:
+                if self._workbook is not None:
+                    self._workbook.close()  # Also closes the shared archive
+                if self._excel_file is not None:
+                    self._excel_file.close()
+            except Exception as e:
+                logger.warning(f"Failed to close workbook session: {e}")
+            finally:
+                self._workbook = None
+                self._archive = None
+                self._excel_file = None
+                self._sheet_paths = None
+                self._samples.clear()
+                self._extents.clear()
+
+    def _read_sample(self, name: str, nrows: int, has_header: bool) -> pd.DataFrame:
+        """Read sample rows from the open handle"""
+        header = 0 if has_header else None
+
+        if self._workbook is None:
+            return self._excel_file.parse(name, header=header, nrows=nrows)
+
+        worksheet = self._workbook[name]
+        worksheet.reset_dimensions()  # Stale dimensions would truncate rows
+        rows = worksheet.iter_rows(values_only=True)
+
+        columns = None
+        if has_header:
+            header_row = next(rows, None)
+            if header_row is None:
+                return pd.DataFrame()
+            columns = build_column_headers(header_row)
+
+        data = []
+        for row in rows:
+            if len(data) >= nrows:
+                break
+            if all(value is None for value in row):
+                continue
+            if columns is None:
+                columns = list(range(len(row)))
+            data.append(fit_row(row, len(columns)))
+
+        return pd.DataFrame(data, columns=columns or [])
+
+    def _read_extent(self, name: str) -> Dict[str, Any]:
+        """Resolve the extent of one sheet from the open handle"""
+        if self._archive is not None:
+            if self._sheet_paths is None:
+                self._sheet_paths = resolve_sheet_paths(self._archive)
+            extent = estimate_sheet_extent(self._archive, self._sheet_paths[name])
+            if extent["max_column"] is None:  # Width unknown after a scan
+                extent["max_column"] = len(self.read_sample(name, 0).columns)
+            return {"sheet_name": name, **extent}
+
+        # Legacy formats have no sheet XML to inspect
+        max_row = len(self._excel_file.parse(name, header=None, usecols=[0]))
+        return {
+            "sheet_name": name,
+            "ref": None,
+            "min_row": 1 if max_row else 0,
+            "max_row": max_row,
+            "max_column": len(self.read_sample(name, 0).columns),
+            "row_count_exact": True,
+            "source": "parse",
+        }
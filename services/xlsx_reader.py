@@ -0,0 +1,514 @@
+"""
+services/xlsx_reader.py
+XLSX Reader - direct access to the sheet XML inside the workbook zip
+"""
+
+import re
+import zipfile
+import posixpath
+import logging
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+import xml.etree.ElementTree as ET
+
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import from_excel, MAC_EPOCH, WINDOWS_EPOCH
+
+logger = logging.getLogger(__name__)
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Sheet XML smaller than this is cheap enough to scan outright
+SMALL_SHEET_BYTES = 64 * 1024
+
+# Upper bound of XML bytes one cell can plausibly take
+MAX_BYTES_PER_CELL = 2048
+
+SCAN_CHUNK_BYTES = 1024 * 1024
+
+_ROW_TAG = re.compile(rb"<(?:\w+:)?row\b([^>]*?)(/?)>")
+_ROW_NUMBER = re.compile(rb'\br="(\d+)"')
+_CELL_REF = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+
+def build_column_headers(header_row: Tuple) -> List[Any]:
+    """Build column headers the same way pandas names them"""
+    header = list(header_row)
+
+    # Drop trailing empty header cells
+    while header and header[-1] is None:
+        header.pop()
+
+    columns = []
+    seen = {}
+    for index, value in enumerate(header):
+        name = f"Unnamed: {index}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+
+    return columns
+
+
+def fit_row(row: Tuple, width: int) -> Tuple:
+    """Pad or truncate row values to the header width"""
+    row = tuple(row)  # read-only openpyxl yields blank rows as lists
+    if len(row) == width:
+        return row
+    if len(row) > width:
+        return row[:width]
+    return row + (None,) * (width - len(row))
+
+
+def select_column_indexes(names: List[Any], columns: List[Any]) -> List[int]:
+    """Positions of the selected columns, in selection order"""
+    positions = {name: index for index, name in enumerate(names)}
+    missing = [str(col) for col in columns if col not in positions]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(missing)}")
+    return [positions[col] for col in columns]
+
+
+def resolve_sheet_paths(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Map sheet names to their worksheet XML paths inside the zip"""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = target
+
+    paths = {}
+    for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet"):
+        rel_id = sheet.get(f"{{{REL_NS}}}id")
+        if rel_id in targets:
+            paths[sheet.get("name")] = targets[rel_id]
+
+    return paths
+
+
+def parse_ref(ref: str) -> Optional[Tuple[int, int, int, int]]:
+    """Parse an A1-style range into (min_row, min_col, max_row, max_col)"""
+    if not ref:
+        return None
+
+    bounds = []
+    for cell in ref.split(":")[:2]:
+        match = _CELL_REF.match(cell.strip())
+        if not match:
+            return None
+        column = 0
+        for char in match.group(1).upper():
+            column = column * 26 + (ord(char) - 64)
+        bounds.append((int(match.group(2)), column))
+
+    (min_row, min_col), (max_row, max_col) = bounds[0], bounds[-1]
+    return min_row, min_col, max_row, max_col
+
+
+def read_dimension(archive: zipfile.ZipFile, sheet_path: str) -> Optional[str]:
+    """Read the <dimension ref> of a sheet without touching its cell data"""
+    with archive.open(sheet_path) as stream:
+        try:
+            for _, element in ET.iterparse(stream, events=("start",)):
+                tag = element.tag.rsplit("}", 1)[-1]
+                if tag == "dimension":
+                    return element.get("ref")
+                if tag == "sheetData":
+                    # dimension always precedes sheetData
+                    return None
+        except ET.ParseError as e:
+            logger.warning(f"Failed to read dimension of {sheet_path}: {e}")
+    return None
+
+
+def scan_row_extent(archive: zipfile.ZipFile, sheet_path: str) -> int:
+    """Exact last populated row number from the raw <row> tags
+
+    Only the row start tags are matched in the decompressed byte stream;
+    no cell objects or XML tree are built. Self-closing rows carry no
+    cells and are ignored.
+    """
+    last_row = 0
+    current = 0
+    tail = b""
+
+    with archive.open(sheet_path) as stream:
+        while True:
+            chunk = stream.read(SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+
+            buffer = tail + chunk
+            last_end = 0
+            for match in _ROW_TAG.finditer(buffer):
+                number = _ROW_NUMBER.search(match.group(1))
+                current = int(number.group(1)) if number else current + 1
+                if not match.group(2):
+                    last_row = current
+                last_end = match.end()
+
+            # Keep a possibly split tag for the next chunk
+            tail = buffer[max(last_end, len(buffer) - 1024) :]
+
+    return last_row
+
+
+def estimate_sheet_extent(archive: zipfile.ZipFile, sheet_path: str) -> Dict[str, Any]:
+    """Row/column extent from the dimension tag, scanning only if it lies"""
+    xml_bytes = archive.getinfo(sheet_path).file_size
+    ref = read_dimension(archive, sheet_path)
+    bounds = parse_ref(ref)
+
+    if bounds and not _dimension_is_suspect(ref, bounds, xml_bytes):
+        min_row, _, max_row, max_col = bounds
+        return {
+            "ref": ref,
+            "min_row": min_row,
+            "max_row": max_row,
+            "max_column": max_col,
+            "row_count_exact": False,
+            "source": "dimension",
+        }
+
+    logger.info(f"Dimension of {sheet_path} missing or unreliable, scanning rows")
+    max_row = scan_row_extent(archive, sheet_path)
+    return {
+        "ref": ref,
+        "min_row": 1 if max_row else 0,
+        "max_row": max_row,
+        "max_column": None,
+        "row_count_exact": True,
+        "source": "scan",
+    }
+
+
+def _dimension_is_suspect(
+    ref: str, bounds: Tuple[int, int, int, int], xml_bytes: int
+) -> bool:
+    """Check a dimension tag against the uncompressed sheet size"""
+    min_row, min_col, max_row, max_col = bounds
+    cells = max(1, (max_row - min_row + 1) * (max_col - min_col + 1))
+
+    # Writers that skip the real extent usually emit a bare "A1"
+    if ":" not in ref and xml_bytes > SMALL_SHEET_BYTES:
+        return True
+
+    # Far more XML than the declared cells could hold
+    return xml_bytes > SMALL_SHEET_BYTES + cells * MAX_BYTES_PER_CELL
+
+
+class XlsxSheetReader:
+    """Streaming worksheet parser that bypasses openpyxl cell objects
+
+    Sheet XML is consumed with ``iterparse`` one ``<row>`` at a time and
+    each row is discarded once converted. The shared strings table, date
+    cell styles and workbook epoch are resolved once per reader, so every
+    cell costs a dictionary lookup instead of a Cell object. Rows are
+    emitted as column-typed batches (column name -> list of values) that
+    build DataFrames without per-row dictionaries.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._archive = zipfile.ZipFile(file_path)
+        self._sheet_paths: Optional[Dict[str, str]] = None
+        self._shared_strings: Optional[List[str]] = None
+        self._styles: Optional[Tuple[Set[int], Set[int]]] = None
+        self._epoch = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names in workbook order"""
+        return list(self._get_sheet_paths())
+
+    def close(self):
+        """Close the workbook zip"""
+        self._archive.close()
+
+    def iter_batches(
+        self,
+        sheet: Any = 0,
+        batch_size: int = 5000,
+        has_header: bool = True,
+        columns: Optional[List[Any]] = None,
+    ) -> Iterator[Dict[Any, List[Any]]]:
+        """Yield column-typed batches of at most batch_size rows
+
+        ``columns`` projects the sheet onto the given header names (or
+        positions when there is no header). Cells of other columns are
+        skipped before their values are converted.
+        """
+        projection: Dict[str, Any] = {"wanted": None, "last": None}
+        names = None
+        indexes = None
+        width = 0
+        rows = []
+
+        for row in self._iter_rows(self._resolve_sheet_path(sheet), projection):
+            if names is None:
+                if has_header:
+                    names = build_column_headers(tuple(row))
+                    width = len(names)
+                    row = None
+                else:
+                    width = len(row)
+                    names = list(range(width))
+
+                if columns is not None:
+                    indexes = select_column_indexes(names, columns)
+                    names = [names[i] for i in indexes]
+                    projection["wanted"] = set(indexes)
+                    projection["last"] = max(indexes, default=-1)
+                if row is None:
+                    continue
+
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+            if indexes is not None:
+                row = [row[i] for i in indexes]
+            elif len(row) > width:
+                row = row[:width]
+            rows.append(row)
+
+            if len(rows) >= batch_size:
+                yield self._to_columns(names, rows)
+                rows = []
+
+        if rows:
+            yield self._to_columns(names, rows)
+
+    # ================ SHEET PARSING ================
+    def _iter_rows(
+        self, sheet_path: str, projection: Optional[Dict[str, Any]] = None
+    ) -> Iterator[List[Any]]:
+        """Parse rows of a sheet into positional value lists
+
+        Rows and cells are placed by their ``r`` references, like openpyxl:
+        blank rows between populated ones come out as empty lists, and
+        blank rows before the first or after the last populated row are
+        left out. ``projection`` may be filled in while iterating; rows
+        parsed after that only convert cells whose column index is in
+        ``wanted``.
+        """
+        projection = projection or {}
+        shared_strings = self._get_shared_strings()
+        date_styles, timedelta_styles = self._get_date_styles()
+        epoch = self._get_epoch()
+
+        row_tag = f"{{{MAIN_NS}}}row"
+        sheet_data_tag = f"{{{MAIN_NS}}}sheetData"
+        value_tag = f"{{{MAIN_NS}}}v"
+        inline_tag = f"{{{MAIN_NS}}}is"
+        text_tag = f"{{{MAIN_NS}}}t"
+
+        sheet_data = None
+        row_number = 0
+        last_yielded: Optional[int] = None
+        with self._archive.open(sheet_path) as stream:
+            for event, element in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    if element.tag == sheet_data_tag:
+                        sheet_data = element
+                    continue
+                if element.tag != row_tag:
+                    continue
+
+                ref = element.get("r")
+                row_number = int(ref) if ref else row_number + 1
+                wanted = projection.get("wanted")
+                last = projection.get("last")
+
+                values = []
+                has_value = False
+                position = 0
+                for cell in element:
+                    ref = cell.get("r")
+                    index = _column_index(ref) if ref else position
+                    position = index + 1
+                    if wanted is not None:
+                        if index > last:
+                            break
+                        if index not in wanted:
+                            continue
+
+                    cell_type = cell.get("t", "n")
+                    if cell_type == "inlineStr":
+                        inline = cell.find(inline_tag)
+                        value = (
+                            "".join(t.text or "" for t in inline.iter(text_tag))
+                            if inline is not None
+                            else None
+                        )
+                    else:
+                        node = cell.find(value_tag)
+                        text = node.text if node is not None else None
+                        if text is None:
+                            value = None
+                        elif cell_type == "n":
+                            value = _cast_number(text)
+                            style = int(cell.get("s", 0))
+                            if style in date_styles:
+                                value = from_excel(
+                                    value,
+                                    epoch,
+                                    timedelta=style in timedelta_styles,
+                                )
+                        elif cell_type == "s":
+                            value = shared_strings[int(text)]
+                        elif cell_type == "b":
+                            value = text == "1"
+                        elif cell_type == "d":
+                            value = _parse_iso_datetime(text)
+                        else:
+                            value = text  # str formula results and errors
+
+                    if index < len(values):
+                        values[index] = value
+                    else:
+                        values.extend([None] * (index - len(values)))
+                        values.append(value)
+                    has_value = has_value or value is not None
+
+                # Drop the parsed row so the tree never grows
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+                if has_value:
+                    if last_yielded is not None:
+                        for _ in range(row_number - last_yielded - 1):
+                            yield []
+                    last_yielded = row_number
+                    yield values
+
+    @staticmethod
+    def _to_columns(columns: List[Any], rows: List[List[Any]]) -> Dict[Any, List]:
+        """Transpose buffered rows into per-column value lists"""
+        return {column: list(values) for column, values in zip(columns, zip(*rows))}
+
+    # ================ WORKBOOK METADATA ================
+    def _get_sheet_paths(self) -> Dict[str, str]:
+        if self._sheet_paths is None:
+            self._sheet_paths = resolve_sheet_paths(self._archive)
+        return self._sheet_paths
+
+    def _resolve_sheet_path(self, sheet: Any) -> str:
+        """Resolve a sheet index or name to its XML path"""
+        paths = self._get_sheet_paths()
+        if isinstance(sheet, int):
+            return list(paths.values())[sheet]
+        if sheet not in paths:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        return paths[sheet]
+
+    def _get_shared_strings(self) -> List[str]:
+        """Index the shared strings table once"""
+        if self._shared_strings is not None:
+            return self._shared_strings
+
+        strings = []
+        if "xl/sharedStrings.xml" in self._archive.namelist():
+            item_tag = f"{{{MAIN_NS}}}si"
+            text_tag = f"{{{MAIN_NS}}}t"
+            phonetic_tag = f"{{{MAIN_NS}}}rPh"
+
+            with self._archive.open("xl/sharedStrings.xml") as stream:
+                for _, element in ET.iterparse(stream, events=("end",)):
+                    if element.tag != item_tag:
+                        continue
+                    # Phonetic runs are reading hints, not cell text
+                    phonetic = {id(t) for ph in element.iter(phonetic_tag) for t in ph}
+                    strings.append(
+                        "".join(
+                            t.text or ""
+                            for t in element.iter(text_tag)
+                            if id(t) not in phonetic
+                        )
+                    )
+                    element.clear()
+
+        self._shared_strings = strings
+        return strings
+
+    def _get_date_styles(self) -> Tuple[Set[int], Set[int]]:
+        """Cell style indexes whose number format is a date or duration"""
+        if self._styles is not None:
+            return self._styles
+
+        date_styles, timedelta_styles = set(), set()
+        if "xl/styles.xml" in self._archive.namelist():
+            styles = ET.fromstring(self._archive.read("xl/styles.xml"))
+
+            formats = dict(BUILTIN_FORMATS)
+            for fmt in styles.iter(f"{{{MAIN_NS}}}numFmt"):
+                formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+
+            cell_xfs = styles.find(f"{{{MAIN_NS}}}cellXfs")
+            if cell_xfs is not None:
+                for index, xf in enumerate(cell_xfs.iter(f"{{{MAIN_NS}}}xf")):
+                    fmt = formats.get(int(xf.get("numFmtId", 0)))
+                    if is_date_format(fmt):
+                        date_styles.add(index)
+                    if is_timedelta_format(fmt):
+                        timedelta_styles.add(index)
+
+        self._styles = (date_styles, timedelta_styles)
+        return self._styles
+
+    def _get_epoch(self):
+        """Workbook date epoch, honouring the 1904 date system"""
+        if self._epoch is None:
+            workbook = ET.fromstring(self._archive.read("xl/workbook.xml"))
+            properties = workbook.find(f"{{{MAIN_NS}}}workbookPr")
+            date1904 = properties is not None and properties.get("date1904") in (
+                "1",
+                "true",
+            )
+            self._epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+        return self._epoch
+
+
+def _column_index(ref: str) -> int:
+    """Zero-based column index of an A1-style cell reference"""
+    index = 0
+    for char in ref:
+        if char.isdigit():
+            break
+        index = index * 26 + (ord(char.upper()) - 64)
+    return index - 1
+
+
+def _cast_number(text: str) -> Any:
+    """Convert a numeric cell value to int or float like openpyxl"""
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def _parse_iso_datetime(text: str) -> Any:
+    """Parse an ISO 8601 date cell, keeping the raw text if it is not one"""
+    try:
+        return datetime.fromisoformat(text.rstrip("Z"))
+    except ValueError:
+        return text
@@ -0,0 +1,30 @@
+"""
+tests/conftest.py
+Shared fixtures - repository root on the import path, temporary databases
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.connection_pool_service import ConnectionPoolService
+
+
+@pytest.fixture
+def sqlite_service(tmp_path, monkeypatch):
+    """A pool service connected to a fresh SQLite file, single writer mode"""
+    monkeypatch.chdir(tmp_path)
+    service = ConnectionPoolService()
+    assert service.connect_database(
+        {
+            "type": "sqlite",
+            "file": "test.db",
+            "single_writer": True,
+            "reaper_interval": 0,
+        }
+    )
+    yield service
+    service.close_all_pools()
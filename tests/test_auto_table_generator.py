@@ -0,0 +1,295 @@
+"""
+tests/test_auto_table_generator.py
+Automatic table generation - schema creation and data loading
+"""
+
+import pandas as pd
+import pytest
+
+from services.auto_table_generator import (
+    AutoTableGenerator,
+    ColumnSchema,
+    DataTypeDetector,
+    TableSchema,
+)
+
+
+def _related_sheets(orphans: int = 0) -> dict:
+    customers = pd.DataFrame(
+        {
+            "customer_code": [f"C{i:04d}" for i in range(50)],
+            "name": [f"Customer {i}" for i in range(50)],
+        }
+    )
+    codes = [f"C{i % 50:04d}" for i in range(200 - orphans)]
+    codes += [f"X{i:04d}" for i in range(orphans)]
+    orders = pd.DataFrame(
+        {
+            "order_no": range(1, 201),
+            "customer_code": codes,
+            "amount": [float(i) for i in range(200)],
+        }
+    )
+    return {"customers": customers, "orders": orders}
+
+
+def _count(service, table: str) -> int:
+    success, rows = service.execute_query(f"SELECT COUNT(*) AS n FROM [{table}]")
+    assert success
+    return rows[0]["n"]
+
+
+def test_sqlite_load_data_with_foreign_keys(sqlite_service):
+    generator = AutoTableGenerator(sqlite_service)
+
+    results = generator.create_tables_automatically(
+        _related_sheets(), {"load_data": True, "backup_existing": False}
+    )
+
+    assert not results["failed_tables"]
+    assert [
+        fk["references_table"] for fk in results["schemas"]["orders"]["foreign_keys"]
+    ] == ["customers"]
+    # customers.customer_code -> orders.customer_code is skipped, not unique
+    assert results["schemas"]["customers"]["foreign_keys"] == []
+    assert _count(sqlite_service, "customers") == 50
+    assert _count(sqlite_service, "orders") == 200
+    assert results["foreign_key_violations"] == {}
+
+    # Enforcement is back on for later writes
+    success, _ = sqlite_service.execute_query(
+        "INSERT INTO [orders] ([order_no], [customer_code], [amount]) "
+        "VALUES (?, ?, ?)",
+        (999, "NOPE", 1.0),
+    )
+    assert not success
+
+
+def test_sqlite_load_data_reports_orphans(sqlite_service):
+    generator = AutoTableGenerator(sqlite_service)
+
+    results = generator.create_tables_automatically(
+        _related_sheets(orphans=10), {"load_data": True, "backup_existing": False}
+    )
+
+    assert results["schemas"]["orders"]["foreign_keys"]
+    assert _count(sqlite_service, "orders") == 200
+    assert results["foreign_key_violations"] == {"orders": 10}
+
+
+def test_sqlite_load_data_parses_non_iso_dates_per_sheet(sqlite_service):
+    generator = AutoTableGenerator(sqlite_service)
+    excel_data = {
+        # Same column name, day-first in one sheet and month-first in the other
+        "staff": pd.DataFrame(
+            {
+                "name": ["a", "b", "c"],
+                "joined": ["13/01/2020", "28/02/2021", "31/12/2019"],
+            }
+        ),
+        "contractors": pd.DataFrame(
+            {
+                "name": ["d", "e", "f"],
+                "joined": ["01/13/2020", "02/28/2021", "12/31/2019"],
+            }
+        ),
+    }
+
+    results = generator.create_tables_automatically(
+        excel_data, {"load_data": True, "backup_existing": False}
+    )
+
+    assert not results["failed_tables"]
+    for table in ("staff", "contractors"):
+        success, rows = sqlite_service.execute_query(
+            f"SELECT [joined] FROM [{table}] ORDER BY [name]"
+        )
+        assert success
+        assert [row["joined"] for row in rows] == [
+            "2020-01-13",
+            "2021-02-28",
+            "2019-12-31",
+        ]
+
+
+def test_parallel_analysis_matches_sequential_per_sheet():
+    excel_data = {
+        "staff": pd.DataFrame(
+            {
+                "joined": ["13/01/2020", "28/02/2021", "31/12/2019"] * 10,
+                "contact": [f"user{i}@example.com" for i in range(30)],
+            }
+        ),
+        "contractors": pd.DataFrame(
+            {
+                "joined": ["01/13/2020", "02/28/2021", "12/31/2019"] * 10,
+                "contact": [f"08{i:08d}" for i in range(30)],
+            }
+        ),
+    }
+
+    sequential = AutoTableGenerator()
+    sequential.config["parallel_analysis"] = False
+    sequential.analyze_excel_data(excel_data)
+
+    parallel = AutoTableGenerator()
+    parallel.config.update(
+        {
+            "parallel_analysis": True,
+            "analysis_workers": 4,
+            "analysis_executor": "thread",
+        }
+    )
+    parallel.analyze_excel_data(excel_data)
+
+    expected = sequential.type_detector
+    detector = parallel.type_detector
+    assert detector.pattern_matches == expected.pattern_matches
+    assert detector.date_formats.formats() == expected.date_formats.formats()
+    assert detector.date_formats.get(("staff", "joined")) == "%d/%m/%Y"
+    assert detector.date_formats.get(("contractors", "joined")) == "%m/%d/%Y"
+    assert (
+        detector.pattern_matches[("staff", "contact")]
+        != detector.pattern_matches[("contractors", "contact")]
+    )
+
+
+def test_sqlserver_primary_key_accepts_loaded_values():
+    orders = pd.DataFrame(
+        {"Order ID": range(1, 101), "Amount": [float(i) for i in range(100)]}
+    )
+    generator = AutoTableGenerator()
+    schema = generator.analyze_excel_data({"orders": orders})["orders"]
+    sql = generator.generate_create_statements({"orders": schema}, "sqlserver")[
+        "orders"
+    ]
+
+    # _load_table inserts every sheet column under its cleaned name
+    insert_columns = [
+        col.name for col in schema.columns if col.original_name in orders.columns
+    ]
+    assert schema.primary_keys == ["order_id"]
+    assert "order_id" in insert_columns
+    for line in sql.splitlines():
+        if any(line.strip().startswith(f"[{name}]") for name in insert_columns):
+            assert "IDENTITY" not in line
+    assert "[order_id] " in sql and "PRIMARY KEY" in sql
+
+
+def test_foreign_key_check_runs_when_unique_index_fails(sqlite_service):
+    for sql in (
+        "CREATE TABLE [regions] ([code] TEXT)",
+        "INSERT INTO [regions] VALUES ('N'), ('N')",
+        "CREATE TABLE [shops] ([shop_id] INTEGER PRIMARY KEY, [region] TEXT "
+        "REFERENCES [regions]([code]))",
+    ):
+        assert sqlite_service.execute_query(sql)[0]
+
+    def text_column(name):
+        return ColumnSchema(name=name, original_name=name, data_type="string")
+
+    regions = TableSchema(name="regions", columns=[text_column("code")])
+    shops = TableSchema(
+        name="shops",
+        columns=[text_column("shop_id"), text_column("region")],
+        primary_keys=["shop_id"],
+        foreign_keys=[
+            {
+                "column": "region",
+                "references_table": "regions",
+                "references_column": "code",
+            }
+        ],
+    )
+
+    warnings = []
+    generator = AutoTableGenerator(sqlite_service)
+    generator._check_foreign_keys(shops, {"regions": regions, "shops": shops}, warnings)
+
+    # The duplicate blocks the unique index, and the check still runs
+    assert "non-unique column regions.code" in warnings[0]
+    assert warnings[1].startswith("Table shops: foreign key check failed")
+
+
+def test_sqlserver_foreign_key_takes_referenced_type():
+    excel_data = {
+        "customers": pd.DataFrame(
+            {
+                "customer_id": range(1, 51),
+                "name": [f"Customer {i}" for i in range(50)],
+            }
+        ),
+        "orders": pd.DataFrame(
+            {
+                "order_no": range(1, 201),
+                "customer_id": [i % 50 + 1 for i in range(200)],
+            }
+        ),
+    }
+    generator = AutoTableGenerator()
+    schemas = generator.analyze_excel_data(excel_data)
+    statements = generator.generate_create_statements(schemas, "sqlserver")
+
+    def column_type(table: str, column: str) -> str:
+        for line in statements[table].splitlines():
+            if line.strip().startswith(f"[{column}] "):
+                return line.split()[1]
+        raise AssertionError(f"{table}.{column} not declared")
+
+    # Values 1-50 alone would narrow to TINYINT; the referenced key is wider
+    assert schemas["orders"].foreign_keys[0]["references_table"] == "customers"
+    assert column_type("orders", "customer_id") == column_type(
+        "customers", "customer_id"
+    )
+    assert column_type("orders", "order_no") == "SMALLINT"
+
+    # Narrowed strings keep the analysis length headroom
+    assert column_type("customers", "name") == "VARCHAR(50)"
+
+
+PATTERN_VALUES = [
+    "ann@example.com",
+    "https://example.com/a",
+    "+66 2 123 4567",
+    "2024-01-05",
+    "2024-01-05 10:30:00",
+    "$12.50",
+    "12,5%",
+    "10.0.0.1",
+    "123e4567-E89B-12d3-a456-426614174000",
+    "plain text",
+    "42",
+]
+
+
+def test_combined_classifier_matches_each_pattern_separately():
+    detector = DataTypeDetector()
+    values = pd.Series(PATTERN_VALUES * 3)
+
+    expected = {
+        name: values.str.match(pattern, case=False).sum() / len(values)
+        for name, pattern in detector.type_patterns.items()
+    }
+
+    assert detector.match_patterns(values) == expected
+
+
+@pytest.mark.parametrize(
+    "values, data_type, pattern",
+    [
+        (["ann@example.com", "bob@example.org"], "string", "email"),
+        (["https://a.example", "http://b.example/x"], "text", "url"),
+        (["$1.50", "£2", "3,75"], "decimal", "currency"),
+        (["plain", "words"], "string", None),
+    ],
+)
+def test_detected_patterns_drive_type_and_metadata(values, data_type, pattern):
+    detector = DataTypeDetector()
+
+    data = pd.Series(values, name="col")
+    analysis = detector.analyze_column(data, "col", sheet_name="s")
+
+    assert analysis["data_type"] == data_type
+    assert analysis["metadata"]["pattern_detected"] == pattern
+    # Ratios are kept for the column instead of being recomputed
+    assert detector._best_pattern(detector.pattern_matches[("s", "col")]) == pattern
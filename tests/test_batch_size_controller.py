@@ -0,0 +1,74 @@
+"""
+tests/test_batch_size_controller.py
+Batch Size Controller - adaptation with batches prefetched ahead of the writer
+"""
+
+from itertools import islice
+
+from utils.batch_size_controller import BatchSizeController
+
+
+def _controller(**kwargs) -> BatchSizeController:
+    return BatchSizeController(
+        "sqlite:test.db",
+        "t",
+        initial_size=1000,
+        target_batch_seconds=1.0,
+        store_path=None,
+        **kwargs,
+    )
+
+
+def _rows(n: int):
+    return [{"id": i, "value": "x"} for i in range(n)]
+
+
+def _prefetch(batches, depth: int = 8):
+    """Cut ``depth`` batches ahead, like the import pipeline's queues"""
+    return list(islice(batches, depth))
+
+
+def test_one_slow_batch_halves_once_despite_prefetched_batches():
+    controller = _controller()
+    controller.slow_start = False
+    batches = controller.rebatch(iter([_rows(20000)]))
+
+    queued = _prefetch(batches)
+    assert [len(batch) for batch in queued] == [1000] * 8
+
+    # Every queued batch is slow: the hiccup happened once
+    for batch in queued:
+        controller.record(batch, 1.5)
+    assert controller.size == 500
+
+    # Batches cut at the new size adapt again
+    batch = next(batches)
+    assert len(batch) == 500
+    controller.record(batch, 1.5)
+    assert controller.size == 250
+
+
+def test_stale_batches_after_doubling_are_not_dropped_from_stats():
+    controller = _controller()
+    batches = controller.rebatch(iter([_rows(20000)]))
+
+    queued = _prefetch(batches)
+    for batch in queued:
+        controller.record(batch, 0.1)
+
+    # One doubling per epoch, not one per queued batch
+    assert controller.size == 2000
+    assert controller.best_rate == 10000
+    assert [entry["size"] for entry in controller.history] == [1000] * 8
+
+    batch = next(batches)
+    assert len(batch) == 2000
+    controller.record(batch, 0.1)
+    assert controller.size == 4000
+
+
+def test_batches_without_rebatch_use_the_current_size():
+    controller = _controller()
+    controller.record(_rows(1000), 0.1)
+    controller.record(_rows(2000), 0.1)
+    assert controller.size == 4000
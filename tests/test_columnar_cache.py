@@ -0,0 +1,74 @@
+"""
+tests/test_columnar_cache.py
+Columnar Cache - chunked writes and per-engine entries
+"""
+
+import pandas as pd
+import pytest
+
+from services.columnar_cache import ColumnarCache
+from services.excel_service import ExcelService
+
+pytest.importorskip("pyarrow")
+
+
+def _write(cache, key, frames) -> bool:
+    writer = cache.writer(key)
+    try:
+        for df in frames:
+            writer.write(df)
+        return writer.commit()
+    finally:
+        writer.close()
+
+
+def test_column_empty_in_the_first_chunk_takes_a_later_type(tmp_path):
+    cache = ColumnarCache(str(tmp_path))
+    frames = [
+        pd.DataFrame({"id": [1, 2], "note": [None, None]}),
+        pd.DataFrame({"id": [3, 4], "note": ["late", None]}),
+        pd.DataFrame({"id": [5], "note": [None]}),
+    ]
+
+    assert _write(cache, "sheet", frames)
+
+    df = cache.get("sheet")
+    assert df["id"].tolist() == [1, 2, 3, 4, 5]
+    assert df["note"].tolist()[2] == "late"
+    assert df["note"].isna().tolist() == [True, True, False, True, True]
+
+
+def test_conflicting_chunk_types_abandon_the_entry(tmp_path):
+    cache = ColumnarCache(str(tmp_path))
+    frames = [
+        pd.DataFrame({"id": [1, 2]}),
+        pd.DataFrame({"id": ["three"]}),
+    ]
+
+    assert not _write(cache, "sheet", frames)
+    assert cache.get("sheet") is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_native_reads_are_cached_apart_from_openpyxl_reads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "orders.xlsx")
+    pd.DataFrame({"id": [1, 2, 3], "note": [None, None, "x"]}).to_excel(
+        path, index=False
+    )
+
+    service = ExcelService()
+    native = service._cache_key(path, {"engine": "native"})
+    openpyxl = service._cache_key(path, {})
+    assert native != openpyxl
+
+    df = service.read_dataframe(path, {"engine": "native"})
+    cached = service.columnar_cache.get(native)
+    assert cached is not None
+    pd.testing.assert_frame_equal(cached, df, check_dtype=False)
+    assert service.columnar_cache.get(openpyxl) is None
+
+    # Projected reads are not cached
+    service.columnar_cache.clear()
+    service.read_dataframe(path, {"engine": "native", "columns": ["id"]})
+    assert service.columnar_cache.get(native) is None
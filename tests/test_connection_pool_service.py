@@ -0,0 +1,269 @@
+"""
+tests/test_connection_pool_service.py
+Connection Pool Service - read/write routing in single writer mode
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.connection_pool_service import ConnectionPool
+from services.sqlite_writer import is_read_only
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM t",
+        "  select 1",
+        "WITH x AS (SELECT 1) SELECT * FROM x",
+        "EXPLAIN QUERY PLAN SELECT * FROM t",
+        "PRAGMA table_info([t])",
+        "PRAGMA main.index_list(t)",
+        "PRAGMA foreign_key_check",
+    ],
+)
+def test_read_only_statements(sql):
+    assert is_read_only(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "INSERT INTO t VALUES (1)",
+        "WITH x AS (SELECT 1) INSERT INTO t SELECT * FROM x",
+        "CREATE TABLE t (id INTEGER)",
+        "PRAGMA foreign_keys = OFF",
+        "PRAGMA user_version(5)",
+        "PRAGMA optimize",
+    ],
+)
+def test_write_statements(sql):
+    assert not is_read_only(sql)
+
+
+@pytest.mark.parametrize("sql", ["BEGIN", "begin immediate", "COMMIT", "END"])
+def test_transaction_control_is_rejected_in_single_writer_mode(sqlite_service, sql):
+    success, message = sqlite_service.execute_query(sql)
+
+    assert not success
+    assert "Transaction control" in message
+    assert not sqlite_service.current_writer.connection.in_transaction
+
+
+def test_writer_run_keeps_statements_in_one_transaction(sqlite_service):
+    assert sqlite_service.execute_query("CREATE TABLE [t] ([id] INTEGER)")[0]
+
+    def insert_then_fail(conn):
+        conn.execute("INSERT INTO [t] VALUES (1)")
+        conn.execute("INSERT INTO [t] VALUES (2)")
+        raise ValueError("abort")
+
+    with pytest.raises(ValueError):
+        sqlite_service.current_writer.run(insert_then_fail, transaction=True)
+
+    success, rows = sqlite_service.execute_query("SELECT COUNT(*) AS n FROM [t]")
+    assert rows[0]["n"] == 0
+
+
+def test_pragma_table_info_does_not_wait_for_writer(sqlite_service):
+    assert sqlite_service.execute_query("CREATE TABLE [t] ([id] INTEGER)")[0]
+
+    # Hold the writer with a pending operation
+    release = threading.Event()
+    pending = sqlite_service.current_writer.submit(
+        lambda conn: release.wait(10), exclusive=True
+    )
+    try:
+        start = time.perf_counter()
+        success, rows = sqlite_service.execute_query("PRAGMA table_info([t])")
+        elapsed = time.perf_counter() - start
+
+        assert success
+        assert [row["name"] for row in rows] == ["id"]
+        assert elapsed < 1
+        assert not pending.done()
+        assert [col["name"] for col in sqlite_service.get_table_schema("t")] == ["id"]
+    finally:
+        release.set()
+    assert pending.result(timeout=5)
+
+
+def test_bulk_load_groups_commits_across_chunks(sqlite_service, monkeypatch):
+    profiles = []
+    apply_profile = sqlite_service._sqlite_load_profile
+
+    def counting_profile(conn, exclusive_lock=True):
+        profiles.append(exclusive_lock)
+        return apply_profile(conn, exclusive_lock)
+
+    monkeypatch.setattr(sqlite_service, "_sqlite_load_profile", counting_profile)
+
+    def count():
+        return sqlite_service.execute_query("SELECT COUNT(*) AS n FROM [t]")[1][0]["n"]
+
+    options = {"bulk_load": True, "commit_every": 2}
+    with sqlite_service.bulk_load("t", options) as load:
+        load.insert([{"value": i} for i in range(10)])
+        assert count() == 0
+
+        load.insert([{"value": i} for i in range(10, 20)])
+        assert count() == 20
+
+        load.insert([{"value": i} for i in range(20, 30)])
+        assert count() == 20
+
+    # The last group is committed when the load ends; the writer is
+    # leased, with the load profile, once per commit group
+    assert count() == 30
+    assert profiles == [False, False]
+
+
+def test_small_writes_run_between_bulk_load_groups(sqlite_service):
+    assert sqlite_service.execute_query("CREATE TABLE [log] ([message] TEXT)")[0]
+
+    def log_write(done: threading.Event):
+        sqlite_service.execute_query("INSERT INTO [log] VALUES ('import running')")
+        done.set()
+
+    options = {"bulk_load": True, "commit_every": 2}
+    with sqlite_service.bulk_load("t", options) as load:
+        load.insert([{"value": i} for i in range(10)])
+
+        # The open group holds the writer, so the small write waits
+        done = threading.Event()
+        threading.Thread(target=log_write, args=(done,), daemon=True).start()
+        assert not done.wait(0.3)
+
+        # Committing the group releases the writer before the load ends
+        load.insert([{"value": i} for i in range(10, 20)])
+        assert done.wait(5)
+
+        load.insert([{"value": i} for i in range(20, 30)])
+
+    success, rows = sqlite_service.execute_query("SELECT COUNT(*) AS n FROM [t]")
+    assert rows[0]["n"] == 30
+    success, rows = sqlite_service.execute_query("SELECT COUNT(*) AS n FROM [log]")
+    assert rows[0]["n"] == 1
+
+
+def test_validation_counters_are_exact_under_contention(tmp_path):
+    pool = ConnectionPool(
+        {"type": "sqlite", "file": str(tmp_path / "pool.db")},
+        pool_size=2,
+        max_overflow=0,
+        min_idle=2,
+        validation_idle_seconds=0,
+        reaper_interval=0,
+    )
+
+    def checkout(times: int):
+        for _ in range(times):
+            with pool.get_managed_connection():
+                pass
+
+    threads = [threading.Thread(target=checkout, args=(200,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close_all()
+
+    # Every checkout reused a pre-opened connection, validating it first
+    assert pool.total_connections_created == 2
+    assert pool.validations == 8 * 200
+    assert pool.validation_failures == 0
+
+
+def _pool(tmp_path, **kwargs) -> ConnectionPool:
+    options = {"pool_size": 3, "max_overflow": 0, "reaper_interval": 0, **kwargs}
+    return ConnectionPool(
+        {"type": "sqlite", "file": str(tmp_path / "pool.db")}, **options
+    )
+
+
+def _age(pool, conn, seconds: float):
+    """Pretend a connection was opened and last used ``seconds`` ago"""
+    pool.opened_at[conn] -= seconds
+    pool.last_used[conn] -= seconds
+
+
+def test_recently_used_connections_skip_validation(tmp_path):
+    pool = _pool(tmp_path, min_idle=1, validation_idle_seconds=30)
+
+    for _ in range(5):
+        with pool.get_managed_connection():
+            pass
+    assert pool.validations == 0
+
+    # One that sat idle past the threshold is checked once
+    _age(pool, pool.connections[0], 60)
+    with pool.get_managed_connection():
+        pass
+    assert pool.validations == 1
+    pool.close_all()
+
+
+def test_connections_past_max_lifetime_are_replaced(tmp_path):
+    pool = _pool(tmp_path, min_idle=1, max_lifetime=100)
+    old = pool.connections[0]
+    _age(pool, old, 200)
+
+    conn = pool.get_connection()
+
+    assert conn is not old
+    assert pool.expired_connections == 1
+    assert pool.total_connections_created == 2
+    pool.return_connection(conn)
+    pool.close_all()
+
+
+def test_reaper_trims_idle_connections_to_min_idle_and_prewarms(tmp_path):
+    pool = _pool(tmp_path, min_idle=1, idle_timeout=10)
+    held = [pool.get_connection() for _ in range(3)]
+    for conn in held:
+        pool.return_connection(conn)
+        _age(pool, conn, 20)
+
+    assert pool.reap() == {"closed": 2, "created": 0}
+    assert len(pool.connections) == 1
+
+    # Losing the last idle connection is topped back up
+    with pool.lock:
+        pool._close_locked(pool.connections.pop())
+        pool._open -= 1
+    assert pool.reap() == {"closed": 0, "created": 1}
+    assert len(pool.connections) == 1
+    pool.close_all()
+
+
+def test_released_idle_slots_go_to_waiters(tmp_path):
+    pool = ConnectionPool(
+        {"type": "sqlite", "file": str(tmp_path / "pool.db")},
+        pool_size=1,
+        max_overflow=0,
+        min_idle=1,
+        timeout=5,
+        reaper_interval=0,
+    )
+    conn = pool.get_connection()
+
+    granted = []
+    waiter = threading.Thread(target=lambda: granted.append(pool.get_connection()))
+    waiter.start()
+    while not pool.waiters:
+        time.sleep(0.01)
+
+    # Park the checked-out connection as idle without handing it over
+    with pool.lock:
+        pool.checked_out.discard(conn)
+        pool.connections.append(conn)
+
+    assert pool.release_idle_connections() == 1
+    waiter.join(5)
+
+    assert len(granted) == 1 and granted[0] is not conn
+    assert pool.total_connections_created == 2
+    pool.return_connection(granted[0])
+    pool.close_all()
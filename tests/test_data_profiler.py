@@ -0,0 +1,74 @@
+"""
+tests/test_data_profiler.py
+Data Profiler - vectorized quality metrics
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_profiler import DataProfiler, analyze_data_quality
+
+
+def _float_ok(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["1", "-2.5", " 3 ", ".5", "5.", "1e3", "1E-2", "inf", "-Infinity", "nan"]
+    + ["", "abc", "1,000", "1.2.3", "e5", "--1", "0x10", "12 %"],
+)
+def test_numeric_count_matches_float(value):
+    profile = DataProfiler.profile_column(pd.Series([value], dtype=object))
+
+    assert profile["numeric_count"] == int(_float_ok(value))
+
+
+def test_quality_report():
+    df = pd.DataFrame(
+        {
+            "amount": ["10", "12.5", "n/a", "7", "10"],
+            "code": ["A1", "B2", "C3", "D4", "A1"],
+            "joined": ["2024-01-05", "05/02/2024", "2024-03-01", None, "2024-01-05"],
+            "empty": [np.nan] * 5,
+            "memo": ["x" * 1200, "short", "", "y", "x" * 1200],
+        }
+    )
+
+    report = analyze_data_quality(df)
+
+    assert report["total_rows"] == 5
+    assert report["total_columns"] == 5
+    assert report["null_percentage"] == 24.0
+    assert report["duplicate_rows"] == 1
+    assert report["empty_columns"] == 1
+    assert report["columns_with_nulls"] == 2
+    assert report["mixed_type_columns"] == ["amount"]
+    assert report["potential_issues"] == [
+        "Column 'memo' has very long text (max: 1200 chars)",
+        "Column 'empty' is mostly empty (100.0% null)",
+        "Column 'joined' might contain dates but wasn't recognized",
+    ]
+
+
+def test_string_dtype_columns_are_profiled():
+    series = pd.Series(["1", "two", None], dtype="string")
+
+    profile = DataProfiler.profile_column(series)
+
+    assert profile["is_text"]
+    assert (profile["null_count"], profile["numeric_count"]) == (1, 1)
+    assert profile["max_length"] == 3
+
+
+def test_empty_frame():
+    report = analyze_data_quality(pd.DataFrame())
+
+    assert report["null_percentage"] == 0
+    assert report["duplicate_rows"] == 0
+    assert report["potential_issues"] == []
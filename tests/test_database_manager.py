@@ -0,0 +1,57 @@
+"""
+tests/test_database_manager.py
+Database Manager - inserts sharing learned batch sizes with the pool service
+"""
+
+from core.database_manager import DatabaseManager
+
+
+def test_insert_data_shares_batch_sizes_with_pool_service(sqlite_service, tmp_path):
+    manager = DatabaseManager({"db_type": "sqlite", "sqlite_file": "test.db"})
+    assert manager.connect()[0]
+    manager.connection.execute("CREATE TABLE [items] ([id] INTEGER, [name] TEXT)")
+    manager.connection.commit()
+
+    rows = [{"id": i, "name": f"item {i}"} for i in range(5000)]
+    success, message = manager.insert_data("items", rows)
+    assert success, message
+    manager.connection.close()
+
+    # The load was committed and batch sizes remembered for the same file
+    assert sqlite_service.execute_query("SELECT COUNT(*) AS n FROM [items]")[1] == [
+        {"n": 5000}
+    ]
+    assert (tmp_path / "logs" / "batch_sizes.json").exists()
+    assert sqlite_service.batch_size_controller("items").slow_start is False
+
+
+def test_failed_insert_leaves_no_rows_behind(sqlite_service):
+    manager = DatabaseManager({"db_type": "sqlite", "sqlite_file": "test.db"})
+    assert manager.connect()[0]
+    manager.connection.execute(
+        "CREATE TABLE [items] ([id] INTEGER, [name] TEXT NOT NULL)"
+    )
+    manager.connection.commit()
+
+    # The bad row sits well past the first batches
+    rows = [{"id": i, "name": f"item {i}"} for i in range(5000)]
+    rows[4500]["name"] = None
+    success, message = manager.insert_data("items", rows, batch_size=500)
+    manager.connection.close()
+
+    assert not success
+    assert "NOT NULL" in message
+    assert sqlite_service.execute_query("SELECT COUNT(*) AS n FROM [items]")[1] == [
+        {"n": 0}
+    ]
+
+
+def test_sqlserver_table_strings_keep_analysis_headroom():
+    manager = DatabaseManager({"db_type": "sqlite", "sqlite_file": "unused.db"})
+    data = [{"Name": f"Customer {i}", "Code": f"C{i:03d}"} for i in range(30)]
+
+    sql = manager._create_sqlserver_table("customers", data, ["name", "code"])
+
+    # Same lengths AutoTableGenerator declares, not the longest value seen
+    assert "[name] VARCHAR(50)" in sql
+    assert "[code] CHAR(4)" in sql
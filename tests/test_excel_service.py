@@ -0,0 +1,88 @@
+"""
+tests/test_excel_service.py
+Excel Service - streamed reads for import
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from services.excel_service import ExcelService
+
+
+def test_read_file_chunks_parses_listed_date_columns(sqlite_service, tmp_path):
+    path = tmp_path / "dates.xlsx"
+    pd.DataFrame(
+        {
+            "Name": ["a", "b", "c"],
+            "Hire Date": ["13/01/2020", "28/02/2021", "31/12/2019"],
+        }
+    ).to_excel(path, index=False)
+
+    # Import options as the controllers build them from a table's DATE columns
+    options = {"chunk_size": 2, "parse_dates": {"hire_date": None}}
+    records = [
+        row
+        for chunk in ExcelService().read_file_chunks(str(path), options)
+        for row in chunk
+    ]
+
+    assert [row["hire_date"] for row in records] == [
+        datetime(2020, 1, 13),
+        datetime(2021, 2, 28),
+        datetime(2019, 12, 31),
+    ]
+    assert all(type(row["hire_date"]) is datetime for row in records)
+
+    sqlite_service.execute_query(
+        "CREATE TABLE [staff] ([name] TEXT, [hire_date] DATETIME)"
+    )
+    assert sqlite_service.bulk_insert("staff", records, 1000)
+    success, rows = sqlite_service.execute_query("SELECT [hire_date] FROM [staff]")
+    assert success
+    assert rows[0]["hire_date"] == "2020-01-13 00:00:00"
+
+
+def test_read_file_chunks_streams_fixed_size_chunks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "orders.xlsx")
+    pd.DataFrame(
+        {"Order No": range(1, 26), "Item": [f"item {i}" for i in range(25)]}
+    ).to_excel(path, index=False)
+    service = ExcelService()
+    options = {"chunk_size": 10}
+
+    chunks = service.read_file_chunks(path, options)
+    first = next(chunks)  # Available before the rest of the sheet is read
+    chunks = [first, *chunks]
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    records = [row for chunk in chunks for row in chunk]
+    assert records == service.read_file(path, options)
+    assert [row["order_no"] for row in records] == list(range(1, 26))
+
+
+def test_streamed_records_do_not_depend_on_chunk_size(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "stock.xlsx")
+    pd.DataFrame(
+        {
+            "Item": [f"item {i}" for i in range(9)],
+            "Qty": [1, 2, 3, None, None, None, 7, None, 9],
+            "Note": ["a", None, None, None, "b", None, "c", None, None],
+        }
+    ).to_excel(path, index=False)
+    service = ExcelService()
+
+    def stream(chunk_size):
+        options = {"chunk_size": chunk_size, "use_cache": False}
+        return [
+            row for chunk in service.read_file_chunks(path, options) for row in chunk
+        ]
+
+    small, whole = stream(3), stream(1000)
+
+    assert small == whole
+    assert [row["qty"] for row in small] == [1, 2, 3, 0, 0, 0, 7, 0, 9]
+    assert all(isinstance(row["qty"], (int, float)) for row in small)
+    assert [row["note"] for row in small] == ["a", "", "", "", "b", "", "c", "", ""]
@@ -0,0 +1,59 @@
+"""
+tests/test_import_pipeline.py
+Import Pipeline - overlapped reading and writing with cancellation
+"""
+
+import threading
+
+import pytest
+
+from services.import_pipeline import ImportPipeline
+
+
+def _chunks(count: int, size: int = 3):
+    for i in range(count):
+        yield [{"value": i * size + j} for j in range(size)]
+
+
+def test_chunks_reach_the_writer_in_order_on_the_calling_thread():
+    written = []
+    writer_threads = set()
+
+    def writer(chunk):
+        written.append(chunk)
+        writer_threads.add(threading.current_thread())
+        return True
+
+    before = threading.active_count()
+    stats = ImportPipeline(_chunks(5), writer, queue_size=2).run()
+
+    assert [row["value"] for chunk in written for row in chunk] == list(range(15))
+    assert writer_threads == {threading.current_thread()}
+    assert stats["rows_written"] == 15
+    assert stats["batches_written"] == 5
+    assert not stats["cancelled"]
+    assert threading.active_count() == before
+
+
+def test_should_stop_cancels_between_chunks():
+    written = []
+
+    def writer(chunk):
+        written.append(chunk)
+        return True
+
+    stats = ImportPipeline(
+        _chunks(10), writer, should_stop=lambda: len(written) >= 2
+    ).run()
+
+    assert stats["cancelled"]
+    assert stats["batches_written"] == 2
+
+
+def test_reader_failure_is_raised():
+    def failing_reader():
+        yield [{"value": 1}]
+        raise ValueError("bad sheet")
+
+    with pytest.raises(ValueError, match="bad sheet"):
+        ImportPipeline(failing_reader(), lambda chunk: True).run()
@@ -0,0 +1,129 @@
+"""
+tests/test_index_advisor.py
+Index Advisor - candidate keys from query shapes and recommendations
+"""
+
+import pytest
+
+from controllers.app_controller import AppController
+from services.index_advisor import IndexAdvisor
+
+
+@pytest.fixture
+def advisor(sqlite_service):
+    return IndexAdvisor(sqlite_service)
+
+
+@pytest.mark.parametrize(
+    "shape, expected",
+    [
+        # Equality columns lead, sorted, then ORDER BY extends the key
+        (
+            "SELECT * FROM orders WHERE status = ? ORDER BY created",
+            [("orders", ("status", "created"), [])],
+        ),
+        # Equality columns, then one range column; the sort cannot follow it
+        (
+            "SELECT * FROM orders WHERE status = ? AND region = ? "
+            "AND amount > ? ORDER BY created",
+            [("orders", ("region", "status", "amount"), [])],
+        ),
+        # Selected and filtered columns outside the key make it covering
+        (
+            "SELECT id, total FROM orders WHERE amount BETWEEN ? AND ? AND region = ?",
+            [("orders", ("region", "amount"), ["id", "total"])],
+        ),
+        # IN lists count as equality
+        (
+            "SELECT * FROM orders WHERE code IN (?) AND created >= ?",
+            [("orders", ("code", "created"), [])],
+        ),
+        # Join columns are lookups on both sides
+        (
+            "SELECT o.id FROM orders o JOIN customers c ON o.customer_id = c.id "
+            "WHERE c.region = ?",
+            [
+                ("orders", ("customer_id",), ["id"]),
+                ("customers", ("id", "region"), []),
+            ],
+        ),
+        # Nothing filtered or sorted, nothing to index
+        ("SELECT * FROM orders", []),
+    ],
+)
+def test_candidate_keys(advisor, shape, expected):
+    assert advisor.candidate_keys(shape) == expected
+
+
+def _candidate(table, columns, shape):
+    return {
+        "table": table,
+        "columns": columns,
+        "include": [],
+        "workload": [{"shape": shape, "executions": 1, "total_ms": 1.0}],
+    }
+
+
+def test_prefix_keys_fold_into_the_longer_key(advisor):
+    kept = advisor._fold_prefixes(
+        [
+            _candidate("orders", ["status"], "q1"),
+            _candidate("orders", ["status", "created"], "q2"),
+            _candidate("orders", ["created"], "q3"),
+            _candidate("customers", ["status"], "q4"),
+        ]
+    )
+
+    by_key = {(c["table"], tuple(c["columns"])): c for c in kept}
+    assert set(by_key) == {
+        ("orders", ("status", "created")),
+        ("orders", ("created",)),
+        ("customers", ("status",)),
+    }
+    shapes = [
+        item["shape"] for item in by_key[("orders", ("status", "created"))]["workload"]
+    ]
+    assert sorted(shapes) == ["q1", "q2"]
+
+
+@pytest.mark.parametrize(
+    "key, covered",
+    [
+        (["Status"], True),
+        (["status", "created"], True),
+        (["created"], False),
+        (["status", "created", "region"], False),
+    ],
+)
+def test_keys_led_by_an_existing_index_are_covered(advisor, key, covered):
+    assert advisor._is_covered(key, [["status", "created"]]) is covered
+
+
+def test_controller_recommends_and_creates_indexes(sqlite_service, tmp_path):
+    assert sqlite_service.execute_query(
+        "CREATE TABLE [orders] ([id] INTEGER PRIMARY KEY, [status] TEXT, [total] REAL)"
+    )[0]
+    with sqlite_service.bulk_load("orders") as load:
+        load.insert([{"status": f"s{i % 50}", "total": float(i)} for i in range(5000)])
+
+    controller = AppController(connection_service=sqlite_service)
+    controller.is_connected = True
+
+    # The first call starts the query log, unless one is already running
+    assert controller.get_index_recommendations() == []
+    assert sqlite_service.query_log is not None
+    sqlite_service.disable_query_log()
+    sqlite_service.enable_query_log(str(tmp_path / "query_log.json"))
+    for i in range(10):
+        sqlite_service.execute_query(
+            "SELECT * FROM [orders] WHERE [status] = ?", (f"s{i}",)
+        )
+
+    recommendations = controller.get_index_recommendations()
+    assert [(rec["table"], rec["columns"]) for rec in recommendations] == [
+        ("orders", ["status"])
+    ]
+
+    results = controller.apply_index_recommendations(min_speedup=0)
+    assert [result["created"] for result in results] == [True]
+    assert controller.get_index_recommendations() == []
@@ -0,0 +1,150 @@
+"""
+tests/test_parallel_bulk_writer.py
+Parallel Bulk Writer - one writer per import across every chunk
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from controllers.app_controller import AppController
+from services.connection_pool_service import ConnectionPoolService
+from services.excel_service import ExcelService
+
+
+class _RecordingCursor:
+    """Answers the catalog queries of an existing table, records inserts"""
+
+    def __init__(self, inserts):
+        self.inserts = inserts
+        self.description = None
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        if "INFORMATION_SCHEMA.TABLES" in sql:
+            self.description = [("TABLE_NAME",)]
+            self._rows = [tuple(params)]
+        else:
+            self.description = None
+            self._rows = []
+
+    def executemany(self, sql, rows):
+        # Long enough for the other workers to pick up queued batches
+        time.sleep(0.02)
+        self.inserts.append((threading.current_thread().name, len(rows)))
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _RecordingConnection:
+    def __init__(self, inserts):
+        self.inserts = inserts
+
+    def cursor(self):
+        return _RecordingCursor(self.inserts)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _RecordingPool:
+    """Stands in for a SQL Server connection pool"""
+
+    pool_size = 5
+    max_overflow = 0
+
+    def __init__(self):
+        self.inserts = []
+        self.checkouts = 0
+        self.open = 0
+        self.max_open = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def get_managed_connection(self):
+        with self._lock:
+            self.checkouts += 1
+            self.open += 1
+            self.max_open = max(self.max_open, self.open)
+        try:
+            yield _RecordingConnection(self.inserts)
+        finally:
+            with self._lock:
+                self.open -= 1
+
+
+def test_import_feeds_every_chunk_to_one_parallel_writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "orders.xlsx"
+    pd.DataFrame({"Item": [f"item {i}" for i in range(400)]}).to_excel(
+        path, index=False
+    )
+
+    service = ConnectionPoolService()
+    service.current_pool = pool = _RecordingPool()
+    service.current_config = {"type": "sqlserver", "parallel_workers": 4}
+
+    controller = AppController(connection_service=service, excel_service=ExcelService())
+    controller.is_connected = True
+    controller.current_excel_file = {"file_path": str(path)}
+
+    batches = []
+    assert controller.import_excel_data(
+        "orders", {"batch_size": 50, "on_batch": batches.append}
+    )
+
+    # Eight chunks, numbered as one stream and written by several workers
+    assert [batch["batch"] for batch in batches] == list(range(8))
+    assert sum(batch["rows"] for batch in batches) == 400
+    assert len({batch["worker"] for batch in batches}) > 1
+
+    # Two catalog queries, then each worker holds one connection throughout
+    assert sum(rows for _, rows in pool.inserts) == 400
+    assert pool.checkouts == 2 + 4
+
+
+def test_parallel_chunks_are_timed_on_the_wall_clock():
+    service = ConnectionPoolService()
+    service.current_pool = _RecordingPool()
+    service.current_config = {"type": "sqlserver", "parallel_workers": 4}
+
+    batches, chunks = [], []
+    options = {
+        "on_batch": batches.append,
+        "on_chunk": lambda rows, seconds: chunks.append((len(rows), seconds)),
+    }
+    with service.bulk_load("orders", options) as load:
+        for start in (0, 400):
+            rows = [{"Item": f"item {i}"} for i in range(start, start + 400)]
+            load.insert(rows, batch_size=50)
+
+    # Eight batches per chunk overlap on four workers, so each chunk takes
+    # well under the sum of its batch times
+    assert [rows for rows, _ in chunks] == [400, 400]
+    batch_seconds = sum(batch["seconds"] for batch in batches)
+    assert sum(seconds for _, seconds in chunks) < batch_seconds * 0.75
+
+
+def test_parallel_workers_leave_a_pooled_connection_free():
+    service = ConnectionPoolService()
+    service.current_pool = pool = _RecordingPool()
+    service.current_config = {"type": "sqlserver", "parallel_workers": 8}
+
+    with service.bulk_load("orders", {}) as load:
+        rows = [{"Item": f"item {i}"} for i in range(400)]
+        load.insert(rows, batch_size=50)
+
+    # Widening a column mid-load still finds a connection to ALTER with
+    assert load.workers == pool.pool_size - 1
+    assert pool.max_open < pool.pool_size
+    assert sum(rows for _, rows in pool.inserts) == 400
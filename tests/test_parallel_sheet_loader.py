@@ -0,0 +1,68 @@
+"""
+tests/test_parallel_sheet_loader.py
+Parallel Sheet Loader - sheets parsed in worker processes
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+import psutil
+import pytest
+
+from services.excel_service import ExcelService
+from services.parallel_sheet_loader import ParallelSheetLoader
+
+Memory = namedtuple("Memory", "available")
+
+
+def _workbook(tmp_path, sheets: int = 3):
+    path = tmp_path / "regions.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        for i in range(sheets):
+            pd.DataFrame({"id": range(i + 2), "sheet": i}).to_excel(
+                writer, sheet_name=f"S{i}", index=False
+            )
+    return path
+
+
+@pytest.mark.parametrize(
+    "max_workers, memory_limit_mb, available_mb, expected",
+    [
+        (4, None, 0, 3),  # Bounded by the sheet count
+        (2, None, 0, 2),
+        (4, 100, 250, 2),  # Two 100 MB workers fit
+        (4, 100, 50, 1),  # Never below one worker
+    ],
+)
+def test_worker_count(
+    monkeypatch, max_workers, memory_limit_mb, available_mb, expected
+):
+    monkeypatch.setattr(
+        psutil, "virtual_memory", lambda: Memory(available_mb * 1024 * 1024)
+    )
+    loader = ParallelSheetLoader(max_workers, memory_limit_mb)
+
+    assert loader._worker_count(3) == expected
+
+
+def test_sheets_load_in_workbook_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = _workbook(tmp_path)
+
+    frames = ExcelService().read_sheets(
+        str(path), ["S2", "S0", "S1"], {"max_workers": 2, "memory_limit_mb": 64}
+    )
+
+    assert list(frames) == ["S2", "S0", "S1"]
+    for name, df in frames.items():
+        i = int(name[1])
+        assert df["id"].tolist() == list(range(i + 2))
+        assert set(df["sheet"]) == {i}
+
+
+def test_failed_sheet_is_reported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = _workbook(tmp_path, sheets=2)
+
+    with pytest.raises(Exception, match="missing"):
+        ParallelSheetLoader(max_workers=2).load(str(path), ["S0", "missing"])
@@ -0,0 +1,90 @@
+"""
+tests/test_pool_controller.py
+Pool Controller - progress and cancellation of pipelined imports
+"""
+
+import threading
+
+import pandas as pd
+
+from controllers.pool_controller import PoolController
+from services.connection_pool_service import BulkLoad
+
+
+def _controller(service, tmp_path, rows: int = 50):
+    path = tmp_path / "orders.xlsx"
+    pd.DataFrame({"Item": [f"item {i}" for i in range(rows)]}).to_excel(
+        path, index=False
+    )
+
+    controller = PoolController(service)
+    controller.is_connected = True
+    controller.current_excel_file = {"file_path": str(path), "total_rows": rows}
+    return controller
+
+
+def _run_import(controller, options):
+    """Start an import and wait for its final status"""
+    statuses = []
+    finished = threading.Event()
+    update = controller._update_operation_status
+
+    def record(op_type, status, progress, message):
+        update(op_type, status, progress, message)
+        if op_type == "data_import":
+            statuses.append((status, progress, message))
+            if status in ("completed", "cancelled", "failed"):
+                finished.set()
+
+    controller._update_operation_status = record
+    assert controller.import_data("orders", options)
+    assert finished.wait(30)
+    return statuses
+
+
+def _count(service) -> int:
+    return service.execute_query("SELECT COUNT(*) AS n FROM [orders]")[1][0]["n"]
+
+
+def test_progress_follows_committed_batch_groups(sqlite_service, tmp_path):
+    controller = _controller(sqlite_service, tmp_path)
+    options = {"batch_size": 10, "bulk_load": True, "commit_every": 2}
+
+    statuses = _run_import(controller, options)
+
+    # Five chunks, committed two at a time and the last one at the end
+    inserting = [message for status, _, message in statuses if status == "inserting"]
+    assert [message.split(" rows")[0] for message in inserting] == [
+        "Inserted 20",
+        "Inserted 40",
+        "Inserted 50",
+    ]
+    assert statuses[-1][0] == "completed"
+    assert controller.stats["records_imported"] == 50
+    assert _count(sqlite_service) == 50
+    controller.cleanup()
+
+
+def test_cancel_rolls_back_the_open_batch_group(sqlite_service, tmp_path, monkeypatch):
+    controller = _controller(sqlite_service, tmp_path)
+    options = {"batch_size": 10, "bulk_load": True, "commit_every": 2}
+
+    # Stop once a third chunk sits in the open, uncommitted group
+    insert = BulkLoad.insert
+
+    def insert_then_stop(load, rows, batch_size=None):
+        inserted = insert(load, rows, batch_size)
+        if load.rows_written == 30:
+            controller.stop_import()
+        return inserted
+
+    monkeypatch.setattr(BulkLoad, "insert", insert_then_stop)
+
+    statuses = _run_import(controller, options)
+
+    status, _, message = statuses[-1]
+    assert status == "cancelled"
+    assert message == "Import cancelled, 20 committed rows kept"
+    assert controller.stats["records_imported"] == 20
+    assert _count(sqlite_service) == 20
+    controller.cleanup()
@@ -0,0 +1,116 @@
+"""
+tests/test_progressive_schema.py
+Progressive Schema Inference - first proposals before the sheet has streamed
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from services.excel_service import ExcelService
+from services.progressive_schema import ProgressiveSchemaInference
+
+
+def _gated_service(hold_after: int):
+    """ExcelService whose stream pauses after ``hold_after`` rows until released"""
+    service = ExcelService()
+    release = threading.Event()
+    read = service.iter_raw_frames
+
+    def iter_raw_frames(file_path, options=None):
+        pulled = 0
+        for df in read(file_path, options):
+            if pulled >= hold_after:
+                release.wait(10)
+            pulled += len(df)
+            yield df
+
+    service.iter_raw_frames = iter_raw_frames
+    return service, release
+
+
+def _big_sheet(tmp_path) -> str:
+    path = tmp_path / "big.xlsx"
+    pd.DataFrame({"id": range(3000), "code": [f"C{i}" for i in range(3000)]}).to_excel(
+        path, index=False
+    )
+    return str(path)
+
+
+def test_first_proposal_is_seeded_from_min_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = _big_sheet(tmp_path)
+
+    # Uncached sheet: the first sample_size rows, not just the first chunk
+    service, release = _gated_service(hold_after=500)
+    inference = ProgressiveSchemaInference(
+        path, {"chunk_size": 100}, sample_size=500, excel_service=service, seed=1
+    )
+    proposal = inference.start()
+    try:
+        assert inference.sampling == "prefix"
+        assert proposal["id"]["rows_seen"] == 500
+        assert len(inference.sample_frame()) == 500
+    finally:
+        release.set()
+    assert inference.wait(10)
+    assert inference.reservoir.seen == 3000
+
+
+def test_cached_sheet_seeds_first_proposal_from_reservoir(tmp_path, monkeypatch):
+    # The sheet cache is stored as Parquet
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    path = _big_sheet(tmp_path)
+
+    # A full first read caches the sheet
+    inference = ProgressiveSchemaInference(path, {"chunk_size": 100}, seed=1)
+    inference.start()
+    assert inference.wait(10)
+
+    # Cached sheet: a uniform sample of every row before streaming catches up
+    service, release = _gated_service(hold_after=100)
+    inference = ProgressiveSchemaInference(
+        path,
+        {"chunk_size": 100},
+        sample_size=500,
+        excel_service=service,
+        seed=1,
+        min_rows=100,
+    )
+    inference.start()
+    try:
+        assert inference.sampling == "reservoir"
+        sample = inference.sample_frame()
+        assert len(sample) == 500
+        assert sample["id"].max() > 2000
+    finally:
+        release.set()
+    assert inference.wait(10)
+
+
+def test_reader_failure_ends_wait_and_sets_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = _big_sheet(tmp_path)
+    service = ExcelService()
+    read = service.iter_raw_frames
+
+    def failing_frames(file_path, options=None):
+        frames = read(file_path, options)
+        yield next(frames)
+        raise OSError("disk went away")
+
+    service.iter_raw_frames = failing_frames
+    inference = ProgressiveSchemaInference(
+        path, {"chunk_size": 100}, sample_size=50, excel_service=service
+    )
+    inference.start()
+
+    inference._thread.join(5)
+
+    # An unbounded wait returns instead of blocking on the failed stream
+    assert inference.wait() is False
+    assert not inference.done
+    assert inference.error == "disk went away"
+    assert not inference.proposal()["id"]["final"]
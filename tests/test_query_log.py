@@ -0,0 +1,71 @@
+"""
+tests/test_query_log.py
+Query Log - query shapes and their latency
+"""
+
+import pytest
+
+from services.query_log import QueryLog, normalize_query
+
+
+@pytest.mark.parametrize(
+    "sql, shape",
+    [
+        (
+            "SELECT * FROM t WHERE a = 5 AND b = 'x'",
+            "SELECT * FROM t WHERE a = ? AND b = ?",
+        ),
+        ("SELECT * FROM t WHERE price > -1.5e3", "SELECT * FROM t WHERE price > ?"),
+        ("SELECT * FROM t WHERE name = N'it''s'", "SELECT * FROM t WHERE name = ?"),
+        (
+            "SELECT * FROM t WHERE id IN (1, 2,3) AND code in ('a')",
+            "SELECT * FROM t WHERE id IN (?) AND code IN (?)",
+        ),
+        (
+            "SELECT [col 1], t2.x1 FROM [t2]\n  WHERE x1 = 3;",
+            "SELECT [col 1], t2.x1 FROM [t2] WHERE x1 = ?",
+        ),
+        (
+            "SELECT a /* why */ FROM t -- trailing\nWHERE a = 1",
+            "SELECT a FROM t WHERE a = ?",
+        ),
+    ],
+)
+def test_normalize_query(sql, shape):
+    assert normalize_query(sql) == shape
+
+
+def test_executions_of_one_shape_share_an_entry():
+    log = QueryLog(path=None)
+    log.record("SELECT * FROM t WHERE id = 1", (), 0.002)
+    log.record("SELECT * FROM t WHERE id = 2", (), 0.004)
+    log.record("SELECT * FROM t WHERE id IN (1, 2)", (), 0.001)
+
+    shapes = {entry["shape"]: entry for entry in log.shapes()}
+    entry = shapes["SELECT * FROM t WHERE id = ?"]
+    assert entry["count"] == 2
+    assert entry["avg_ms"] == pytest.approx(3.0)
+    assert log.sample("SELECT * FROM t WHERE id = ?")[0].endswith("id = 2")
+
+
+def test_writes_and_catalog_queries_are_not_logged():
+    log = QueryLog(path=None)
+    log.record("INSERT INTO t VALUES (1)")
+    log.record("SELECT name FROM sqlite_master WHERE type = 'table'")
+    log.record("SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ?")
+
+    assert log.shapes() == []
+
+
+def test_least_recently_seen_shapes_are_evicted():
+    log = QueryLog(path=None, max_shapes=2)
+    log.record("SELECT a FROM t")
+    log.record("SELECT b FROM t")
+    log.record("SELECT a FROM t")
+    log.record("SELECT c FROM t")
+
+    assert {entry["shape"] for entry in log.shapes()} == {
+        "SELECT a FROM t",
+        "SELECT c FROM t",
+    }
+    assert log.sample("SELECT b FROM t") is None
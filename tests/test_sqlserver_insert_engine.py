@@ -0,0 +1,34 @@
+"""
+tests/test_sqlserver_insert_engine.py
+SQL Server Insert Engine - parameter values and schema lookup
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.sqlserver_insert_engine import SqlServerInsertEngine
+
+
+@pytest.mark.parametrize("value", [None, np.nan, pd.NaT, pd.NA])
+def test_missing_values_bind_as_null(value):
+    assert SqlServerInsertEngine._normalize_value(value) is None
+
+
+def test_values_are_unwrapped():
+    assert SqlServerInsertEngine._normalize_value(np.int64(5)) == 5
+    assert type(SqlServerInsertEngine._normalize_value(np.int64(5))) is int
+    assert SqlServerInsertEngine._normalize_value([1, None]) == [1, None]
+
+
+def test_schema_columns_match_cleaned_names():
+    engine = SqlServerInsertEngine(
+        [
+            {"name": "Hire Date", "type": "date"},
+            {"name": "employee_name", "type": "nvarchar", "max_length": 80},
+        ]
+    )
+
+    assert engine.schema_column("hire_date")["type"] == "date"
+    assert engine.schema_column("Employee Name")["max_length"] == 80
+    assert engine.schema_column("salary") is None
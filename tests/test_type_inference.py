@@ -0,0 +1,102 @@
+"""
+tests/test_type_inference.py
+Type Inference - column statistics and SQL Server type narrowing
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.type_inference import (
+    ColumnStats,
+    TypeInferenceEngine,
+    infer_column_types,
+    narrow_sql_type,
+)
+
+COLUMNS = {
+    "id": [1, 2, 3, 4],
+    "flag": [0, 1, 1, 0],
+    "active": ["yes", "no", "Yes", None],
+    "big": [1, 2, 3, 2**40],
+    "price": ["1.50", "2", "", "3.25"],
+    "zip": ["01234", "10110", "20220", "30330"],
+    "joined": ["2024-01-05", "2024-02-10", None, "2024-03-15"],
+    "stamp": pd.to_datetime(
+        ["2024-01-05 10:00", "2024-01-06 00:00", None, "2024-01-07 08:30"]
+    ),
+    "name": ["Ann", "Bob", np.nan, "Chai"],
+}
+
+
+def test_single_pass_types():
+    assert infer_column_types(pd.DataFrame(COLUMNS)) == {
+        "id": "integer",
+        "flag": "integer",  # 0/1 alone stays numeric
+        "active": "boolean",
+        "big": "bigint",
+        "price": "float",
+        "zip": "string",  # Leading zeros are codes, not numbers
+        "joined": "date",
+        "stamp": "datetime",
+        "name": "string",
+    }
+
+
+def test_merged_chunks_match_a_single_pass():
+    df = pd.DataFrame(COLUMNS)
+    whole = TypeInferenceEngine().update(df)
+    first = TypeInferenceEngine().update(df.iloc[:2])
+    merged = first.merge(TypeInferenceEngine().update(df.iloc[2:]))
+
+    assert merged.infer_types() == whole.infer_types()
+    for column, stats in whole.columns.items():
+        assert merged.columns[column].summary() == stats.summary()
+
+
+def test_stats_collect_nulls_lengths_and_distinct_values():
+    stats = ColumnStats.from_values(["aa", "b", None, "", "aa", "ccc"])
+
+    assert (stats.count, stats.null_count) == (6, 2)  # Blank text counts as null
+    assert (stats.min_length, stats.max_length, stats.avg_length) == (1, 3, 2.0)
+    assert stats.distinct_count == 3
+
+
+def _narrow(values, generic_type=None, min_length=1):
+    return narrow_sql_type(ColumnStats.from_values(values), generic_type, min_length)
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (range(0, 101), "TINYINT"),
+        (range(0, 201), "SMALLINT"),  # 200 fits, but not twice over
+        ([-5, 10], "SMALLINT"),
+        (range(0, 20000, 100), "INT"),
+        ([0, 2**31 - 1], "BIGINT"),
+    ],
+)
+def test_integers_keep_headroom(values, expected):
+    assert _narrow(list(values), "integer") == expected
+
+
+def test_decimals_keep_extra_integer_digits():
+    assert _narrow([1.25, 99.5, 12.75], "decimal") == "DECIMAL(6,2)"
+
+
+def test_fixed_width_codes_become_char():
+    codes = [f"TH{i % 7:02d}" for i in range(40)]
+
+    assert _narrow(codes, "string") == "CHAR(4)"
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["ABCD"],  # A single row proves nothing about width
+        ["ABCD"] * 40,  # Nor does a constant column
+        [f"C{i}" for i in range(5, 10)],  # Too few rows
+    ],
+)
+def test_unproven_fixed_width_stays_varchar(values):
+    assert _narrow(values, "string", min_length=50) == "VARCHAR(50)"
@@ -0,0 +1,51 @@
+"""
+tests/test_workbook_session.py
+Workbook Session - one file handle for metadata queries
+"""
+
+import pandas as pd
+import psutil
+
+from services.excel_service import ExcelService
+from services.workbook_session import WorkbookSession
+
+
+def _open_handles(path) -> int:
+    return sum(
+        1 for f in psutil.Process().open_files() if f.path == str(path.absolute())
+    )
+
+
+def _workbook(tmp_path, rows: int = 12):
+    path = tmp_path / "orders.xlsx"
+    pd.DataFrame(
+        {"id": range(rows), "item": [f"item {i}" for i in range(rows)]}
+    ).to_excel(path, index=False)
+    return path
+
+
+def test_session_answers_queries_through_one_handle(tmp_path):
+    path = _workbook(tmp_path)
+
+    with WorkbookSession(str(path)) as session:
+        assert _open_handles(path) == 1
+        assert session.sheet_names == ["Sheet1"]
+        assert session.row_count() == 12
+        assert session.dimensions()["max_column"] == 2
+        assert session.read_sample(nrows=3)["id"].tolist() == [0, 1, 2]
+        assert _open_handles(path) == 1
+
+    assert not session.is_open
+    assert _open_handles(path) == 0
+
+
+def test_analyze_file_releases_the_workbook(tmp_path):
+    path = _workbook(tmp_path)
+    service = ExcelService()
+
+    info = service.analyze_file(str(path))
+
+    assert info["total_rows"] == 12
+    assert info["columns"] == ["id", "item"]
+    assert service._session is None
+    assert _open_handles(path) == 0
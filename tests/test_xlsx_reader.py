@@ -0,0 +1,229 @@
+"""
+tests/test_xlsx_reader.py
+XLSX Reader - native sheet parser parity and sheet extent estimates
+"""
+
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from services.excel_service import ExcelService
+from services.xlsx_reader import XlsxSheetReader, estimate_sheet_extent
+
+
+def _workbook(path, cells, formatted=()):
+    workbook = Workbook()
+    sheet = workbook.active
+    for ref, value in cells.items():
+        sheet[ref] = value
+    for ref in formatted:
+        sheet[ref].number_format = "0.00"
+    workbook.save(path)
+    return path
+
+
+def _frames(path, engine, **options):
+    service = ExcelService()
+    frames = list(
+        service.iter_raw_frames(
+            str(path), {"engine": engine, "use_cache": False, **options}
+        )
+    )
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _assert_parity(path, **options):
+    native = _frames(path, "native", **options)
+    openpyxl = _frames(path, "openpyxl", **options)
+    pd.testing.assert_frame_equal(native, openpyxl, check_dtype=False)
+    return native
+
+
+SHEETS = {
+    "blank_middle_row": {
+        "A1": "id",
+        "B1": "name",
+        "A2": 1,
+        "B2": "a",
+        "A4": 3,
+        "B4": "c",
+    },
+    "blank_rows_after_header": {"A1": "id", "B1": "name", "A4": 3, "B4": "c"},
+    "sparse_cells": {
+        "A1": "id",
+        "B1": "name",
+        "C1": "when",
+        "A2": 1,
+        "C2": datetime(2024, 5, 1),
+        "B3": "b",
+        "A6": 6,
+    },
+}
+
+
+@pytest.mark.parametrize("name", sorted(SHEETS))
+def test_engines_return_the_same_rows(tmp_path, name):
+    path = _workbook(tmp_path / f"{name}.xlsx", SHEETS[name])
+    _assert_parity(path)
+    _assert_parity(path, has_header=False)
+
+
+def test_blank_middle_row_is_kept(tmp_path):
+    path = _workbook(tmp_path / "gap.xlsx", SHEETS["blank_middle_row"])
+
+    df = _assert_parity(path)
+
+    assert len(df) == len(pd.read_excel(path)) == 3
+    assert df["id"].isna().tolist() == [False, True, False]
+
+
+def test_trailing_formatted_rows_are_dropped(tmp_path):
+    path = _workbook(
+        tmp_path / "trailing.xlsx", {"A1": "id", "A2": 1}, formatted=("A5", "A6")
+    )
+
+    df = _assert_parity(path)
+
+    assert df["id"].tolist() == [1]
+
+
+def test_projection_keeps_blank_rows(tmp_path):
+    path = _workbook(tmp_path / "gap.xlsx", SHEETS["blank_middle_row"])
+
+    df = _assert_parity(path, column_mappings={"name": "customer"})
+
+    assert df.columns.tolist() == ["customer"]
+    assert df["customer"].tolist()[::2] == ["a", "c"]
+
+
+def _rewrite_sheet(path, sheet_data: str):
+    """Replace the sheetData of the first worksheet with hand-written XML"""
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    start = sheet.index("<sheetData")
+    end = sheet.index("</sheetData>") + len("</sheetData>")
+    parts["xl/worksheets/sheet1.xml"] = (
+        sheet[:start] + sheet_data + sheet[end:]
+    ).encode()
+
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+
+HEADER_ROW = (
+    '<row r="1"><c r="A1" t="inlineStr"><is><t>a</t></is></c>'
+    '<c r="B1" t="inlineStr"><is><t>b</t></is></c>'
+    '<c r="C1" t="inlineStr"><is><t>c</t></is></c></row>'
+)
+
+
+def _native_rows(path):
+    with XlsxSheetReader(str(path)) as reader:
+        return list(reader._iter_rows(reader._resolve_sheet_path(0)))
+
+
+def test_row_and_cell_references_place_values(tmp_path):
+    path = _workbook(tmp_path / "refs.xlsx", {"A1": "x"})
+    _rewrite_sheet(
+        path,
+        "<sheetData>"
+        + HEADER_ROW
+        + '<row r="2"><c r="A2"><v>1</v></c><c r="C2"><v>3</v></c></row>'
+        # Row 3 missing; a row without a reference follows on from row 4
+        + '<row r="4"><c r="B4"><v>5</v></c></row>'
+        + "<row><c><v>7</v></c><c><v>8</v></c></row>"
+        + "</sheetData>",
+    )
+
+    assert _native_rows(path) == [
+        ["a", "b", "c"],
+        [1, None, 3],
+        [],
+        [None, 5],
+        [7, 8],
+    ]
+
+    df = _assert_parity(path)
+    assert df.astype(object).where(df.notna(), None).values.tolist() == [
+        [1, None, 3],
+        [None, None, None],
+        [None, 5, None],
+        [7, 8, None],
+    ]
+
+
+def test_out_of_order_cells_keep_their_columns(tmp_path):
+    path = _workbook(tmp_path / "order.xlsx", {"A1": "x"})
+    _rewrite_sheet(
+        path,
+        "<sheetData>"
+        + HEADER_ROW
+        + '<row r="2"><c r="C2"><v>3</v></c><c r="A2"><v>1</v></c></row>'
+        + "</sheetData>",
+    )
+
+    assert _native_rows(path) == [["a", "b", "c"], [1, None, 3]]
+
+
+def _set_dimension(path, ref):
+    """Replace the dimension tag of the first worksheet, or drop it"""
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    start = sheet.index("<dimension")
+    end = sheet.index(">", start) + 1
+    tag = f'<dimension ref="{ref}"/>' if ref else ""
+    parts["xl/worksheets/sheet1.xml"] = (sheet[:start] + tag + sheet[end:]).encode()
+
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+
+def _extent(path):
+    with zipfile.ZipFile(path) as archive:
+        return estimate_sheet_extent(archive, "xl/worksheets/sheet1.xml")
+
+
+def _rows(path, count: int):
+    cells = {"A1": "id", "B1": "note"}
+    for row in range(2, count + 2):
+        cells[f"A{row}"] = row - 1
+        cells[f"B{row}"] = f"note {row - 1} " + "x" * 20
+    return _workbook(path, cells)
+
+
+def test_trusted_dimension_is_read_without_scanning(tmp_path):
+    path = _rows(tmp_path / "rows.xlsx", 30)
+
+    extent = _extent(path)
+
+    assert extent["source"] == "dimension"
+    assert (extent["min_row"], extent["max_row"], extent["max_column"]) == (1, 31, 2)
+    assert not extent["row_count_exact"]
+
+
+@pytest.mark.parametrize(
+    "ref",
+    [
+        None,  # No dimension tag at all
+        "A1",  # Writer left the default on a large sheet
+        "A1:B20",  # Far more XML than 40 cells could hold
+    ],
+)
+def test_missing_or_lying_dimension_falls_back_to_a_scan(tmp_path, ref):
+    path = _rows(tmp_path / "rows.xlsx", 3000)
+    _set_dimension(path, ref)
+
+    extent = _extent(path)
+
+    assert extent["source"] == "scan"
+    assert extent["max_row"] == 3001
+    assert extent["row_count_exact"]
@@ -26,6 +26,27 @@ try:
 except ImportError:
     pass
 
+try:
+    from .data_profiler import DataProfiler, analyze_data_quality
+
+    __all__.extend(["DataProfiler", "analyze_data_quality"])
+except ImportError:
+    pass
+
+try:
+    from .date_inference import DateFormatCache, infer_date_format, parse_dates
+
+    __all__.extend(["DateFormatCache", "infer_date_format", "parse_dates"])
+except ImportError:
+    pass
+
+try:
+    from .type_inference import ColumnStats, TypeInferenceEngine, infer_column_types
+
+    __all__.extend(["ColumnStats", "TypeInferenceEngine", "infer_column_types"])
+except ImportError:
+    pass
+
 try:
     from .logger import setup_logger, get_logger
 
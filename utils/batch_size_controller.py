@@ -0,0 +1,246 @@
+"""
+utils/batch_size_controller.py
+Batch Size Controller - adaptive insert batch sizes remembered per target
+"""
+
+import os
+import sys
+import json
+import threading
+import logging
+from collections import deque
+from pathlib import Path
+from datetime import datetime
+from typing import Deque, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE = "logs/batch_sizes.json"
+
+
+def profile_key(
+    db_type: str,
+    sqlite_file: Optional[str] = None,
+    server: str = "",
+    database: str = "",
+) -> str:
+    """Connection profile that learned batch sizes are remembered under
+
+    SQLite paths are made absolute, so every insert path writing to the
+    same file shares its sizes.
+    """
+    if db_type == "sqlite":
+        return f"sqlite:{os.path.abspath(sqlite_file or 'denso888_data.db')}"
+    return f"sqlserver:{server}:{database}"
+
+
+class BatchSizeController:
+    """Tune the insert batch size from measured batch timings
+
+    Works like TCP congestion control. From a cold start the size doubles
+    after every full batch (slow start) until a batch takes longer than
+    ``target_batch_seconds`` or throughput falls more than ``tolerance``
+    below the best seen. From then on the size grows by ``increase_step``
+    per batch (additive increase); a slow batch halves it (multiplicative
+    decrease) and a throughput drop steps back to the best size, so the
+    size oscillates just around the optimum. Callers time each batch
+    including its commit, so the duration is the commit latency the
+    target bounds.
+
+    The size never exceeds what fits ``memory_budget_mb``, using the
+    in-memory width of the rows seen. The best-throughput size is saved
+    per (connection profile, table) and is the starting size next time.
+    A controller created with a fixed size never changes it.
+
+    Batches cut by rebatch() may be queued ahead of the writer. Every size
+    change starts a new epoch, and only batches cut in the current epoch
+    move the size, so batches already cut at an old size cannot halve it
+    again or count as full batches of the new one. They still count
+    toward the best throughput seen. record() must see batches in the
+    order rebatch() cut them, but may be called from any thread; calls
+    are serialized.
+    """
+
+    _store_lock = threading.Lock()
+
+    def __init__(
+        self,
+        profile: str,
+        table_name: str,
+        batch_size: Union[int, str, None] = "auto",
+        min_size: int = 100,
+        max_size: int = 50000,
+        initial_size: int = 1000,
+        increase_step: Optional[int] = None,
+        target_batch_seconds: float = 2.0,
+        tolerance: float = 0.15,
+        memory_budget_mb: float = 64,
+        store_path: Optional[str] = DEFAULT_STORE,
+    ):
+        self.key = f"{profile}|{table_name}"
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increase_step = increase_step or max(min_size, initial_size // 4)
+        self.target_batch_seconds = target_batch_seconds
+        self.tolerance = tolerance
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.store_path = Path(store_path) if store_path else None
+
+        self.row_bytes: Optional[int] = None
+        self.adaptive = batch_size in (None, "auto")
+        remembered = self._load().get(self.key) if self.adaptive else None
+
+        if not self.adaptive:
+            self.size = max(1, int(batch_size))
+        elif remembered:
+            self.size = self._clamp(remembered["batch_size"])
+        else:
+            self.size = self._clamp(initial_size)
+
+        # Remembered sizes start in congestion avoidance, near convergence
+        self.slow_start = self.adaptive and remembered is None
+        self.best_size: Optional[int] = None
+        self.best_rate = 0.0
+        self.history: List[Dict[str, Any]] = []
+
+        # (size, epoch) of each batch cut by rebatch() and not yet recorded
+        self.epoch = 0
+        self._cuts: Deque[Tuple[int, int]] = deque()
+        self._lock = threading.RLock()
+
+    def record(self, batch: List[Dict], seconds: float) -> int:
+        """Feed one committed batch and its duration; returns the next size"""
+        with self._lock:
+            rows = len(batch)
+            if not self.adaptive or not rows or seconds <= 0:
+                return self.size
+
+            if self.row_bytes is None:
+                self.row_bytes = self._estimate_row_bytes(batch)
+
+            # Batches not cut by rebatch() were cut at the current size
+            cut_size, epoch = (
+                self._cuts.popleft() if self._cuts else (self.size, self.epoch)
+            )
+
+            rate = rows / seconds
+            self.history.append(
+                {
+                    "size": cut_size,
+                    "rows": rows,
+                    "seconds": seconds,
+                    "rows_per_second": rate,
+                }
+            )
+
+            # A short final batch says nothing about the requested size
+            if rows < cut_size * 0.9:
+                return self.size
+
+            if rate > self.best_rate:
+                self.best_rate, self.best_size = rate, rows
+
+            # Cut before the last size change, its timing was already acted on
+            if epoch != self.epoch:
+                return self.size
+
+            if seconds > self.target_batch_seconds:
+                # Multiplicative decrease
+                self._resize(self.size // 2)
+                self.slow_start = False
+            elif rate < self.best_rate * (1 - self.tolerance):
+                # Past the peak: step back to the best size seen
+                self._resize(self.best_size)
+                self.slow_start = False
+            elif self.slow_start:
+                self._resize(self.size * 2)
+            else:
+                # Additive increase
+                self._resize(self.size + self.increase_step)
+
+            return self.size
+
+    def rebatch(self, chunks: Iterable[List[Dict]]) -> Iterator[List[Dict]]:
+        """Re-cut a stream of row chunks to the current batch size"""
+        if not self.adaptive:
+            yield from chunks
+            return
+
+        buffer: List[Dict] = []
+        for chunk in chunks:
+            buffer.extend(chunk)
+            while True:
+                with self._lock:
+                    size = self.size
+                    if len(buffer) < size:
+                        break
+                    self._cuts.append((size, self.epoch))
+                yield buffer[:size]
+                buffer = buffer[size:]
+        if buffer:
+            with self._lock:
+                self._cuts.append((self.size, self.epoch))
+            yield buffer
+
+    def save(self) -> bool:
+        """Remember the best-throughput size for the next run"""
+        if not self.adaptive or not self.store_path or self.best_size is None:
+            return False
+
+        with self._store_lock:
+            try:
+                sizes = self._load()
+                sizes[self.key] = {
+                    "batch_size": self.best_size,
+                    "rows_per_second": round(self.best_rate, 1),
+                    "updated": datetime.now().isoformat(),
+                }
+                self.store_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.store_path, "w", encoding="utf-8") as f:
+                    json.dump(sizes, f, indent=2, ensure_ascii=False)
+            except Exception as e:
+                logger.error(f"Failed to save batch size: {e}")
+                return False
+
+        logger.info(
+            f"Batch size for {self.key}: {self.best_size} rows "
+            f"({self.best_rate:,.0f} rows/sec)"
+        )
+        return True
+
+    # ================ HELPERS ================
+    def _resize(self, size: int):
+        """Apply a new size, starting a new epoch if it changed"""
+        size = self._clamp(size)
+        with self._lock:
+            if size != self.size:
+                self.size = size
+                self.epoch += 1
+
+    def _clamp(self, size: int) -> int:
+        upper = self.max_size
+        if self.row_bytes:
+            upper = min(
+                upper, max(self.min_size, self.memory_budget_bytes // self.row_bytes)
+            )
+        return max(self.min_size, min(int(size), upper))
+
+    @staticmethod
+    def _estimate_row_bytes(batch: List[Dict]) -> int:
+        """In-memory width of a row, from up to 50 sample rows"""
+        sample = batch[:50]
+        total = sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+            for row in sample
+        )
+        return max(1, total // len(sample))
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.store_path or not self.store_path.exists():
+            return {}
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load batch sizes: {e}")
+            return {}
@@ -8,6 +8,8 @@ import numpy as np
 from typing import Dict, Any
 import re
 
+from .type_inference import infer_column_types, sql_type_for
+
 
 class DataProcessor:
     """Data processing and cleaning utilities"""
@@ -49,42 +51,11 @@ class DataProcessor:
         """Detect optimal data types for database"""
         type_mapping = {}
 
-        for column in df.columns:
-            sample_data = df[column].dropna().head(100)
-
-            if len(sample_data) == 0:
-                type_mapping[column] = "TEXT"
-                continue
-
-            # Check for numeric data
-            try:
-                pd.to_numeric(sample_data)
-                # Check if integers
-                if sample_data.astype(str).str.match(r"^\d+$").all():
-                    type_mapping[column] = "INTEGER"
-                else:
-                    type_mapping[column] = "REAL"
-                continue
-            except (ValueError, TypeError):
-                pass
-
-            # Check for dates
-            try:
-                pd.to_datetime(sample_data)
+        for column, data_type in infer_column_types(df).items():
+            if data_type in ("date", "datetime"):
                 type_mapping[column] = "DATETIME"
-                continue
-            except (ValueError, TypeError):
-                pass
-
-            # Check for boolean
-            unique_values = set(str(v).lower() for v in sample_data.unique())
-            bool_values = {"true", "false", "yes", "no", "1", "0", "y", "n"}
-            if unique_values.issubset(bool_values):
-                type_mapping[column] = "BOOLEAN"
-                continue
-
-            # Default to text
-            type_mapping[column] = "TEXT"
+            else:
+                type_mapping[column] = sql_type_for(data_type, "sqlite")
 
         return type_mapping
 
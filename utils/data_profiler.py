@@ -0,0 +1,130 @@
+"""
+utils/data_profiler.py
+Data Profiling Utilities - vectorized data-quality metrics
+"""
+
+import re
+from typing import Dict, Any, List
+
+import pandas as pd
+
+# Strings float() accepts: decimals, exponents, inf and nan
+NUMERIC_PATTERN = re.compile(
+    r"\s*[+-]?(?:(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|[Ii]nf(?:inity)?|[Nn]a[Nn])\s*"
+)
+
+# Start-anchored date shapes: YYYY-MM-DD, DD/MM/YYYY, DD-MM-YYYY, M/D/YYYY
+DATE_LIKE_PATTERN = re.compile(
+    r"(?:\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4}|\d{1,2}/\d{1,2}/\d{4})"
+)
+
+LONG_TEXT_CHARS = 1000
+MOSTLY_EMPTY_PERCENT = 90
+DATE_SAMPLE_SIZE = 10
+DATE_LIKE_RATIO = 0.7
+
+
+class DataProfiler:
+    """Data-quality profiling with one vectorized pass per column"""
+
+    @staticmethod
+    def is_text_column(series: pd.Series) -> bool:
+        """Object or string columns, the ones that can hide mixed values"""
+        return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(
+            series
+        )
+
+    @staticmethod
+    def profile_column(series: pd.Series) -> Dict[str, Any]:
+        """Null, numeric, length and date-shape counts for one column"""
+        null_mask = series.isna().to_numpy()
+        null_count = int(null_mask.sum())
+        profile = {
+            "rows": len(series),
+            "null_count": null_count,
+            "non_null_count": len(series) - null_count,
+            "is_text": DataProfiler.is_text_column(series),
+            "numeric_count": 0,
+            "max_length": 0,
+            "date_sample_size": 0,
+            "date_like_count": 0,
+        }
+
+        if not profile["is_text"] or profile["non_null_count"] == 0:
+            return profile
+
+        # One string conversion feeds every mask below
+        text = series[~null_mask].astype(str)
+
+        profile["numeric_count"] = int(text.str.fullmatch(NUMERIC_PATTERN).sum())
+        profile["max_length"] = int(text.str.len().max())
+
+        sample = text.head(DATE_SAMPLE_SIZE).str.strip()
+        profile["date_sample_size"] = len(sample)
+        profile["date_like_count"] = int(sample.str.match(DATE_LIKE_PATTERN).sum())
+
+        return profile
+
+    @staticmethod
+    def analyze_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
+        """Table-level quality metrics and issue list"""
+        total_rows = len(df)
+        total_cells = total_rows * len(df.columns)
+
+        profiles = {col: DataProfiler.profile_column(df[col]) for col in df.columns}
+        null_cells = sum(p["null_count"] for p in profiles.values())
+
+        mixed_columns = []
+        long_text: List[str] = []
+        mostly_empty: List[str] = []
+        date_like: List[str] = []
+
+        for col, profile in profiles.items():
+            non_null = profile["non_null_count"]
+
+            # Partially numeric text is likely a mixed-type column
+            if profile["is_text"] and 0 < profile["numeric_count"] < non_null:
+                mixed_columns.append(col)
+
+            if profile["max_length"] > LONG_TEXT_CHARS:
+                long_text.append(
+                    f"Column '{col}' has very long text "
+                    f"(max: {profile['max_length']} chars)"
+                )
+
+            null_percentage = (
+                profile["null_count"] / total_rows * 100 if total_rows else 0
+            )
+            if null_percentage > MOSTLY_EMPTY_PERCENT:
+                mostly_empty.append(
+                    f"Column '{col}' is mostly empty ({null_percentage:.1f}% null)"
+                )
+
+            if (
+                profile["is_text"]
+                and profile["date_like_count"]
+                > profile["date_sample_size"] * DATE_LIKE_RATIO
+            ):
+                date_like.append(
+                    f"Column '{col}' might contain dates but wasn't recognized"
+                )
+
+        return {
+            "total_rows": total_rows,
+            "total_columns": len(df.columns),
+            "null_percentage": (
+                round((null_cells / total_cells) * 100, 2) if total_cells > 0 else 0
+            ),
+            "duplicate_rows": int(df.duplicated().sum()) if total_rows else 0,
+            "empty_columns": sum(
+                1 for p in profiles.values() if p["non_null_count"] == 0
+            ),
+            "columns_with_nulls": sum(1 for p in profiles.values() if p["null_count"]),
+            "mixed_type_columns": mixed_columns,
+            "potential_issues": long_text + mostly_empty + date_like,
+        }
+
+
+def analyze_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
+    """Quick way to profile a DataFrame"""
+    return DataProfiler.analyze_data_quality(df)
@@ -0,0 +1,238 @@
+"""
+utils/date_inference.py
+Date Inference Utilities - format detection and explicit-format parsing
+"""
+
+import re
+import threading
+from typing import Dict, Any, Iterable, List, Optional
+
+import pandas as pd
+
+# Shapes worth trying a date format on: ISO, day/month/year, month/day/year
+DATE_PATTERN = re.compile(
+    r"(?:\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4})"
+    r"(?:[T ]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?"
+)
+
+# Candidates in order of preference; DMY wins ties with MDY
+GREGORIAN_FORMATS: List[str] = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d-%m-%Y",
+    "%d-%m-%Y %H:%M:%S",
+    "%d.%m.%Y",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m-%d-%Y",
+]
+
+# Thai Buddhist era years run 543 ahead of the Gregorian calendar
+BUDDHIST_PREFIX = "BE:"
+BUDDHIST_ERA_OFFSET = 543
+BUDDHIST_YEAR_MIN = 2400
+BUDDHIST_FORMATS: List[str] = [
+    BUDDHIST_PREFIX + fmt
+    for fmt in (
+        "%d/%m/%Y",
+        "%d/%m/%Y %H:%M:%S",
+        "%d/%m/%Y %H:%M",
+        "%d-%m-%Y",
+        "%d.%m.%Y",
+        "%Y-%m-%d",
+        "%Y-%m-%d %H:%M:%S",
+    )
+]
+
+DATE_FORMATS: List[str] = GREGORIAN_FORMATS + BUDDHIST_FORMATS
+
+# Day counts from the 1900 date system epoch
+EXCEL_SERIAL = "excel_serial"
+EXCEL_EPOCH = "1899-12-30"
+SERIAL_MIN = 18264  # 1950-01-01
+SERIAL_MAX = 73415  # 2100-12-31
+
+DATE_SAMPLE_SIZE = 200
+MIN_MATCH_RATIO = 0.9
+
+DATE_COLUMN_HINT = re.compile(r"date|time|_dt$|^dt_|วัน", re.IGNORECASE)
+
+_FORMAT_GROUPS = {
+    "%d": r"(?P<day>\d{1,2})",
+    "%m": r"(?P<month>\d{1,2})",
+    "%Y": r"(?P<year>\d{4})",
+    "%H": r"(?P<hour>\d{1,2})",
+    "%M": r"(?P<minute>\d{2})",
+    "%S": r"(?P<second>\d{2})",
+}
+
+
+def looks_like_date_column(name: Any) -> bool:
+    """Column names that make numeric Excel serials plausible dates"""
+    return bool(DATE_COLUMN_HINT.search(str(name)))
+
+
+def infer_date_format(
+    values: Iterable[Any],
+    sample_size: int = DATE_SAMPLE_SIZE,
+    min_ratio: float = MIN_MATCH_RATIO,
+    allow_serial: bool = False,
+) -> Optional[str]:
+    """Pick the date format that parses a leading sample of values
+
+    Candidates are tried in preference order and the first one that
+    parses the whole sample wins; otherwise the best one is returned if
+    it reaches ``min_ratio``. Numeric values are only taken as Excel
+    serial dates when ``allow_serial`` is set.
+    """
+    series = _as_series(values).dropna()
+    if len(series) == 0 or pd.api.types.is_bool_dtype(series):
+        return None
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return None  # already parsed
+
+    if pd.api.types.is_numeric_dtype(series):
+        if not allow_serial:
+            return None
+        return _infer_serial(series.head(sample_size), min_ratio)
+
+    text = series.astype(str).str.strip()
+    text = text[text.str.len().to_numpy() > 0].head(sample_size)
+    if len(text) == 0:
+        return None
+
+    if allow_serial:
+        numbers = pd.to_numeric(text, errors="coerce")
+        if numbers.notna().all():
+            return _infer_serial(numbers, min_ratio)
+
+    best_format, best_ratio = None, 0.0
+    for fmt in DATE_FORMATS:
+        parsed = parse_dates(text, fmt)
+        valid = parsed.notna()
+        if not fmt.startswith(BUDDHIST_PREFIX):
+            # Years this far ahead are Buddhist era, not Gregorian
+            valid &= parsed.dt.year < BUDDHIST_YEAR_MIN
+        ratio = float(valid.mean())
+        if ratio > best_ratio:
+            best_format, best_ratio = fmt, ratio
+        if ratio == 1.0:
+            break
+
+    return best_format if best_ratio >= min_ratio else None
+
+
+def parse_dates(values: Iterable[Any], fmt: str) -> pd.Series:
+    """Parse a whole column with one explicit format; failures become NaT"""
+    series = _as_series(values)
+
+    if fmt == EXCEL_SERIAL:
+        numbers = pd.to_numeric(series, errors="coerce")
+        return pd.to_datetime(numbers, unit="D", origin=EXCEL_EPOCH, errors="coerce")
+
+    text = series.astype("string").str.strip()
+    if fmt.startswith(BUDDHIST_PREFIX):
+        return _parse_buddhist(text, fmt[len(BUDDHIST_PREFIX) :])
+    return pd.to_datetime(text, format=fmt, errors="coerce")
+
+
+def _parse_buddhist(text: pd.Series, fmt: str) -> pd.Series:
+    """Parse Buddhist era dates from their extracted components"""
+    parts = text.str.extract(_format_regex(fmt))
+    parts = parts.apply(pd.to_numeric, errors="coerce").astype(float)
+    for unit in ("hour", "minute", "second"):
+        if unit not in parts:
+            parts[unit] = 0.0
+
+    matched = parts.notna().all(axis=1).to_numpy()
+    if not matched.any():
+        return pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+
+    parts = parts[matched].astype("int64")
+    parts["year"] -= BUDDHIST_ERA_OFFSET
+    parsed = pd.to_datetime(
+        parts[["year", "month", "day", "hour", "minute", "second"]],
+        errors="coerce",
+    )
+    return parsed.reindex(text.index)
+
+
+def _format_regex(fmt: str) -> str:
+    """Anchored regex with named groups for a strptime-style format"""
+    pattern = re.escape(fmt)
+    for directive, group in _FORMAT_GROUPS.items():
+        pattern = pattern.replace(re.escape(directive), group)
+    return f"^{pattern}$"
+
+
+def _infer_serial(numbers: pd.Series, min_ratio: float) -> Optional[str]:
+    """Excel serial format if enough values fall in the plausible range"""
+    numbers = pd.to_numeric(numbers, errors="coerce")
+    if len(numbers) == 0:
+        return None
+    in_range = numbers.between(SERIAL_MIN, SERIAL_MAX)
+    return EXCEL_SERIAL if float(in_range.mean()) >= min_ratio else None
+
+
+def _as_series(values: Iterable[Any]) -> pd.Series:
+    return values if isinstance(values, pd.Series) else pd.Series(list(values))
+
+
+class DateFormatCache:
+    """Inferred date format per column
+
+    Formats are inferred once from a sample and then reused, so the
+    detection stage and every chunk of the import parse with the same
+    explicit format. Keys are any hashable column identity; a column
+    found not to hold dates is cached as None.
+    """
+
+    def __init__(self):
+        self._formats: Dict[Any, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._formats
+
+    def get(self, key: Any) -> Optional[str]:
+        return self._formats.get(key)
+
+    def set(self, key: Any, fmt: Optional[str]):
+        with self._lock:
+            self._formats[key] = fmt
+
+    def infer(
+        self, key: Any, values: Iterable[Any], allow_serial: bool = False
+    ) -> Optional[str]:
+        """Cached format of a column, inferring it on first use"""
+        if key in self._formats:
+            return self._formats[key]
+
+        fmt = infer_date_format(values, allow_serial=allow_serial)
+        self.set(key, fmt)
+        return fmt
+
+    def parse(
+        self, key: Any, values: Iterable[Any], allow_serial: bool = False
+    ) -> Optional[pd.Series]:
+        """Parse a column with its cached format, or None if not dates"""
+        fmt = self.infer(key, values, allow_serial)
+        return parse_dates(values, fmt) if fmt else None
+
+    def formats(self) -> Dict[Any, Optional[str]]:
+        """Copy of every cached format"""
+        with self._lock:
+            return dict(self._formats)
+
+    def clear(self):
+        with self._lock:
+            self._formats.clear()
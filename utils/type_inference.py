@@ -0,0 +1,560 @@
+"""
+utils/type_inference.py
+Type Inference Utilities - single-pass, mergeable column type detection
+"""
+
+import re
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .date_inference import DATE_PATTERN, infer_date_format, parse_dates
+
+BOOL_TOKENS = {"true", "false", "yes", "no", "y", "n", "1", "0"}
+
+INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+NUMBER_PATTERN = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+LEADING_ZERO_PATTERN = re.compile(r"0\d+")
+NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]")
+PLAIN_NUMBER_PATTERN = re.compile(r"[+-]?\d*\.?\d*")
+SCALE_PATTERN = re.compile(r"\.(\d*[1-9])")
+
+
+# Widening order within type families; anything else widens to text
+NUMERIC_TYPES = ["boolean", "integer", "bigint", "float"]
+TEMPORAL_TYPES = ["date", "datetime"]
+
+INT32_MIN, INT32_MAX = -2147483648, 2147483647
+TEXT_MAX_LENGTH = 255
+TEXT_AVG_LENGTH = 100
+
+# Smallest hashes kept by the distinct-count sketch
+SKETCH_SIZE = 1024
+
+
+class ColumnStats:
+    """Mergeable statistics of one column
+
+    ``update`` folds a batch of values in with vectorized masks, and
+    ``merge`` combines stats built from different chunks, so a streamed
+    sheet ends with the same counts as a single pass over all of it.
+    Distinct values are estimated with a K-minimum-values sketch that is
+    exact until more than ``SKETCH_SIZE`` distinct values have been seen.
+    """
+
+    def __init__(self, name: Any = None):
+        self.name = name
+        self.count = 0
+        self.null_count = 0
+        self.bool_count = 0
+        self.int_count = 0
+        self.number_count = 0
+        self.leading_zero_count = 0
+        self.date_count = 0
+        self.time_count = 0
+        self.min_length: Optional[int] = None
+        self.max_length = 0
+        self.total_length = 0
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.bool_tokens: set = set()
+        self.date_format: Optional[str] = None
+        self.non_ascii_count = 0
+        self.scientific_count = 0
+        self.max_scale = 0
+        self.time_precision = 0
+        self.sketch = np.empty(0, dtype=np.uint64)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any], name: Any = None) -> "ColumnStats":
+        """Stats of a plain list of values"""
+        stats = cls(name)
+        stats.update(pd.Series(list(values)))
+        return stats
+
+    @property
+    def non_null_count(self) -> int:
+        return self.count - self.null_count
+
+    @property
+    def null_ratio(self) -> float:
+        return self.null_count / self.count if self.count else 1.0
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.non_null_count if self.non_null_count else 0.0
+
+    @property
+    def distinct_count(self) -> int:
+        """Exact distinct count, or the sketch estimate once it is full"""
+        if len(self.sketch) < SKETCH_SIZE:
+            return len(self.sketch)
+        kth = float(self.sketch[SKETCH_SIZE - 1]) / 2.0**64
+        estimate = int(round((SKETCH_SIZE - 1) / kth)) if kth > 0 else SKETCH_SIZE
+        return min(estimate, self.non_null_count)
+
+    def update(self, series: pd.Series):
+        """Fold one batch of values into the stats"""
+        self.count += len(series)
+        if len(series) == 0:
+            return
+
+        values = series[series.notna().to_numpy()]
+
+        if pd.api.types.is_bool_dtype(values):
+            self._update_bool(values)
+        elif pd.api.types.is_numeric_dtype(values):
+            self._update_numeric(values)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            self._update_datetime(values)
+        else:
+            values = self._update_text(values)
+
+        self.null_count += len(series) - len(values)
+        self._update_sketch(values)
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        """Combine with stats of another chunk of the same column"""
+        for attr in (
+            "count",
+            "null_count",
+            "bool_count",
+            "int_count",
+            "number_count",
+            "leading_zero_count",
+            "date_count",
+            "time_count",
+            "total_length",
+            "non_ascii_count",
+            "scientific_count",
+        ):
+            setattr(self, attr, getattr(self, attr) + getattr(other, attr))
+
+        self.max_length = max(self.max_length, other.max_length)
+        self.max_scale = max(self.max_scale, other.max_scale)
+        self.time_precision = max(self.time_precision, other.time_precision)
+        self.min_length = _min(self.min_length, other.min_length)
+        self.min_value = _min(self.min_value, other.min_value)
+        self.max_value = _max(self.max_value, other.max_value)
+        self.bool_tokens |= other.bool_tokens
+        if self.date_format is None:
+            self.date_format = other.date_format
+        elif other.date_format not in (None, self.date_format):
+            # Chunks disagree, so no single format parses the column
+            self.date_count = 0
+        self.sketch = np.union1d(self.sketch, other.sketch)[:SKETCH_SIZE]
+        return self
+
+    def infer_type(self) -> str:
+        """Most specific generic type that fits every non-null value
+
+        Returns one of boolean, integer, bigint, float, date, datetime,
+        string or text.
+        """
+        non_null = self.non_null_count
+        if non_null == 0:
+            return "string"
+
+        # 0/1 alone stays numeric; real flags carry words or bool values
+        if (
+            self.bool_count == non_null
+            and self.bool_tokens - {"0", "1"}
+            and len(self.bool_tokens) <= 4
+        ):
+            return "boolean"
+
+        if self.number_count == non_null and not self.leading_zero_count:
+            if self.int_count == non_null:
+                if (self.min_value or 0) < INT32_MIN or (
+                    self.max_value or 0
+                ) > INT32_MAX:
+                    return "bigint"
+                return "integer"
+            return "float"
+
+        if self.date_count == non_null:
+            return "datetime" if self.time_count else "date"
+
+        if self.max_length > TEXT_MAX_LENGTH or self.avg_length > TEXT_AVG_LENGTH:
+            return "text"
+        return "string"
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain statistics for schema metadata"""
+        non_null = self.non_null_count
+        distinct = self.distinct_count
+        return {
+            "null_ratio": self.null_ratio,
+            "unique_count": distinct,
+            "unique_ratio": distinct / non_null if non_null else 0.0,
+            "max_length": self.max_length,
+            "min_length": self.min_length or 0,
+            "avg_length": self.avg_length,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "date_format": self.date_format,
+            "max_scale": self.max_scale,
+            "non_ascii": self.non_ascii_count > 0,
+        }
+
+    # ================ BATCH UPDATES ================
+    def _update_bool(self, values: pd.Series):
+        self.bool_count += len(values)
+        self.int_count += len(values)
+        self.number_count += len(values)
+        self.bool_tokens |= {"true", "false"}
+        self._update_lengths(values.astype(str).str.len())
+        if len(values):
+            self.min_value = _min(self.min_value, float(values.min()))
+            self.max_value = _max(self.max_value, float(values.max()))
+
+    def _update_numeric(self, values: pd.Series):
+        array = values.to_numpy(dtype=float)
+        finite = np.isfinite(array)
+        self.number_count += len(array)
+        self.int_count += int(np.count_nonzero(finite & (array == np.floor(array))))
+        text = values.astype(str)
+        self._update_lengths(text.str.len())
+        if not pd.api.types.is_integer_dtype(values):
+            self._update_scale(text)
+        if finite.any():
+            self.min_value = _min(self.min_value, float(array[finite].min()))
+            self.max_value = _max(self.max_value, float(array[finite].max()))
+
+    def _update_datetime(self, values: pd.Series):
+        self.date_count += len(values)
+        self.time_count += int((values != values.dt.normalize()).sum())
+        self.time_precision = max(self.time_precision, _fraction_digits(values))
+        self._update_lengths(values.astype(str).str.len())
+
+    def _update_text(self, values: pd.Series) -> pd.Series:
+        """Text masks; blank strings are counted as nulls"""
+        text = values.astype(str).str.strip()
+        text = text[text.str.len().to_numpy() > 0]
+
+        lowered = text.str.lower()
+        is_bool = lowered.isin(BOOL_TOKENS).to_numpy()
+        self.bool_count += int(is_bool.sum())
+        if is_bool.all():
+            self.bool_tokens |= set(lowered.unique())
+
+        is_number = text.str.fullmatch(NUMBER_PATTERN).to_numpy(dtype=bool)
+        if is_number.any():
+            self.number_count += int(is_number.sum())
+            self.int_count += int(text.str.fullmatch(INTEGER_PATTERN).sum())
+            self.leading_zero_count += int(
+                text.str.fullmatch(LEADING_ZERO_PATTERN).sum()
+            )
+            numbers = pd.to_numeric(text[is_number], errors="coerce")
+            self._update_scale(text[is_number])
+            self.min_value = _min(self.min_value, float(numbers.min()))
+            self.max_value = _max(self.max_value, float(numbers.max()))
+
+        # Date shapes are confirmed by parsing with one explicit format
+        is_date = text.str.fullmatch(DATE_PATTERN).to_numpy(dtype=bool)
+        if is_date.any():
+            dates = text[is_date]
+            if self.date_format is None:
+                self.date_format = infer_date_format(dates)
+            if self.date_format is not None:
+                parsed = parse_dates(dates, self.date_format).dropna()
+                self.date_count += len(parsed)
+                self.time_count += int((parsed != parsed.dt.normalize()).sum())
+                self.time_precision = max(self.time_precision, _fraction_digits(parsed))
+
+        self.non_ascii_count += int(text.str.contains(NON_ASCII_PATTERN).sum())
+        self._update_lengths(text.str.len())
+        return text
+
+    def _update_scale(self, text: pd.Series):
+        """Decimal places of numbers written out in plain notation"""
+        plain = text.str.fullmatch(PLAIN_NUMBER_PATTERN).to_numpy(dtype=bool)
+        self.scientific_count += int(len(plain) - plain.sum())
+        scale = text[plain].str.extract(SCALE_PATTERN)[0].str.len()
+        if scale.notna().any():
+            self.max_scale = max(self.max_scale, int(scale.max()))
+
+    def _update_lengths(self, lengths: pd.Series):
+        if len(lengths) == 0:
+            return
+        self.total_length += int(lengths.sum())
+        self.max_length = max(self.max_length, int(lengths.max()))
+        self.min_length = _min(self.min_length, int(lengths.min()))
+
+    def _update_sketch(self, values: pd.Series):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        smallest = np.unique(hashes)[:SKETCH_SIZE]
+        self.sketch = np.union1d(self.sketch, smallest)[:SKETCH_SIZE]
+
+
+class TypeInferenceEngine:
+    """Column stats for a whole table, built batch by batch"""
+
+    def __init__(self):
+        self.columns: Dict[Any, ColumnStats] = {}
+
+    def update(self, batch: Any) -> "TypeInferenceEngine":
+        """Fold in a DataFrame, column dict or list of row dicts"""
+        df = batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(batch)
+        for column in df.columns:
+            if column not in self.columns:
+                self.columns[column] = ColumnStats(column)
+            self.columns[column].update(df[column])
+        return self
+
+    def merge(self, other: "TypeInferenceEngine") -> "TypeInferenceEngine":
+        """Combine with an engine that saw other chunks of the table"""
+        for column, stats in other.columns.items():
+            if column in self.columns:
+                self.columns[column].merge(stats)
+            else:
+                self.columns[column] = stats
+        return self
+
+    def infer_types(self) -> Dict[Any, str]:
+        """Generic type of every column seen so far"""
+        return {column: stats.infer_type() for column, stats in self.columns.items()}
+
+
+class TypeWideningTracker:
+    """Column types that only ever widen as more batches arrive
+
+    Each batch is folded into exact running stats. When a column's
+    inferred type no longer fits its current type, the type is widened
+    (see widen_type) and a widening event is recorded instead of letting
+    the batch fail against the narrower type. Columns without a value
+    yet get no type until one arrives.
+    """
+
+    def __init__(self, proposed: Optional[Dict[Any, str]] = None):
+        self.engine = TypeInferenceEngine()
+        self.types: Dict[Any, str] = dict(proposed or {})
+        self.events: List[Dict[str, Any]] = []
+        self.rows_seen = 0
+
+    def observe(self, batch: Any) -> List[Dict[str, Any]]:
+        """Fold in a batch and return the widening events it caused"""
+        df = batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(batch)
+        self.engine.update(df)
+        self.rows_seen += len(df)
+
+        events = []
+        for column, stats in self.engine.columns.items():
+            if stats.non_null_count == 0:
+                continue
+
+            inferred = stats.infer_type()
+            current = self.types.get(column)
+            if current is None:
+                self.types[column] = inferred
+                continue
+
+            widened = widen_type(current, inferred)
+            if widened != current:
+                self.types[column] = widened
+                events.append(
+                    {
+                        "column": column,
+                        "from_type": current,
+                        "to_type": widened,
+                        "rows_seen": self.rows_seen,
+                    }
+                )
+
+        self.events.extend(events)
+        return events
+
+
+def widen_type(current: str, observed: str) -> str:
+    """Narrowest generic type holding values of both types"""
+    if current == observed:
+        return current
+
+    for chain in (NUMERIC_TYPES, TEMPORAL_TYPES):
+        if current in chain and observed in chain:
+            return max(current, observed, key=chain.index)
+
+    if "text" in (current, observed):
+        return "text"
+    return "string"
+
+
+def infer_column_types(data: Any) -> Dict[Any, str]:
+    """Quick way to infer the generic types of one batch"""
+    return TypeInferenceEngine().update(data).infer_types()
+
+
+def infer_from_batches(batches: Iterable[Any]) -> TypeInferenceEngine:
+    """Build an engine from a stream of batches"""
+    engine = TypeInferenceEngine()
+    for batch in batches:
+        engine.update(batch)
+    return engine
+
+
+def _fraction_digits(values: pd.Series) -> int:
+    """Fractional second digits (0-7) needed to store datetime values"""
+    values = values.dropna()
+    if len(values) == 0:
+        return 0
+    ticks = (values - values.dt.floor("s")).dt.total_seconds().to_numpy() * 1e7
+    ticks = np.round(ticks).astype(np.int64)
+    for digits in range(8):
+        if not (ticks % 10 ** (7 - digits)).any():
+            return digits
+    return 7
+
+
+def _min(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+# Generic type -> SQL type names used across the services
+SQL_TYPES: Dict[str, Dict[str, str]] = {
+    "sqlite": {
+        "boolean": "BOOLEAN",
+        "integer": "INTEGER",
+        "bigint": "INTEGER",
+        "float": "REAL",
+        "date": "DATE",
+        "datetime": "DATETIME",
+        "string": "TEXT",
+        "text": "TEXT",
+    },
+    "sqlserver": {
+        "boolean": "BIT",
+        "integer": "INT",
+        "bigint": "BIGINT",
+        "float": "FLOAT",
+        "date": "DATE",
+        "datetime": "DATETIME2",
+        "string": "NVARCHAR(255)",
+        "text": "NVARCHAR(MAX)",
+    },
+}
+
+
+def sql_type_for(generic_type: str, db_type: str = "sqlite") -> str:
+    """SQL column type of a generic type"""
+    mapping = SQL_TYPES.get(db_type, SQL_TYPES["sqlite"])
+    return mapping.get(generic_type, mapping["string"])
+
+
+# SQL Server storage limits used when narrowing types
+SQLSERVER_INT_RANGES = [
+    ("TINYINT", 0, 255),
+    ("SMALLINT", -32768, 32767),
+    ("INT", INT32_MIN, INT32_MAX),
+]
+SQLSERVER_MAX_PRECISION = 38
+FLOAT_DECIMAL_MAX_SCALE = 4
+FLOAT_DECIMAL_MAX_PRECISION = 18
+VARCHAR_MAX_LENGTH = 8000
+NVARCHAR_MAX_LENGTH = 4000
+FIXED_WIDTH_MAX_LENGTH = 16
+FIXED_WIDTH_MIN_ROWS = 20
+INTEGER_HEADROOM = 2
+DECIMAL_HEADROOM_DIGITS = 2
+
+
+def padded_string_length(max_length: int) -> int:
+    """Declared string length: 20% over the longest value, at least 50"""
+    return max(50, int(max_length * 1.2))
+
+
+def narrow_sql_type(
+    stats: ColumnStats, generic_type: Optional[str] = None, min_length: int = 1
+) -> Optional[str]:
+    """Smallest SQL Server type holding every value the stats have seen
+
+    Integers get the narrowest of TINYINT/SMALLINT/INT/BIGINT, strings
+    VARCHAR unless non-ASCII text (e.g. Thai) occurs, equal-length short
+    codes CHAR(n), numbers with few decimal places a tight DECIMAL(p,s)
+    and datetimes DATETIME2(n) with just the fractional seconds used.
+    The stats must cover the whole column, and every type keeps headroom
+    for later loads: integers must still fit at ``INTEGER_HEADROOM`` times
+    their magnitude, decimals get extra integer digits and strings are
+    declared at least ``min_length`` long (callers pass the padded
+    analysis length). CHAR(n) is only chosen when enough rows with more
+    than one distinct value show the codes really are fixed width.
+    Returns None when the stats do not support a narrower type than the
+    default mapping.
+    """
+    generic_type = generic_type or stats.infer_type()
+    non_null = stats.non_null_count
+
+    if generic_type == "boolean":
+        return "BIT"
+
+    if generic_type in ("integer", "bigint"):
+        if non_null == 0 or stats.min_value is None or stats.max_value is None:
+            return None
+        low_value = min(int(stats.min_value) * INTEGER_HEADROOM, 0)
+        high_value = int(stats.max_value) * INTEGER_HEADROOM
+        for sql_type, low, high in SQLSERVER_INT_RANGES:
+            if low <= low_value and high_value <= high:
+                return sql_type
+        return "BIGINT"
+
+    if generic_type in ("float", "decimal"):
+        if (
+            non_null == 0
+            or stats.number_count < non_null
+            or stats.scientific_count
+            or stats.max_value is None
+        ):
+            return None
+        bound = max(abs(stats.min_value), abs(stats.max_value))
+        int_digits = len(str(int(bound))) if bound >= 1 else 0
+        precision = max(int_digits + stats.max_scale, 1)
+        if generic_type == "float" and (
+            stats.max_scale > FLOAT_DECIMAL_MAX_SCALE
+            or precision > FLOAT_DECIMAL_MAX_PRECISION
+        ):
+            return "FLOAT"
+        if precision > SQLSERVER_MAX_PRECISION:
+            return None
+        precision = min(precision + DECIMAL_HEADROOM_DIGITS, SQLSERVER_MAX_PRECISION)
+        return f"DECIMAL({precision},{stats.max_scale})"
+
+    if generic_type == "date":
+        return "DATE"
+
+    if generic_type == "datetime":
+        if non_null == 0 or stats.date_count < non_null:
+            return None
+        return f"DATETIME2({stats.time_precision})"
+
+    if generic_type in ("string", "text"):
+        if non_null == 0:
+            return None
+        unicode = stats.non_ascii_count > 0
+        prefix = "N" if unicode else ""
+        limit = NVARCHAR_MAX_LENGTH if unicode else VARCHAR_MAX_LENGTH
+        length = max(stats.max_length, 1)
+        if length > limit:
+            return f"{prefix}VARCHAR(MAX)"
+        if (
+            stats.min_length == length <= FIXED_WIDTH_MAX_LENGTH
+            and non_null >= FIXED_WIDTH_MIN_ROWS
+            and stats.distinct_count > 1
+        ):
+            return f"{prefix}CHAR({length})"
+        return f"{prefix}VARCHAR({min(max(length, min_length), limit)})"
+
+    return None